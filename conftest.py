@@ -35,6 +35,13 @@ def pytest_addoption(
         dest="update_schemas",
         help="update cached JSON schemas.",
     )
+    parser.addoption(
+        "--update-manifest",
+        action="store_true",
+        default=False,
+        dest="update_manifest",
+        help="update the manifest of the builtin rules.",
+    )
 
 
 def pytest_configure(config: Any) -> None:
@@ -52,3 +59,12 @@ def pytest_configure(config: Any) -> None:
             )
         else:
             pytest.exit("Schemas already updated", 0)
+    if option.update_manifest and not hasattr(config, "slaveinput"):
+        # pylint: disable=import-outside-toplevel
+        from ansiblelint.constants import DEFAULT_RULESDIR
+        from ansiblelint.rules import update_manifest
+
+        if update_manifest(DEFAULT_RULESDIR):
+            pytest.exit("Rules manifest updated, commit it.", 0)
+        else:
+            pytest.exit("Rules manifest already updated", 0)
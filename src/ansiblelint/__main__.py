@@ -28,7 +28,17 @@ import shutil
 import subprocess
 import sys
 from contextlib import contextmanager
-from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from ansible_compat.config import ansible_version
 from ansible_compat.prerun import get_cache_dir
@@ -37,11 +47,19 @@ from filelock import FileLock
 
 from ansiblelint import cli
 from ansiblelint._mockings import _perform_mockings_cleanup
-from ansiblelint.app import get_app
-from ansiblelint.color import console, console_options, reconfigure, render_yaml
+from ansiblelint.app import App, get_app
+from ansiblelint.color import (
+    console,
+    console_options,
+    console_stderr,
+    reconfigure,
+    render_yaml,
+)
 from ansiblelint.config import options
-from ansiblelint.constants import EXIT_CONTROL_C_RC
+from ansiblelint.constants import EXIT_CONTROL_C_RC, INVALID_CONFIG_RC
 from ansiblelint.file_utils import abspath, cwd, normpath
+from ansiblelint.logger import configure_logging
+from ansiblelint.profiling import enable_profiler, get_profiler
 from ansiblelint.skip_utils import normalize_tag
 from ansiblelint.version import __version__
 
@@ -58,25 +76,7 @@ _logger = logging.getLogger(__name__)
 
 def initialize_logger(level: int = 0) -> None:
     """Set up the global logging level based on the verbosity number."""
-    # We are about to act on the root logger, which defaults to logging.WARNING.
-    # That is where our 0 (default) value comes from.
-    verbosity_map = {
-        -2: logging.CRITICAL,
-        -1: logging.ERROR,
-        0: logging.WARNING,
-        1: logging.INFO,
-        2: logging.DEBUG,
-    }
-
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("%(levelname)-8s %(message)s")
-    handler.setFormatter(formatter)
-    logger = logging.getLogger()
-    logger.addHandler(handler)
-    # Unknown logging level is treated as DEBUG
-    logging_level = verbosity_map.get(level, logging.DEBUG)
-    logger.setLevel(logging_level)
-    logging.captureWarnings(True)  # pass all warnings.warn() messages through logging
+    logging_level = configure_logging(level)
     # Use module-level _logger instance to validate it
     _logger.debug("Logging initialized to level %s", logging_level)
 
@@ -193,78 +193,291 @@ def main(argv: Optional[List[str]] = None) -> int:  # noqa: C901
     if isinstance(options.tags, str):
         options.tags = options.tags.split(",")
 
+    if options.daemon or options.lsp:
+        return _serve(rules)
+
+    if options.profile_rules:
+        enable_profiler()
+
+    if options.stream:
+        if options.write_list or options.progressive:
+            _logger.warning(
+                "Matches are not streamed when using --write or --progressive."
+            )
+        else:
+            return _lint_streamed(app, rules)
+
     result = _get_matches(rules, options)
 
     if options.write_list:
         _do_transform(result, options)
 
     mark_as_success = False
-    if result.matches and options.progressive:
-        _logger.info(
-            "Matches found, running again on previous revision in order to detect regressions"
-        )
-        with _previous_revision():
-            _logger.debug("Options: %s", options)
-            _logger.debug(os.getcwd())
-            old_result = _get_matches(rules, options)
-            # remove old matches from current list
-            matches_delta = list(set(result.matches) - set(old_result.matches))
-            if len(matches_delta) == 0:
-                _logger.warning(
-                    "Total violations not increased since previous "
-                    "commit, will mark result as success. (%s -> %s)",
-                    len(old_result.matches),
-                    len(matches_delta),
-                )
-                mark_as_success = True
-
-            ignored = 0
-            for match in result.matches:
-                # if match is not new, mark is as ignored
-                if match not in matches_delta:
-                    match.ignored = True
-                    ignored += 1
-            if ignored:
-                _logger.warning(
-                    "Marked %s previously known violation(s) as ignored due to"
-                    " progressive mode.",
-                    ignored,
-                )
+    if options.progressive:
+        mark_as_success = _ignore_previous_matches(rules, result)
 
     app.render_matches(result.matches)
+    _report_profile()
+    _finish()
+
+    return app.report_outcome(result, mark_as_success=mark_as_success)
+
+
+def _serve(rules: "RulesCollection") -> int:
+    """Serve lint requests of a daemon or language server client."""
+    # pylint: disable=import-outside-toplevel
+    if options.daemon:
+        from ansiblelint import daemon
+
+        return daemon.serve(rules, options)
+    from ansiblelint import lsp
+
+    return lsp.serve(rules, options)
+
+
+def _lint_streamed(app: App, rules: "RulesCollection") -> int:
+    """Lint, rendering matches as soon as each file is done."""
+    # pylint: disable=import-outside-toplevel
+    from ansiblelint.runner import LintResult, _stream_matches
+
+    result = LintResult(matches=[], files=set())
+    counter = app.render_stream(_stream_matches(rules, options, result))
+    _report_profile()
+    _finish()
+    return app.report_outcome(result, counter=counter)
+
+
+def _ignore_previous_matches(rules: "RulesCollection", result: "LintResult") -> bool:
+    """Mark matches found by the previous revision as ignored.
 
+    Return whether the result must be considered a success, as no new match was
+    found. Matches of the current revision are stored first, for the runs made
+    after the next commit.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ansiblelint.cache import match_fingerprint
+
+    _store_baseline(rules, result, "HEAD")
+    if not result.matches:
+        return False
+    _logger.info(
+        "Matches found, comparing with previous revision in order to detect regressions"
+    )
+    old_fingerprints = _previous_fingerprints(rules, result)
+    # remove old matches from current list
+    matches_delta = [
+        match
+        for match in result.matches
+        if match_fingerprint(match) not in old_fingerprints
+    ]
+    mark_as_success = False
+    if len(matches_delta) == 0:
+        _logger.warning(
+            "Total violations not increased since previous "
+            "commit, will mark result as success. (%s -> %s)",
+            len(old_fingerprints),
+            len(matches_delta),
+        )
+        mark_as_success = True
+
+    ignored = 0
+    for match in result.matches:
+        # if match is not new, mark is as ignored
+        if match_fingerprint(match) in old_fingerprints:
+            match.ignored = True
+            ignored += 1
+    if ignored:
+        _logger.warning(
+            "Marked %s previously known violation(s) as ignored due to"
+            " progressive mode.",
+            ignored,
+        )
+    return mark_as_success
+
+
+def _finish() -> None:
+    """Clean up mocked content and release the cache directory."""
     _perform_mockings_cleanup()
     options.cache_dir_lock.release()
     os.unlink(options.cache_dir_lock.lock_file)
 
-    return app.report_outcome(result, mark_as_success=mark_as_success)
+
+def _report_profile() -> None:
+    """Display the timings collected by the profiler, if enabled."""
+    profiler = get_profiler()
+    if profiler is None:
+        return
+    if options.profile_rules == "json":
+        console_stderr.print(profiler.to_json(), markup=False, highlight=False)
+    else:
+        console_stderr.print(profiler.to_table())
+
+
+def _rev_parse(revision: str) -> str:
+    """Return the commit id of a git revision."""
+    return subprocess.run(
+        ["git", "rev-parse", revision],
+        check=True,
+        universal_newlines=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    ).stdout.strip()
+
+
+def _store_baseline(
+    rules: "RulesCollection", result: "LintResult", revision: str
+) -> None:
+    """Record the matches of files whose content is the one of a revision."""
+    # pylint: disable=import-outside-toplevel
+    from ansiblelint.cache import BaselineCache, match_fingerprint
+    from ansiblelint.incremental import git_objects, worktree_objects
+
+    try:
+        commit = _rev_parse(revision)
+    except subprocess.CalledProcessError as exc:
+        _logger.debug("Unable to store baseline of %s: %s", revision, exc)
+        return
+    objects = git_objects(commit)
+    paths = [normpath(lintable.path) for lintable in result.files]
+    entries: Dict[str, Dict[str, Any]] = {}
+    for path, blob in worktree_objects(paths).items():
+        if objects.get(path) == blob:
+            entries[path] = {"blob": blob, "matches": []}
+    for match in result.matches:
+        if match.filename in entries:
+            entries[match.filename]["matches"].append(match_fingerprint(match))
+    BaselineCache(
+        options.cache_dir, rules, options, options.tags, options.skip_list
+    ).put(commit, entries)
+
+
+def _previous_fingerprints(rules: "RulesCollection", result: "LintResult") -> Set[str]:
+    """Return fingerprints of the previous revision matches in files with matches.
+
+    Files are linted again inside a worktree of the previous revision only if
+    their content differs from the current one and no baseline was stored for
+    them by an earlier run.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ansiblelint.cache import BaselineCache, match_fingerprint
+    from ansiblelint.incremental import git_objects
+
+    baseline = BaselineCache(
+        options.cache_dir, rules, options, options.tags, options.skip_list
+    )
+    try:
+        commit = _rev_parse("HEAD^1")
+    except subprocess.CalledProcessError:
+        _logger.error(
+            "Failed to find the previous revision, progressive mode requires"
+            " a git repository with at least two commits"
+        )
+        sys.exit(INVALID_CONFIG_RC)
+    objects = git_objects(commit)
+
+    current: Dict[str, List[str]] = {}
+    for match in result.matches:
+        current.setdefault(match.filename, []).append(match_fingerprint(match))
+    fingerprints, outdated = _known_fingerprints(current, objects, baseline.get(commit))
+
+    if outdated:
+        _logger.info(
+            "Linting %s file(s) that changed since previous revision", len(outdated)
+        )
+        fingerprints.update(_lint_previous_revision(rules, commit, outdated))
+    else:
+        _logger.info("Reused baseline of previous revision")
+
+    baseline.put(
+        commit,
+        {
+            path: {"blob": objects[path], "matches": matches}
+            for path, matches in fingerprints.items()
+        },
+    )
+    return {fingerprint for matches in fingerprints.values() for fingerprint in matches}
+
+
+def _known_fingerprints(
+    current: Dict[str, List[str]],
+    objects: Dict[str, str],
+    stored: Dict[str, Dict[str, Any]],
+) -> Tuple[Dict[str, List[str]], List[str]]:
+    """Return previous fingerprints known without linting and files to lint again.
+
+    Fingerprints are known when a baseline was stored for the previous content
+    of a file or when the file did not change since the previous revision.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ansiblelint.incremental import worktree_objects
+
+    current_objects = worktree_objects(sorted(current))
+    fingerprints: Dict[str, List[str]] = {}
+    outdated: List[str] = []
+    for path, matches in current.items():
+        blob = objects.get(path)
+        if blob is None:
+            # new files have no previous matches
+            continue
+        entry = stored.get(path)
+        if entry and entry.get("blob") == blob:
+            fingerprints[path] = entry["matches"]
+        elif current_objects.get(path) == blob:
+            fingerprints[path] = matches
+        else:
+            outdated.append(path)
+    return fingerprints, outdated
+
+
+def _lint_previous_revision(
+    rules: "RulesCollection", commit: str, paths: List[str]
+) -> Dict[str, List[str]]:
+    """Return fingerprints of the matches of files inside a previous revision."""
+    # pylint: disable=import-outside-toplevel
+    from ansiblelint.cache import match_fingerprint
+    from ansiblelint.file_utils import Lintable
+    from ansiblelint.runner import _get_matches
+
+    with _previous_revision(commit):
+        _logger.debug("Options: %s", options)
+        _logger.debug(os.getcwd())
+        old_result = _get_matches(
+            rules, options, lintables=[Lintable(path) for path in paths]
+        )
+    fingerprints: Dict[str, List[str]] = {path: [] for path in paths}
+    for match in old_result.matches:
+        if match.filename in fingerprints:
+            fingerprints[match.filename].append(match_fingerprint(match))
+    return fingerprints
 
 
 @contextmanager
-def _previous_revision() -> Iterator[None]:
-    """Create or update a temporary workdir containing the previous revision."""
+def _previous_revision(revision: str) -> Iterator[None]:
+    """Create or update a temporary workdir containing the given revision."""
     worktree_dir = f"{options.cache_dir}/old-rev"
     # Update options.exclude_paths to include use the temporary workdir.
     rel_exclude_paths = [normpath(p) for p in options.exclude_paths]
     options.exclude_paths = [abspath(p, worktree_dir) for p in rel_exclude_paths]
-    revision = subprocess.run(
-        ["git", "rev-parse", "HEAD^1"],
-        check=True,
-        universal_newlines=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.DEVNULL,
-    ).stdout
     path = pathlib.Path(worktree_dir)
-    path.mkdir(parents=True, exist_ok=True)
-    subprocess.run(
-        ["git", "worktree", "add", "-f", worktree_dir],
-        shell=True,
-        stderr=subprocess.DEVNULL,
-        check=True,
-    )
+    if (path / ".git").exists():
+        subprocess.run(
+            ["git", "checkout", "-f", "--detach", revision],
+            cwd=worktree_dir,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        subprocess.run(["git", "worktree", "prune"], check=True)
+        subprocess.run(
+            ["git", "worktree", "add", "-f", "--detach", worktree_dir, revision],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
     try:
         with cwd(worktree_dir):
-            subprocess.run(["git", "checkout", revision], shell=True, check=True)
             yield
     finally:
         options.exclude_paths = [abspath(p, os.getcwd()) for p in rel_exclude_paths]
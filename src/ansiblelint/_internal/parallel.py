@@ -0,0 +1,146 @@
+"""Evaluation of rules on multiple files using a pool of worker processes.
+
+Rules objects and the lintables they receive are not guaranteed to be
+picklable, so workers rebuild their own rules collection from the rules
+directories and options of the parent process and only exchange file
+references and serialized matches with it.
+"""
+import multiprocessing
+from argparse import Namespace
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import ansiblelint.config
+from ansiblelint.cache import match_from_dict, match_to_dict
+from ansiblelint.constants import FileType
+from ansiblelint.errors import MatchError
+from ansiblelint.file_utils import Lintable
+from ansiblelint.logger import configure_logging
+from ansiblelint.parse_cache import get_parse_cache
+
+if TYPE_CHECKING:
+    from ansiblelint.rules import RulesCollection
+
+# Options that cannot be pickled and are of no use inside workers.
+_UNPICKLABLE_OPTIONS = ("cache_dir_lock",)
+
+# State of the current worker process, set by ``initialize_worker``.
+_worker_rules: Optional["RulesCollection"] = None
+_worker_tags: Set[str] = set()
+_worker_skip_list: List[str] = []
+
+
+def initialize_worker(
+    options: Dict[str, Any],
+    rulesdirs: List[str],
+    rule_ids: List[str],
+    tags: List[str],
+    skip_list: List[str],
+) -> None:
+    """Rebuild the rules collection of the parent inside a worker process."""
+    # pylint: disable=import-outside-toplevel
+    from ansiblelint.rules import RulesCollection
+
+    # pylint: disable=global-statement,invalid-name
+    global _worker_rules, _worker_tags, _worker_skip_list
+
+    vars(ansiblelint.config.options).update(options)
+    configure_logging(ansiblelint.config.options.verbosity)
+    # the whole lifetime of a worker is part of a run, so its cache is enabled
+    get_parse_cache().max_bytes = ansiblelint.config.options.parse_cache_size
+    rules = RulesCollection(rulesdirs, options=ansiblelint.config.options)
+    # rules filtered out by the parent, like by profiles, must not run
+    rules.rules = [rule for rule in rules.rules if rule.id in rule_ids]
+    _worker_rules = rules
+    _worker_tags = set(tags)
+    _worker_skip_list = skip_list
+
+
+def loaded_rule_ids() -> List[str]:
+    """Return the ids of the rules loaded by the current worker."""
+    assert _worker_rules is not None
+    return sorted(rule.id for rule in _worker_rules.rules)
+
+
+def _loaded_content(lintable: Lintable) -> Optional[str]:
+    """Return the content of a lintable, None if it has to be read by workers."""
+    if lintable.path.is_dir():
+        return None
+    try:
+        return lintable.content
+    except (IOError, UnicodeDecodeError):
+        return None
+
+
+def run_rules(
+    args: Tuple[str, Optional[FileType], Optional[str]]
+) -> List[Dict[str, Any]]:
+    """Run rules on a single file and return its serialized matches."""
+    assert _worker_rules is not None
+    path, kind, content = args
+    lintable = Lintable(path, content=content, kind=kind)
+    matches = _worker_rules.run(
+        lintable, tags=_worker_tags, skip_list=_worker_skip_list
+    )
+    get_parse_cache().release(lintable)
+    return [match_to_dict(match) for match in matches]
+
+
+class RulesPool:
+    """Pool of worker processes able to run a rules collection on files."""
+
+    # tags and skip list are given apart from options as runs can override them
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        processes: int,
+        rules: "RulesCollection",
+        options: Namespace,
+        tags: List[str],
+        skip_list: List[str],
+    ) -> None:
+        """Start the workers, each loading its own copy of the rules."""
+        self.processes = processes
+        self._rules = {rule.id: rule for rule in rules.rules}
+        worker_options = {
+            key: value
+            for key, value in vars(options).items()
+            if key not in _UNPICKLABLE_OPTIONS
+        }
+        self._pool = multiprocessing.get_context("spawn").Pool(
+            processes=processes,
+            initializer=initialize_worker,
+            initargs=(
+                worker_options,
+                rules.rulesdirs,
+                sorted(self._rules),
+                list(tags),
+                list(skip_list),
+            ),
+        )
+
+    def is_consistent(self) -> bool:
+        """Return whether workers loaded the same rules as the parent.
+
+        Rules registered programmatically, instead of being loaded from the
+        rules directories, cannot be recreated by the workers.
+        """
+        return bool(self._pool.apply(loaded_rule_ids) == sorted(self._rules))
+
+    def run(self, lintables: List[Lintable]) -> List[List[MatchError]]:
+        """Return the matches of each lintable, in the same order."""
+        return list(self.imap(lintables))
+
+    def imap(self, lintables: List[Lintable]) -> Iterator[List[MatchError]]:
+        """Yield the matches of each lintable, in order, as soon as available."""
+        args = [
+            (str(lintable.path), lintable.kind, _loaded_content(lintable))
+            for lintable in lintables
+        ]
+        chunksize = max(1, len(args) // (self.processes * 4))
+        for result in self._pool.imap(run_rules, args, chunksize=chunksize):
+            yield [match_from_dict(data, self._rules[data["rule"]]) for data in result]
+
+    def close(self) -> None:
+        """Wait for the workers to exit."""
+        self._pool.close()
+        self._pool.join()
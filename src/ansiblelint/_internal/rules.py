@@ -1,6 +1,8 @@
 """Internally used rule classes."""
 import logging
-from typing import TYPE_CHECKING, Any, Dict, List, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Union
+
+from ansiblelint.profiling import get_profiler
 
 if TYPE_CHECKING:
     from typing import Optional
@@ -26,6 +28,16 @@ offending file can be added to `exclude_paths` configuration.
 """
 
 
+def _with_match_type(
+    matches: List["MatchError"], match_type: str
+) -> List["MatchError"]:
+    """Set the match type of matches not having one yet."""
+    for match in matches:
+        if match.match_type is None:
+            match.match_type = match_type
+    return matches
+
+
 # Derived rules are likely to want to access class members, so:
 # pylint: disable=unused-argument
 class BaseRule:
@@ -34,39 +46,94 @@ class BaseRule:
     id: str = ""
     tags: List[str] = []
     description: str = ""
-    help: str = ""  # markdown help (automatically loaded from `<rule>.md`)
+    # markdown file of the help, set by the rules loader for `<rule>.md`
+    help_path: str = ""
+    _help: "Optional[str]" = None
     version_added: str = ""
     severity: str = ""
     link: str = ""
     has_dynamic_tags: bool = False
     needs_raw_task: bool = False
+    # regular expression found in all the lines that ``match`` can report,
+    # other lines are not given to it
+    line_pattern: str = ""
     # We use _order to sort rules and to ensure that some run before others,
     # _order 0 for internal rules
     # _order 1 for rules that check that data can be loaded
     # _order 5 implicit for normal rules
     _order: int = 5
 
+    @property
+    def help(self) -> str:
+        """Return the markdown help, read from ``help_path`` when first needed."""
+        if self._help is None:
+            self._help = ""
+            if self.help_path:
+                with open(self.help_path, encoding="utf-8") as f:
+                    self._help = f.read()
+        return self._help
+
+    @help.setter
+    def help(self, value: str) -> None:
+        self._help = value
+
     @property
     def shortdesc(self) -> str:
         """Return the short description of the rule, basically the docstring."""
         return self.__doc__ or ""
 
-    def getmatches(self, file: "Lintable") -> List["MatchError"]:
-        """Return all matches while ignoring exceptions."""
+    def getmatches(
+        self,
+        file: "Lintable",
+        task_matches: "Optional[List[MatchError]]" = None,
+        line_matches: "Optional[List[MatchError]]" = None,
+    ) -> List["MatchError"]:
+        """Return all matches while ignoring exceptions.
+
+        ``task_matches`` and ``line_matches`` can provide the results of
+        ``matchtasks`` and ``matchlines`` when they were already computed for
+        this file, like by ``RulesCollection.run``.
+
+        Matches without a ``match_type`` get the one of the method that
+        returned them.
+        """
         matches = []
         if not file.path.is_dir():
-            for method in [self.matchlines, self.matchtasks, self.matchyaml]:
-                try:
-                    matches.extend(method(file))
-                except Exception as exc:  # pylint: disable=broad-except
-                    _logger.debug(
-                        "Ignored exception from %s.%s: %s",
-                        self.__class__.__name__,
-                        method,
-                        exc,
-                    )
+            for method, match_type, computed in (
+                (self.matchlines, "line", line_matches),
+                (self.matchtasks, "task", task_matches),
+                (self.matchyaml, "yaml", None),
+            ):
+                if computed is not None:
+                    method_matches = computed
+                else:
+                    try:
+                        method_matches = self._call_match_method(method, file)
+                    except Exception as exc:  # pylint: disable=broad-except
+                        _logger.debug(
+                            "Ignored exception from %s.%s: %s",
+                            self.__class__.__name__,
+                            method,
+                            exc,
+                        )
+                        continue
+                matches.extend(_with_match_type(method_matches, match_type))
         else:
-            matches.extend(self.matchdir(file))
+            matches.extend(
+                _with_match_type(self._call_match_method(self.matchdir, file), "dir")
+            )
+        return matches
+
+    def _call_match_method(
+        self, method: Callable[["Lintable"], List["MatchError"]], file: "Lintable"
+    ) -> List["MatchError"]:
+        """Return the matches of a method, timing it when profiling."""
+        profiler = get_profiler()
+        if profiler is None:
+            return method(file)
+        with profiler.measure(self.id, method.__name__) as sample:
+            matches = method(file)
+            sample.matches = len(matches)
         return matches
 
     def matchlines(self, file: "Lintable") -> List["MatchError"]:
@@ -0,0 +1,96 @@
+"""In-process execution of ansible-playbook syntax check.
+
+This module is imported by freshly spawned worker processes, so it must not
+import ansible at module level: ansible loads its configuration from the
+environment when first imported and the worker needs to prepare the
+environment before that happens.
+
+Workers are reused for many playbooks, so before each check they reset the
+global state ansible keeps about the previous one: the parsed command line,
+the plugin directories and the collections adjacent to its playbook. Otherwise
+a worker could resolve content that a fresh ``ansible-playbook`` would not
+find.
+"""
+import contextlib
+import io
+import os
+import sys
+import warnings
+from typing import Dict, List, Tuple
+
+
+def initialize_worker(environ: Dict[str, str]) -> None:
+    """Prepare the environment of a worker process before ansible is loaded."""
+    os.environ.clear()
+    os.environ.update(environ)
+    # To reduce noisy warnings like
+    # CryptographyDeprecationWarning: Blowfish has been deprecated
+    warnings.simplefilter("ignore")
+    # Load ansible while the worker waits for its playbook, so the import cost
+    # is not paid when the syntax check is requested.
+    # pylint: disable=import-outside-toplevel,unused-import
+    import ansible.cli.playbook  # noqa: F401
+
+
+def reset_ansible_state() -> None:
+    """Forget the state ansible kept about the previously executed playbook."""
+    # pylint: disable=import-outside-toplevel,protected-access
+    from ansible import context
+    from ansible.plugins import loader
+    from ansible.utils.collection_loader._collection_finder import (
+        _AnsibleCollectionFinder,
+    )
+    from ansible.utils.context_objects import CLIArgs, GlobalCLIArgs
+    from ansible.utils.display import Display
+
+    # Command line arguments are parsed into a singleton which would otherwise
+    # keep the arguments of the first execution.
+    GlobalCLIArgs._Singleton__instance = None  # type: ignore[attr-defined]
+    context.CLIARGS = CLIArgs({})
+
+    # Errors and warnings are displayed only once per process.
+    display = Display()
+    display._errors.clear()
+    display._warns.clear()
+    display._deprecations.clear()
+
+    # Plugin directories adjacent to the playbook, with the plugins loaded
+    # from them.
+    extra_dirs = []
+    for _, plugin_loader in loader.get_all_plugin_loaders():
+        extra_dirs.extend(plugin_loader._extra_dirs)
+        plugin_loader._extra_dirs = []
+        plugin_loader._clear_caches()
+    # Collections adjacent to the playbook, with the modules imported from any
+    # collection, as the finder caches the paths they were found in.
+    _AnsibleCollectionFinder._remove()
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None) or ""
+        if name.split(".")[0] == "ansible_collections" or any(
+            path.startswith(directory + os.sep) for directory in extra_dirs
+        ):
+            del sys.modules[name]
+    loader._configure_collection_loader()
+
+
+def run_playbook_cli(args: List[str], cwd: str) -> Tuple[int, str, str]:
+    """Execute ``ansible-playbook`` with given arguments inside current process.
+
+    Returns a tuple of exit code, stdout and stderr, same as the subprocess
+    would produce.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ansible.cli.playbook import PlaybookCLI
+
+    reset_ansible_state()
+    os.chdir(cwd)
+
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    returncode = 0
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            PlaybookCLI.cli_executor(["ansible-playbook", *args])
+        except SystemExit as exc:
+            returncode = exc.code if isinstance(exc.code, int) else 1
+    return returncode, stdout.getvalue(), stderr.getvalue()
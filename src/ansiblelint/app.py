@@ -3,7 +3,7 @@ import logging
 import os
 from dataclasses import dataclass
 from functools import lru_cache
-from typing import TYPE_CHECKING, Any, List, Tuple, Type
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, Optional, Tuple, Type
 
 from ansible_compat.runtime import Runtime
 
@@ -41,6 +41,41 @@ class SummarizedResults:
         return self.fixed_failures + self.fixed_warnings
 
 
+class MatchCounter:  # pylint: disable=too-few-public-methods
+    """Counts matches as they are reported, without keeping them."""
+
+    def __init__(self, warn_list: List[str]) -> None:
+        """Create a counter for matches, warnings being selected by warn_list."""
+        self.warn_list = warn_list
+        self.count = 0
+        self.summary = SummarizedResults()
+        # skippable rules matched, by match.tag or by rule id
+        self.matched_rules: "Dict[str, BaseRule]" = {}
+        self.experimental = False
+
+    def add(self, match: MatchError) -> None:
+        """Count a match."""
+        self.count += 1
+        # tag can include a sub-rule id: `yaml[document-start]`
+        # rule.id is the generic rule id: `yaml`
+        # *rule.tags is the list of the rule's tags (categories): `style`
+        if {match.tag, match.rule.id, *match.rule.tags}.isdisjoint(self.warn_list):
+            if match.fixed:
+                self.summary.fixed_failures += 1
+            else:
+                self.summary.failures += 1
+        else:
+            if match.fixed:
+                self.summary.fixed_warnings += 1
+            else:
+                self.summary.warnings += 1
+        # match.tag is more specialized than match.rule.id
+        if not match.ignored and "unskippable" not in match.rule.tags:
+            self.matched_rules[match.tag or match.rule.id] = match.rule
+        if "experimental" in match.rule.tags:
+            self.experimental = True
+
+
 class App:
     """App class represents an execution of the linter."""
 
@@ -60,15 +95,9 @@ class App:
         """Display given matches (if they are not fixed)."""
         matches = [match for match in matches if not match.fixed]
 
-        if isinstance(
-            self.formatter,
-            (formatters.CodeclimateJSONFormatter, formatters.SarifFormatter),
-        ):
-            # If formatter CodeclimateJSONFormatter or SarifFormatter is chosen,
-            # then print only the matches in JSON
-            console.print(
-                self.formatter.format_result(matches), markup=False, highlight=False
-            )
+        # If formatter CodeclimateJSONFormatter or SarifFormatter is chosen,
+        # then print only the matches in JSON
+        if self._write_report(matches):
             return
 
         ignored_matches = [match for match in matches if match.ignored]
@@ -91,35 +120,76 @@ class App:
                 if not match.ignored:
                     console.print(self.formatter.format(match), highlight=False)
 
+        annotations_formatter = self._annotations_formatter()
+        if annotations_formatter:
+            for match in matches:
+                console.print(
+                    annotations_formatter.format(match), markup=False, highlight=False
+                )
+
+    def render_stream(self, batches: Iterable[List[MatchError]]) -> MatchCounter:
+        """Display matches as soon as each batch of them is available.
+
+        Matches are counted instead of being kept, JSON reports are written
+        as matches are found too.
+        """
+        counter = MatchCounter(self.options.warn_list)
+        matches = self._counted(batches, counter)
+        if self._write_report(matches):
+            return counter
+        annotations_formatter = self._annotations_formatter()
+        for match in matches:
+            console.print(self.formatter.format(match), highlight=False)
+            if annotations_formatter:
+                console.print(
+                    annotations_formatter.format(match), markup=False, highlight=False
+                )
+        return counter
+
+    @staticmethod
+    def _counted(
+        batches: Iterable[List[MatchError]], counter: MatchCounter
+    ) -> Iterator[MatchError]:
+        """Yield matches not fixed, counting all of them."""
+        for batch in batches:
+            for match in batch:
+                counter.add(match)
+                if not match.fixed:
+                    yield match
+
+    def _write_report(self, matches: Iterable[MatchError]) -> bool:
+        """Write a JSON report of matches, if the formatter makes one.
+
+        Reports go straight to the console file, as they can be huge and rich
+        would keep and process all of their text.
+        """
+        if not isinstance(
+            self.formatter,
+            (formatters.CodeclimateJSONFormatter, formatters.SarifFormatter),
+        ):
+            return False
+        output = console.file
+        self.formatter.write_result(matches, output)
+        output.write("\n")
+        output.flush()
+        return True
+
+    def _annotations_formatter(self) -> Optional[formatters.AnnotationsFormatter]:
+        """Return a formatter for GitHub annotations, if running under its Actions."""
         # If run under GitHub Actions we also want to emit output recognized by it.
         if os.getenv("GITHUB_ACTIONS") == "true" and os.getenv("GITHUB_WORKFLOW"):
-            formatter = formatters.AnnotationsFormatter(self.options.cwd, True)
-            for match in matches:
-                console.print(formatter.format(match), markup=False, highlight=False)
+            return formatters.AnnotationsFormatter(self.options.cwd, True)
+        return None
 
     def count_results(self, matches: List[MatchError]) -> SummarizedResults:
         """Count failures and warnings in matches."""
-        failures = 0
-        warnings = 0
-        fixed_failures = 0
-        fixed_warnings = 0
+        return self._count(matches).summary
+
+    def _count(self, matches: List[MatchError]) -> MatchCounter:
+        counter = MatchCounter(self.options.warn_list)
         for match in matches:
-            # tag can include a sub-rule id: `yaml[document-start]`
-            # rule.id is the generic rule id: `yaml`
-            # *rule.tags is the list of the rule's tags (categories): `style`
-            if {match.tag, match.rule.id, *match.rule.tags}.isdisjoint(
-                self.options.warn_list
-            ):
-                if match.fixed:
-                    fixed_failures += 1
-                else:
-                    failures += 1
-            else:
-                if match.fixed:
-                    fixed_warnings += 1
-                else:
-                    warnings += 1
-        return SummarizedResults(failures, warnings, fixed_failures, fixed_warnings)
+            counter.add(match)
+        return counter
 
     @staticmethod
     def count_lintables(files: "Set[Lintable]") -> Tuple[int, int]:
@@ -128,44 +198,34 @@ class App:
         changed_files_count = len([file for file in files if file.updated])
         return files_count, changed_files_count
 
-    @staticmethod
-    def _get_matched_skippable_rules(
-        matches: List[MatchError],
-    ) -> "Dict[str, BaseRule]":
-        """Extract the list of matched rules, if skippable, from the list of matches."""
-        matches_unignored = [match for match in matches if not match.ignored]
-        # match.tag is more specialized than match.rule.id
-        matched_rules = {
-            match.tag or match.rule.id: match.rule for match in matches_unignored
-        }
-        # remove unskippable rules from the list
-        for rule_id in list(matched_rules.keys()):
-            if "unskippable" in matched_rules[rule_id].tags:
-                matched_rules.pop(rule_id)
-        return matched_rules
-
     def report_outcome(
-        self, result: "LintResult", mark_as_success: bool = False
+        self,
+        result: "LintResult",
+        mark_as_success: bool = False,
+        counter: Optional[MatchCounter] = None,
     ) -> int:
         """Display information about how to skip found rules.
 
+        Matches are counted from the result, unless a ``counter`` of the
+        matches already displayed is given.
+
         Returns exit code, 2 if errors were found, 0 when only warnings were found.
         """
         msg = ""
 
-        summary = self.count_results(result.matches)
+        if counter is None:
+            counter = self._count(result.matches)
+        summary = counter.summary
         files_count, changed_files_count = self.count_lintables(result.files)
 
-        matched_rules = self._get_matched_skippable_rules(result.matches)
+        matched_rules = counter.matched_rules
 
         entries = []
         for key in sorted(matched_rules.keys()):
             if {key, *matched_rules[key].tags}.isdisjoint(self.options.warn_list):
                 entries.append(f"  - {key}  # {matched_rules[key].shortdesc}\n")
-        for match in result.matches:
-            if "experimental" in match.rule.tags:
-                entries.append("  - experimental  # all rules tagged as experimental\n")
-                break
+        if counter.experimental:
+            entries.append("  - experimental  # all rules tagged as experimental\n")
         if entries and not self.options.quiet:
             console_stderr.print(
                 "You can skip specific rules or tags by adding them to your "
@@ -198,9 +258,14 @@ warn_list:  # or 'skip_list' to silence them completely
                 "because 'yaml' is in 'skip_list'."
             )
 
-        if (result.matches or changed_files_count) and not self.options.quiet:
+        if (counter.count or changed_files_count) and not self.options.quiet:
             console_stderr.print(render_yaml(msg))
             self.report_summary(summary, changed_files_count, files_count)
+            if result.cache_hits or result.cache_misses:
+                console_stderr.print(
+                    f"Result cache: {result.cache_hits} hit(s), "
+                    f"{result.cache_misses} miss(es)."
+                )
 
         if mark_as_success or not summary.failures:
             return SUCCESS_RC
@@ -0,0 +1,518 @@
+"""On-disk caches used to speed-up consecutive runs of the linter."""
+import hashlib
+import json
+import logging
+import os
+from argparse import Namespace
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import ansiblelint.utils
+from ansiblelint.app import get_app
+from ansiblelint.config import ansible_collections_path
+from ansiblelint.errors import MatchError
+from ansiblelint.file_utils import Lintable
+from ansiblelint.version import __version__
+from ansiblelint.yaml_utils import load_yamllint_config
+
+if TYPE_CHECKING:
+    from ansiblelint._internal.rules import BaseRule
+    from ansiblelint.rules import RulesCollection
+
+_logger = logging.getLogger(__name__)
+
+# Bump this when the format of the cached entries changes.
+CACHE_FORMAT = 2
+
+# Options that can change the outcome of running the rules on a file.
+_RESULT_AFFECTING_OPTIONS = (
+    "enable_list",
+    "extra_vars",
+    "kinds",
+    "loop_var_prefix",
+    "mock_modules",
+    "mock_roles",
+    "profile",
+    "rules",
+    "skip_action_validation",
+    "var_naming_pattern",
+)
+
+
+def sha256_text(text: str) -> str:
+    """Return the hex sha256 digest of a string."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def collections_paths() -> List[str]:
+    """Return the paths ansible looks for collections in."""
+    paths = os.environ.get(ansible_collections_path())
+    if paths:
+        return paths.split(os.pathsep)
+    return list(get_app(offline=True).runtime.config.collections_paths)
+
+
+def collections_digests() -> Dict[str, str]:
+    """Return digests of the metadata of installed collections, keyed by path.
+
+    The digest changes when a collection gets installed, removed or upgraded.
+    """
+    digests = {}
+    for path in collections_paths():
+        root = Path(os.path.expanduser(path)) / "ansible_collections"
+        for collection in sorted(root.glob("*/*")):
+            for name in ("MANIFEST.json", "galaxy.yml"):
+                try:
+                    content = (collection / name).read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError):
+                    continue
+                digests[str(collection)] = sha256_text(content)
+                break
+    return digests
+
+
+def environment_fingerprint() -> Dict[str, Any]:
+    """Return the state of the environment that affects linting results.
+
+    It covers the version of ansible-core, the installed collections and the
+    effective yamllint configuration.
+    """
+    yamllint_config = load_yamllint_config()
+    return {
+        "ansible_version": str(get_app(offline=True).runtime.version),
+        "collections": collections_digests(),
+        "yamllint": [
+            yamllint_config.rules,
+            yamllint_config.ignore,
+            yamllint_config.yaml_files,
+            yamllint_config.locale,
+        ],
+    }
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Write ``data`` as JSON to ``path`` without exposing partial files."""
+    text = json.dumps(data)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile(
+        mode="w", dir=path.parent, prefix=".tmp-", delete=False, encoding="utf-8"
+    ) as tmp:
+        tmp.write(text)
+    os.replace(tmp.name, path)
+
+
+def read_json(path: Path) -> Any:
+    """Return loaded JSON from ``path`` or None if missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def match_to_dict(match: MatchError) -> Dict[str, Any]:
+    """Serialize a match into a JSON compatible dictionary."""
+    return {
+        "message": match.message,
+        "linenumber": match.linenumber,
+        "column": match.column,
+        "details": match.details,
+        "filename": match.filename,
+        "rule": getattr(match.rule, "id", ""),
+        "tag": match.tag,
+        "severity": match.severity,
+        "match_type": match.match_type,
+        "yaml_path": match.yaml_path,
+    }
+
+
+def match_from_dict(data: Dict[str, Any], rule: "BaseRule") -> MatchError:
+    """Recreate a match previously serialized with ``match_to_dict``."""
+    match = MatchError(
+        message=data["message"],
+        linenumber=data["linenumber"],
+        column=data["column"],
+        details=data["details"],
+        filename=data["filename"],
+        rule=rule,
+        tag=data["tag"],
+    )
+    match.severity = data["severity"]
+    match.match_type = data["match_type"]
+    match.yaml_path = data["yaml_path"]
+    return match
+
+
+class ResultCache:
+    """Content addressed cache of matches produced by ``RulesCollection.run``.
+
+    Entries are keyed by the lintable content, its kind and path, combined with
+    a fingerprint of the linter version, the enabled rules, the source of the
+    rules directories, the effective configuration and the environment, see
+    ``environment_fingerprint``. Any change in these produces a different key,
+    so stale entries are never replayed.
+    """
+
+    # tags and skip list are given apart from options as runs can override them
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        cache_dir: str,
+        rules: "RulesCollection",
+        options: Namespace,
+        tags: Optional[List[str]] = None,
+        skip_list: Optional[List[str]] = None,
+    ) -> None:
+        """Initialize the cache for a specific rules collection and config."""
+        self.path = Path(cache_dir) / "results"
+        self.hits = 0
+        self.misses = 0
+        self._rules: Dict[str, "BaseRule"] = {rule.id: rule for rule in rules.rules}
+        self._fingerprint = self._compute_fingerprint(
+            rules, options, sorted(tags or []), sorted(skip_list or [])
+        )
+
+    @staticmethod
+    def _compute_fingerprint(
+        rules: "RulesCollection",
+        options: Namespace,
+        tags: List[str],
+        skip_list: List[str],
+    ) -> str:
+        rules_sources = {}
+        for rulesdir in rules.rulesdirs:
+            for filename in sorted(Path(rulesdir).glob("*.py")):
+                rules_sources[str(filename)] = sha256_text(
+                    filename.read_text(encoding="utf-8")
+                )
+        data = {
+            "format": CACHE_FORMAT,
+            "version": __version__,
+            "cwd": os.getcwd(),
+            "rules": sorted(
+                (rule.id, rule.version_added, rule.__class__.__qualname__)
+                for rule in rules.rules
+            ),
+            "rules_sources": rules_sources,
+            "environment": environment_fingerprint(),
+            "tags": tags,
+            "skip_list": skip_list,
+            "options": {
+                key: getattr(options, key, None) for key in _RESULT_AFFECTING_OPTIONS
+            },
+        }
+        return sha256_text(json.dumps(data, sort_keys=True, default=str))
+
+    def _key(self, lintable: Lintable) -> Optional[str]:
+        """Return the cache key of a lintable or None if it cannot be cached."""
+        if lintable.path.is_dir():
+            return None
+        try:
+            content = lintable.content
+        except (IOError, UnicodeDecodeError):
+            return None
+        return sha256_text(
+            "\0".join(
+                [
+                    self._fingerprint,
+                    lintable.name,
+                    str(lintable.kind),
+                    str(lintable.base_kind),
+                    sha256_text(content),
+                ]
+            )
+        )
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.json"
+
+    def get(self, lintable: Lintable) -> Optional[List[MatchError]]:
+        """Return cached matches for the lintable, None on cache miss."""
+        key = self._key(lintable)
+        data = read_json(self._entry_path(key)) if key else None
+        if isinstance(data, list):
+            try:
+                # pylint: disable=not-an-iterable
+                matches = [
+                    match_from_dict(entry, self._rules[entry["rule"]]) for entry in data
+                ]
+            except (KeyError, TypeError, RuntimeError) as exc:
+                _logger.debug("Ignored invalid cache entry for %s: %s", lintable, exc)
+            else:
+                self.hits += 1
+                return matches
+        self.misses += 1
+        return None
+
+    def put(self, lintable: Lintable, matches: List[MatchError]) -> None:
+        """Store the matches found for the lintable."""
+        key = self._key(lintable)
+        if not key:
+            return
+        for match in matches:
+            if self._rules.get(getattr(match.rule, "id", "")) is None:
+                # we cannot replay matches made by rules outside the collection
+                return
+        try:
+            data = [match_to_dict(match) for match in matches]
+            write_json_atomic(self._entry_path(key), data)
+        except (OSError, TypeError, ValueError) as exc:
+            _logger.debug("Failed to cache results for %s: %s", lintable, exc)
+
+
+def dependency_closure(lintable: Lintable) -> Optional[List[Lintable]]:
+    """Return the lintable and every file reachable from it via ``find_children``.
+
+    Returns None when the closure cannot be determined, like when one of the
+    files cannot be loaded.
+    """
+    seen: Dict[str, Lintable] = {}
+    queue = [lintable]
+    while queue:
+        item = queue.pop()
+        key = str(item.path.absolute())
+        if key in seen:
+            continue
+        seen[key] = item
+        try:
+            queue.extend(ansiblelint.utils.find_children(item))
+        except (Exception, SystemExit):  # pylint: disable=broad-except
+            return None
+    return [seen[key] for key in sorted(seen)]
+
+
+class SyntaxCheckCache:
+    """Cache of ``ansible-playbook --syntax-check`` outcomes.
+
+    Entries are keyed by the content of the playbook and of every file it
+    includes or imports, directly or not, together with the version of
+    ansible-core, the installed collections, the extra vars and the mocked
+    modules and roles. Cached matches are recreated for the syntax check rule
+    given.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        options: Namespace,
+        ansible_version: str,
+        rule: "BaseRule",
+    ):
+        """Initialize the cache for a specific ansible version and config."""
+        self.path = Path(cache_dir) / "syntax-check"
+        self._rule = rule
+        self.hits = 0
+        self.misses = 0
+        self._keys: Dict[Lintable, Optional[str]] = {}
+        self._fingerprint = sha256_text(
+            json.dumps(
+                {
+                    "format": CACHE_FORMAT,
+                    "version": __version__,
+                    "ansible_version": ansible_version,
+                    "collections": collections_digests(),
+                    "cwd": os.getcwd(),
+                    "extra_vars": options.extra_vars,
+                    "mock_modules": options.mock_modules,
+                    "mock_roles": options.mock_roles,
+                },
+                sort_keys=True,
+                default=str,
+            )
+        )
+
+    def _key(self, lintable: Lintable) -> Optional[str]:
+        """Return the cache key of a playbook or None if it cannot be cached."""
+        if lintable in self._keys:
+            return self._keys[lintable]
+        files = dependency_closure(lintable)
+        key = None
+        if files is not None:
+            digests = [self._fingerprint, lintable.name]
+            for file in files:
+                if file.path.is_dir():
+                    continue
+                try:
+                    digest = sha256_text(file.content)
+                except (IOError, UnicodeDecodeError):
+                    digest = ""
+                digests.append(f"{file.path.absolute()}:{digest}")
+            key = sha256_text("\0".join(digests))
+        self._keys[lintable] = key
+        return key
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.json"
+
+    def get(self, lintable: Lintable) -> Optional[List[MatchError]]:
+        """Return the cached syntax check outcome of a playbook, None on miss."""
+        key = self._key(lintable)
+        data = read_json(self._entry_path(key)) if key else None
+        if isinstance(data, list):
+            try:
+                # pylint: disable=not-an-iterable
+                matches = [match_from_dict(entry, self._rule) for entry in data]
+            except (KeyError, TypeError, RuntimeError) as exc:
+                _logger.debug("Ignored invalid cache entry for %s: %s", lintable, exc)
+            else:
+                self.hits += 1
+                return matches
+        self.misses += 1
+        return None
+
+    def put(self, lintable: Lintable, matches: List[MatchError]) -> None:
+        """Store the syntax check outcome of a playbook."""
+        key = self._key(lintable)
+        if not key:
+            return
+        if any(match.rule.id != self._rule.id for match in matches):
+            # unexpected failures, like a crash of ansible, are not cached
+            return
+        try:
+            data = [match_to_dict(match) for match in matches]
+            write_json_atomic(self._entry_path(key), data)
+        except (OSError, TypeError, ValueError) as exc:
+            _logger.debug("Failed to cache syntax check of %s: %s", lintable, exc)
+
+
+def match_fingerprint(match: MatchError) -> str:
+    """Return a digest identifying a match, equal for equal matches."""
+    return sha256_text(
+        json.dumps(
+            [
+                match.filename,
+                match.linenumber,
+                str(getattr(match.rule, "id", 0)),
+                match.message,
+                match.details,
+                match.column,
+            ],
+            default=str,
+        )
+    )
+
+
+class BaselineCache:
+    """Fingerprints of the matches found in the files of git commits.
+
+    Used by progressive mode to compare matches with the ones of the previous
+    commit without linting it again. Each file entry records the git object
+    id of the file, so entries stay valid for any commit where the file did
+    not change. Entries are kept apart for each linter version, set of rules
+    and configuration, like with ``ResultCache``.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        cache_dir: str,
+        rules: "RulesCollection",
+        options: Namespace,
+        tags: Optional[List[str]] = None,
+        skip_list: Optional[List[str]] = None,
+    ) -> None:
+        """Initialize the cache for a specific rules collection and config."""
+        self.path = Path(cache_dir) / "baselines"
+        # pylint: disable=protected-access
+        self._fingerprint = ResultCache._compute_fingerprint(
+            rules, options, sorted(tags or []), sorted(skip_list or [])
+        )
+
+    def _entry_path(self, commit: str) -> Path:
+        return self.path / f"{sha256_text(self._fingerprint + commit)}.json"
+
+    def get(self, commit: str) -> Dict[str, Dict[str, Any]]:
+        """Return the entries stored for a commit, keyed by file path."""
+        data = read_json(self._entry_path(commit))
+        return data if isinstance(data, dict) else {}
+
+    def put(self, commit: str, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Add entries, made of ``blob`` and ``matches`` keys, to a commit."""
+        if not entries:
+            return
+        data = self.get(commit)
+        data.update(entries)
+        try:
+            write_json_atomic(self._entry_path(commit), data)
+        except (OSError, TypeError, ValueError) as exc:
+            _logger.debug("Failed to store baseline of %s: %s", commit, exc)
+
+
+def _file_state(path: str) -> List[int]:
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class RulesManifestCache:
+    """Manifest of a rules directory not shipping one, see ``build_manifest``.
+
+    Entries of each module record its modification time, size and content
+    hash, so unchanged modules do not need to be imported to know which rules
+    they provide. The content is only hashed when the modification time or
+    size changed.
+    """
+
+    def __init__(self, cache_dir: str, rulesdir: str) -> None:
+        """Load the cached manifest of a rules directory."""
+        key = sha256_text(os.path.abspath(rulesdir))
+        self.path = Path(cache_dir) / "rules" / f"{key}.json"
+        self._modules: Dict[str, Dict[str, Any]] = {}
+        self._changed = False
+        data = read_json(self.path)
+        if (
+            isinstance(data, dict)
+            and data.get("format") == CACHE_FORMAT
+            and data.get("version") == __version__
+        ):
+            self._modules = data.get("modules", {})
+
+    def get(self, pluginfile: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the manifest entries of a module, None if it changed."""
+        module = self._modules.get(pluginfile)
+        if module is None:
+            return None
+        try:
+            state = _file_state(pluginfile)
+            if state != module["state"]:
+                with open(pluginfile, encoding="utf-8") as f:
+                    if sha256_text(f.read()) != module["sha256"]:
+                        return None
+                module["state"] = state
+                self._changed = True
+        except (OSError, UnicodeDecodeError, KeyError):
+            return None
+        return module["rules"]  # type: ignore[no-any-return]
+
+    def put(self, pluginfile: str, entries: List[Dict[str, Any]]) -> None:
+        """Record the manifest entries of a module that was just imported."""
+        try:
+            with open(pluginfile, encoding="utf-8") as f:
+                digest = sha256_text(f.read())
+            state = _file_state(pluginfile)
+        except (OSError, UnicodeDecodeError):
+            return
+        self._modules[pluginfile] = {
+            "state": state,
+            "sha256": digest,
+            "rules": entries,
+        }
+        self._changed = True
+
+    def save(self) -> None:
+        """Write the manifest if it changed, forgetting removed modules."""
+        if not self._changed:
+            return
+        modules = {
+            pluginfile: module
+            for pluginfile, module in self._modules.items()
+            if os.path.exists(pluginfile)
+        }
+        try:
+            write_json_atomic(
+                self.path,
+                {"format": CACHE_FORMAT, "version": __version__, "modules": modules},
+            )
+        except (OSError, TypeError, ValueError) as exc:
+            _logger.debug("Failed to cache rules manifest in %s: %s", self.path, exc)
+        self._changed = False
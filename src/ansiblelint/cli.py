@@ -10,7 +10,12 @@ from typing import Any, Callable, Dict, List, Optional, Sequence, Union
 
 import yaml
 
-from ansiblelint.config import DEFAULT_KINDS, DEFAULT_WARN_LIST, PROFILES
+from ansiblelint.config import (
+    DEFAULT_KINDS,
+    DEFAULT_PARSE_CACHE_SIZE,
+    DEFAULT_WARN_LIST,
+    PROFILES,
+)
 from ansiblelint.constants import (
     CUSTOM_RULESDIR_ENVVAR,
     DEFAULT_RULESDIR,
@@ -287,6 +292,89 @@ def get_cli_parser() -> argparse.ArgumentParser:
         " of violations compared with previous git commit. This "
         "feature works only in git repositories.",
     )
+    parser.add_argument(
+        "--profile-rules",
+        dest="profile_rules",
+        nargs="?",
+        const="table",
+        choices=["table", "json"],
+        default=None,
+        help="Report the time spent by each rule and linting phase on stderr, "
+        "as a table (default) or as JSON.",
+    )
+    parser.add_argument(
+        "--stream",
+        dest="stream",
+        default=False,
+        action="store_true",
+        help="Display matches of each file as soon as it was linted, instead "
+        "of sorting all of them at the end. Ignored with --write and "
+        "--progressive.",
+    )
+    parser.add_argument(
+        "--daemon",
+        dest="daemon",
+        action="store_true",
+        default=False,
+        help="Keep running, serving lint requests sent with "
+        "'python -m ansiblelint.daemon FILE...' over a Unix socket.",
+    )
+    parser.add_argument(
+        "--lsp",
+        dest="lsp",
+        action="store_true",
+        default=False,
+        help="Run as a language server, communicating over stdin and stdout.",
+    )
+    parser.add_argument(
+        "--daemon-socket",
+        dest="daemon_socket",
+        metavar="PATH",
+        default=None,
+        help="Socket the daemon listens on, by default one derived from the "
+        "project directory.",
+    )
+    parser.add_argument(
+        "--changed-since",
+        dest="changed_since",
+        metavar="REF",
+        default=None,
+        help="Lint only files changed since the given git revision, along "
+        "with the playbooks and roles that import or include them.",
+    )
+    parser.add_argument(
+        "--cache",
+        dest="use_cache",
+        default=False,
+        action="store_true",
+        help="Reuse results stored in the cache directory for files that did "
+        "not change since a previous run.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes used to run the rules on files "
+        "(default: 1).",
+    )
+    parser.add_argument(
+        "--parse-cache-size",
+        dest="parse_cache_size",
+        type=int,
+        default=None,
+        help="Maximum size in bytes of the files whose parsed content is kept "
+        f"in memory during a run (default: {DEFAULT_PARSE_CACHE_SIZE}).",
+    )
+    parser.add_argument(
+        "--syntax-check-engine",
+        dest="syntax_check_engine",
+        choices=["subprocess", "in-process"],
+        default=None,
+        help="How to run ansible-playbook syntax check: one subprocess per "
+        "playbook (default) or inside a pool of long lived worker processes.",
+    )
     parser.add_argument(
         "--project-dir",
         dest="project_dir",
@@ -427,6 +515,19 @@ def get_cli_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def _apply_defaults(
+    cli_config: Namespace, lists_map: Dict[str, Any], scalar_map: Dict[str, Any]
+) -> Namespace:
+    """Set the default value of list and scalar options missing from the CLI."""
+    for entry, default in lists_map.items():
+        if not getattr(cli_config, entry, None):
+            setattr(cli_config, entry, default)
+    for entry, default in scalar_map.items():
+        if getattr(cli_config, entry, None) is None:
+            setattr(cli_config, entry, default)
+    return cli_config
+
+
 def merge_config(file_config: Dict[Any, Any], cli_config: Namespace) -> Namespace:
     """Combine the file config with the CLI args."""
     bools = (
@@ -436,6 +537,8 @@ def merge_config(file_config: Dict[Any, Any], cli_config: Namespace) -> Namespac
         "use_default_rules",
         "progressive",
         "offline",
+        "use_cache",
+        "stream",
     )
     # maps lists to their default config values
     lists_map = {
@@ -453,15 +556,16 @@ def merge_config(file_config: Dict[Any, Any], cli_config: Namespace) -> Namespac
     scalar_map = {
         "loop_var_prefix": None,
         "project_dir": ".",
+        "syntax_check_engine": "subprocess",
+        "jobs": 1,
+        "parse_cache_size": DEFAULT_PARSE_CACHE_SIZE,
+        "changed_since": None,
     }
 
     if not file_config:
         # use defaults if we don't have a config file and the commandline
         # parameter is not set
-        for entry, default in lists_map.items():
-            if not getattr(cli_config, entry, None):
-                setattr(cli_config, entry, default)
-        return cli_config
+        return _apply_defaults(cli_config, lists_map, scalar_map)
 
     for entry in bools:
         v = getattr(cli_config, entry) or file_config.pop(entry, False)
@@ -10,6 +10,9 @@ from ansiblelint.loaders import yaml_from_file
 
 DEFAULT_WARN_LIST = ["experimental", "name[casing]", "role-name"]
 
+# Budget of the cache of parsed files, measured on the size of parsed texts.
+DEFAULT_PARSE_CACHE_SIZE = 16 * 1024 * 1024
+
 DEFAULT_KINDS = [
     # Do not sort this list, order matters.
     {"jinja2": "**/*.j2"},  # jinja2 templates are not always parsable as something else
@@ -116,6 +119,16 @@ options = Namespace(
     extra_vars=None,
     enable_list=[],
     skip_action_validation=True,
+    use_cache=False,
+    syntax_check_engine="subprocess",
+    jobs=1,
+    parse_cache_size=DEFAULT_PARSE_CACHE_SIZE,
+    changed_since=None,
+    profile_rules=None,
+    stream=False,
+    daemon=False,
+    daemon_socket=None,
+    lsp=False,
     rules={},  # Placeholder to set and keep configurations for each rule.
 )
 
@@ -0,0 +1,318 @@
+"""Lint daemon keeping Ansible and the rules loaded between requests.
+
+The daemon is started with ``ansible-lint --daemon`` and listens on a Unix
+socket. Each connection sends a single JSON request, terminated by a newline,
+and receives a single JSON response::
+
+    {"command": "lint", "files": ["/abs/path/playbook.yml"]}
+    {"matches": [...], "rc": 2}
+
+Results are remembered for each file, along with the modification time, size
+and content hash of the files it includes, and replayed until one of them
+changes or an included file that was missing appears. Clients do not need to import Ansible, see ``main``.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from argparse import Namespace
+
+    from ansiblelint.rules import RulesCollection
+
+_logger = logging.getLogger(__name__)
+
+# Time a connection may stay idle, in seconds, before being dropped.
+CONNECTION_TIMEOUT = 60
+
+
+def default_socket_path(project_dir: str) -> str:
+    """Return the socket used by the daemon of a project by default."""
+    key = hashlib.sha256(os.path.abspath(project_dir).encode("utf-8")).hexdigest()
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"ansible-lint-{key[:12]}.sock")
+
+
+def _file_state(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@dataclass
+class _Entry:
+    """Matches of a file and the state of the files they depend on."""
+
+    matches: List[Dict[str, Any]]
+    return_code: int
+    # path -> (mtime_ns, size, sha256), None for files that did not exist
+    files: Dict[str, Optional[Tuple[int, int, str]]] = field(default_factory=dict)
+
+    def is_valid(self) -> bool:
+        """Tell if none of the files changed, looking at contents only if needed."""
+        for path, recorded in self.files.items():
+            if recorded is None:
+                if os.path.exists(path):
+                    return False
+                continue
+            mtime, size, digest = recorded
+            try:
+                state = _file_state(path)
+                if state == (mtime, size):
+                    continue
+                if state[1] != size or _file_digest(path) != digest:
+                    return False
+            except OSError:
+                return False
+            self.files[path] = (*state, digest)
+        return True
+
+
+class LintDaemon:
+    """Serve lint requests using already loaded rules and options."""
+
+    def __init__(
+        self, rules: "RulesCollection", options: "Namespace", socket_path: str
+    ) -> None:
+        """Prepare a daemon for the project the options were loaded for."""
+        self.rules = rules
+        self.options = options
+        self.socket_path = socket_path
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, _Entry] = {}
+        self._stopped = False
+
+    def serve(self) -> int:
+        """Handle requests until a stop request or a termination signal."""
+        # pylint: disable=import-outside-toplevel
+        from ansiblelint.color import console_stderr
+
+        if os.path.exists(self.socket_path):
+            if _is_listening(self.socket_path):
+                _logger.error("A daemon already listens on %s", self.socket_path)
+                return 1
+            os.unlink(self.socket_path)
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            """Read a JSON request and write back its JSON response."""
+
+            timeout = CONNECTION_TIMEOUT
+
+            def handle(self) -> None:
+                try:
+                    data = json.loads(self.rfile.readline())
+                    response = daemon.handle(data)
+                # linting code can call sys.exit(), which must not stop us
+                except (Exception, SystemExit) as exc:  # pylint: disable=broad-except
+                    _logger.exception("Failed to handle request")
+                    response = {"error": str(exc)}
+                self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+        if threading.current_thread() is threading.main_thread():
+            # SIGTERM should remove the socket like an interruption does
+            signal.signal(signal.SIGTERM, _interrupt)
+        with socketserver.UnixStreamServer(self.socket_path, Handler) as server:
+            os.chmod(self.socket_path, 0o600)
+            console_stderr.print(f"Lint daemon listening on {self.socket_path}")
+            try:
+                while not self._stopped:
+                    server.handle_request()
+            finally:
+                os.unlink(self.socket_path)
+        return 0
+
+    def handle(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the response to a request message."""
+        command = message.get("command")
+        if command == "lint":
+            return self.lint(message.get("files", []))
+        if command == "ping":
+            return {"pid": os.getpid(), "hits": self.hits, "misses": self.misses}
+        if command == "stop":
+            self._stopped = True
+            return {}
+        return {"error": f"Unknown command: {command}"}
+
+    def lint(self, files: List[str]) -> Dict[str, Any]:
+        """Lint files given by absolute paths, reusing results still valid."""
+        # pylint: disable=import-outside-toplevel
+        from ansiblelint.file_utils import clear_path_caches
+
+        clear_path_caches()
+        matches: List[Dict[str, Any]] = []
+        return_code = 0
+        for path in files:
+            path = os.path.abspath(path)
+            entry = self._entries.get(path)
+            if entry is not None and entry.is_valid():
+                self.hits += 1
+            else:
+                self.misses += 1
+                entry = self._lint_file(path)
+                self._entries[path] = entry
+            matches.extend(entry.matches)
+            return_code = max(return_code, entry.return_code)
+        return {"matches": matches, "rc": return_code}
+
+    def _lint_file(self, path: str) -> _Entry:
+        # pylint: disable=import-outside-toplevel,too-many-locals
+        from ansiblelint.app import get_app
+        from ansiblelint.cache import match_to_dict
+        from ansiblelint.constants import SUCCESS_RC, VIOLATIONS_FOUND_RC
+        from ansiblelint.file_utils import Lintable, normpath
+        from ansiblelint.incremental import dependency_graph
+        from ansiblelint.runner import _get_matches
+
+        name = normpath(path)
+        # syntax check and rules results depend on the files that are included,
+        # whose state is recorded first so that changes made while linting
+        # are noticed by the next request
+        nodes, _ = dependency_graph([Lintable(name)])
+        files = _file_states([path, *nodes])
+
+        with self.options.cache_dir_lock:
+            result = _get_matches(self.rules, self.options, lintables=[Lintable(name)])
+        summary = get_app(offline=True).count_results(result.matches)
+        matches = []
+        for match in result.matches:
+            data = match_to_dict(match)
+            data["level"] = (
+                "error"
+                if {match.tag, match.rule.id, *match.rule.tags}.isdisjoint(
+                    self.options.warn_list
+                )
+                else "warning"
+            )
+            matches.append(data)
+        return _Entry(
+            matches=matches,
+            return_code=VIOLATIONS_FOUND_RC if summary.failures else SUCCESS_RC,
+            files=files,
+        )
+
+
+def _file_states(paths: List[str]) -> Dict[str, Optional[Tuple[int, int, str]]]:
+    """Return modification time, size and content hash of files.
+
+    Missing files, like included files not created yet, are recorded as None so
+    that their creation is noticed.
+    """
+    states: Dict[str, Optional[Tuple[int, int, str]]] = {}
+    for path in paths:
+        if path in states:
+            continue
+        if not os.path.exists(path):
+            states[path] = None
+        elif os.path.isfile(path):
+            try:
+                states[path] = (*_file_state(path), _file_digest(path))
+            except OSError:
+                pass
+    return states
+
+
+def serve(rules: "RulesCollection", options: "Namespace") -> int:
+    """Run the daemon in the foreground."""
+    socket_path = options.daemon_socket or default_socket_path(options.project_dir)
+    # other linter instances should only wait for the cache while linting
+    options.cache_dir_lock.release()
+    try:
+        return LintDaemon(rules, options, socket_path).serve()
+    except KeyboardInterrupt:
+        return 0
+
+
+def _interrupt(*_: Any) -> None:
+    raise KeyboardInterrupt
+
+
+def _is_listening(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def request(socket_path: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Send a request to a running daemon and return its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps(data).encode("utf-8") + b"\n")
+        with client.makefile("rb") as response:
+            return json.loads(response.readline())  # type: ignore[no-any-return]
+
+
+def _project_dir() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"],
+            check=True,
+            universal_newlines=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        ).stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return os.getcwd()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Lint files using a running daemon, printing matches in PEP8 format."""
+    parser = argparse.ArgumentParser(
+        prog="python -m ansiblelint.daemon", description=main.__doc__
+    )
+    parser.add_argument("--socket", help="socket of the daemon to use")
+    parser.add_argument(
+        "--stop", action="store_true", help="stop the daemon instead of linting"
+    )
+    parser.add_argument("files", nargs="*")
+    args = parser.parse_args(argv)
+    socket_path = args.socket or default_socket_path(_project_dir())
+    try:
+        if args.stop:
+            request(socket_path, {"command": "stop"})
+            return 0
+        response = request(
+            socket_path,
+            {
+                "command": "lint",
+                "files": [os.path.abspath(name) for name in args.files],
+            },
+        )
+    except OSError as exc:
+        print(f"Unable to reach lint daemon at {socket_path}: {exc}", file=sys.stderr)
+        return 1
+    if "error" in response:
+        print(response["error"], file=sys.stderr)
+        return 1
+    for match in response["matches"]:
+        position = match["linenumber"]
+        if match["column"]:
+            position = f"{position}:{match['column']}"
+        print(
+            f"{match['filename']}:{position}: {match['tag'] or match['rule']}: "
+            f"{match['message']}"
+        )
+    return int(response["rc"])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -67,6 +67,8 @@ class MatchError(ValueError):
             else:
                 self.filename = normpath(filename)
         self.rule = rule
+        # rules reporting problems of various severities can change it
+        self.severity: str = rule.severity
         self.ignored = False  # If set it will be displayed but not counted as failure
         # This can be used by rules that can report multiple errors type, so
         # we can still filter by them.
@@ -1,19 +1,36 @@
 """Utility functions related to file operations."""
 import copy
+import fnmatch
 import logging
 import os
 import pathlib
+import re
 import subprocess
 import sys
 from argparse import Namespace
 from collections import OrderedDict
 from contextlib import contextmanager
-from pathlib import Path
+from functools import lru_cache
+from pathlib import Path, PurePath
 from tempfile import NamedTemporaryFile
-from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Union, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 # import wcmatch
-import wcmatch.pathlib
+import wcmatch.glob
 from wcmatch.wcmatch import RECURSIVE, WcMatch
 
 from ansiblelint.config import BASE_KINDS, options
@@ -89,6 +106,224 @@ def expand_paths_vars(paths: List[str]) -> List[str]:
     return paths
 
 
+def _fnmatch_regex(pattern: str) -> str:
+    """Return the regex made by fnmatch for a pattern, without anchors."""
+    match = re.fullmatch(r"\(\?s:(.*)\)\\[Zz]", fnmatch.translate(pattern), re.S)
+    assert match, pattern
+    return match.group(1)
+
+
+def _path_part_regex(part: str) -> str:
+    """Translate a glob matching a single path component, like Path.match does.
+
+    Unlike with fnmatch, wildcards never match a path separator.
+    """
+    result = []
+    i = 0
+    while i < len(part):
+        char = part[i]
+        i += 1
+        if char == "*":
+            result.append("[^/]*")
+        elif char == "?":
+            result.append("[^/]")
+        elif char == "[":
+            end = i
+            if part[end : end + 1] == "!":
+                end += 1
+            if part[end : end + 1] == "]":
+                end += 1
+            end = part.find("]", end)
+            if end < 0:
+                result.append(re.escape(char))
+            else:
+                result.append("(?!/)" + _fnmatch_regex(part[i - 1 : end + 1]))
+                i = end + 1
+        else:
+            result.append(re.escape(char))
+    return "".join(result)
+
+
+class ExcludeMatcher:
+    """Tell if paths are excluded, compiled from the exclude_paths option.
+
+    A path is excluded when, for any of the exclude paths or their absolute
+    version, its absolute path starts with it, it matches it the way
+    ``Path.match`` does or it matches it with ``fnmatch``, using either the
+    path or its absolute version. All entries are checked at once: prefixes
+    with a single ``str.startswith`` call and globs with combined regexes.
+    """
+
+    def __init__(self, exclude_paths: List[str]) -> None:
+        """Compile the exclude paths, which can contain environment variables."""
+        paths = expand_paths_vars(exclude_paths)
+        # find_children returns absolute paths while lintables can be
+        # relative, so both forms are used
+        self.exclude_paths = paths + [os.path.abspath(p) for p in paths]
+        self._prefixes = tuple(self.exclude_paths)
+        self._fnmatch = self._compile(
+            _fnmatch_regex(path) for path in self.exclude_paths
+        )
+        path_match = []
+        for path in self.exclude_paths:
+            pure = PurePath(path)
+            if not pure.parts:
+                continue
+            if pure.root:
+                parts = "/".join(_path_part_regex(p) for p in pure.parts[1:])
+                path_match.append(f"\\A/{parts}")
+            else:
+                parts = "/".join(_path_part_regex(p) for p in pure.parts)
+                path_match.append(f"(?:\\A|(?<=/)){parts}")
+        self._path_match = self._compile(path_match)
+        self._results: Dict[str, bool] = {}
+
+    @staticmethod
+    def _compile(regexes: Iterable[str]) -> Optional[Pattern[str]]:
+        combined = "|".join(f"(?:{regex})" for regex in regexes)
+        return re.compile(f"(?s:{combined})\\Z") if combined else None
+
+    def __bool__(self) -> bool:
+        """Tell if any path can be excluded."""
+        return bool(self.exclude_paths)
+
+    def is_excluded(self, file_path: str) -> bool:
+        """Tell if a path is excluded, remembering the answer."""
+        if not file_path or not self.exclude_paths:
+            return False
+        result = self._results.get(file_path)
+        if result is None:
+            result = self._results[file_path] = self._match(file_path)
+        return result
+
+    def _match(self, file_path: str) -> bool:
+        abs_path = os.path.abspath(file_path)
+        if abs_path.startswith(self._prefixes):
+            return True
+        if self._path_match and self._path_match.search(str(PurePath(file_path))):
+            return True
+        return bool(
+            self._fnmatch
+            and (self._fnmatch.match(abs_path) or self._fnmatch.match(file_path))
+        )
+
+
+@lru_cache(maxsize=8)
+def _exclude_matcher(exclude_paths: Tuple[str, ...], directory: str) -> ExcludeMatcher:
+    # pylint: disable=unused-argument
+    return ExcludeMatcher(list(exclude_paths))
+
+
+def get_exclude_matcher(exclude_paths: List[str]) -> ExcludeMatcher:
+    """Return the matcher of exclude paths, shared by all users of the same ones.
+
+    Relative exclude paths are resolved from the current directory, so each
+    directory gets its own matcher.
+    """
+    return _exclude_matcher(tuple(exclude_paths), os.getcwd())
+
+
+# Flags used to match kinds patterns, like pathlib paths of this platform do.
+_KIND_FLAGS = (
+    wcmatch.glob.GLOBSTAR
+    | wcmatch.glob.BRACE
+    | wcmatch.glob.DOTGLOB
+    | (wcmatch.glob.FORCEWIN if os.name == "nt" else wcmatch.glob.FORCEUNIX)
+)
+
+
+def _kind_regexes(pattern: str) -> List[str]:
+    """Translate a kinds pattern, which can expand to multiple regexes."""
+    if not pattern.startswith("**/"):
+        return list(wcmatch.glob.translate(pattern, flags=_KIND_FLAGS)[0])
+    # Paths are matched once resolved, so they do not contain "." or ".."
+    # parts nor repeated separators that wcmatch has to check for at every
+    # character matched by a leading globstar. Any directories can match it.
+    regexes = []
+    for regex in wcmatch.glob.translate(pattern[3:], flags=_KIND_FLAGS)[0]:
+        if not regex.startswith("^(?s"):
+            return list(wcmatch.glob.translate(pattern, flags=_KIND_FLAGS)[0])
+        start = regex.index(":") + 1
+        regexes.append(f"{regex[:start]}(?:.*/)?{regex[start:]}")
+    return regexes
+
+
+class KindMatcher:  # pylint: disable=too-few-public-methods
+    """Classify paths using ordered kinds patterns, the first matching wins.
+
+    Patterns of all kinds are compiled into a single regex, whose
+    alternatives are tried in order, and results are remembered per path.
+    """
+
+    def __init__(self, kinds: Tuple[Tuple[str, str], ...]) -> None:
+        """Compile kinds given as (kind, pattern) pairs."""
+        self._kinds: Dict[str, str] = {}
+        alternatives = []
+        for index, (kind, pattern) in enumerate(kinds):
+            group = f"kind{index}"
+            self._kinds[group] = kind
+            alternatives.append(f"(?P<{group}>{'|'.join(_kind_regexes(pattern))})")
+        self._regex = re.compile("|".join(alternatives)) if alternatives else None
+        self._results: Dict[str, str] = {}
+
+    def kind(self, path: Path) -> str:
+        """Return the kind of a path, empty if no pattern matches."""
+        key = os.path.join(os.getcwd(), path)
+        kind = self._results.get(key)
+        if kind is None:
+            match = self._regex.match(resolve_path(key)) if self._regex else None
+            kind = self._kinds[match.lastgroup] if match and match.lastgroup else ""
+            self._results[key] = kind
+        return kind
+
+
+@lru_cache(maxsize=65536)
+def resolve_path(path: str) -> str:
+    """Return an absolute path with symlinks resolved, remembering answers.
+
+    Files are resolved multiple times while being discovered, classified and
+    when their directory is recorded by lintables.
+    """
+    return os.path.realpath(path)
+
+
+def clear_path_caches() -> None:
+    """Forget resolved paths and the kinds found for them.
+
+    Long running processes, like the lint daemon and the language server, call
+    it before each request, as symlinks can change between them.
+    """
+    resolve_path.cache_clear()
+    _kind_matcher.cache_clear()
+    _kind_matchers.clear()
+
+
+@lru_cache(maxsize=8)
+def _kind_matcher(kinds: Tuple[Tuple[str, str], ...]) -> KindMatcher:
+    return KindMatcher(kinds)
+
+
+# kinds configurations used, by identity, with a copy of them and their matcher
+_kind_matchers: Dict[int, Tuple[List[Dict[str, str]], KindMatcher]] = {}
+
+
+def get_kind_matcher(kinds: List[Dict[str, str]]) -> KindMatcher:
+    """Return the matcher of a kinds configuration, shared by its users."""
+    # comparing with a copy is cheaper than making a key for every lookup
+    known = _kind_matchers.get(id(kinds))
+    if known is not None and known[0] == kinds:
+        return known[1]
+    matcher = _kind_matcher(
+        tuple(
+            (str(kind), pattern) for entry in kinds for kind, pattern in entry.items()
+        )
+    )
+    if len(_kind_matchers) > 8:
+        _kind_matchers.clear()
+    _kind_matchers[id(kinds)] = (copy.deepcopy(kinds), matcher)
+    return matcher
+
+
 def kind_from_path(path: Path, base: bool = False) -> FileType:
     """Determine the file kind based on its name.
 
@@ -97,19 +332,9 @@ def kind_from_path(path: Path, base: bool = False) -> FileType:
     """
     # pathlib.Path.match patterns are very limited, they do not support *a*.yml
     # glob.glob supports **/foo.yml but not multiple extensions
-    pathex = wcmatch.pathlib.PurePath(str(path.absolute().resolve()))
-    kinds = options.kinds if not base else BASE_KINDS
-    for entry in kinds:
-        for k, v in entry.items():
-            if pathex.globmatch(
-                v,
-                flags=(
-                    wcmatch.pathlib.GLOBSTAR
-                    | wcmatch.pathlib.BRACE
-                    | wcmatch.pathlib.DOTGLOB
-                ),
-            ):
-                return str(k)  # type: ignore
+    kind = get_kind_matcher(options.kinds if not base else BASE_KINDS).kind(path)
+    if kind:
+        return kind  # type: ignore
 
     if base:
         # Unknown base file type is default
@@ -153,6 +378,8 @@ class Lintable:
             self.path = name
         self._content = self._original_content = content
         self.updated = False
+        # parsed forms of the content shared by all rules, see get_artifact()
+        self._artifacts: Dict[str, Any] = {}
 
         # if the lintable is part of a role, we save role folder name
         self.role = ""
@@ -180,9 +407,9 @@ class Lintable:
         # We store absolute directory in dir
         if not self.dir:
             if self.kind == "role":
-                self.dir = str(self.path.resolve())
+                self.dir = resolve_path(os.path.join(os.getcwd(), self.path))
             else:
-                self.dir = str(self.path.parent.resolve())
+                self.dir = resolve_path(os.path.join(os.getcwd(), self.path.parent))
 
         # determine base file kind (yaml, xml, ini, ...)
         self.base_kind = kind_from_path(self.path, base=True)
@@ -235,11 +462,36 @@ class Lintable:
                 self._original_content = ""
         self.updated = self._original_content != value
         self._content = value
+        self.release_artifacts()
 
     @content.deleter
     def content(self) -> None:
         """Reset the internal content cache."""
         self._content = None
+        self.release_artifacts()
+
+    @property
+    def lines(self) -> List[str]:
+        """Return the lines of the content, split only once."""
+        return cast(
+            List[str],
+            self.get_artifact("lines", lambda lintable: lintable.content.splitlines()),
+        )
+
+    def get_artifact(self, name: str, factory: Callable[["Lintable"], Any]) -> Any:
+        """Return an artifact derived from the content, like a parsed tree.
+
+        The artifact is built by calling ``factory`` with the lintable the first
+        time it is requested and reused afterwards, until the content changes or
+        ``release_artifacts`` is called, so it is shared by all callers.
+        """
+        if name not in self._artifacts:
+            self._artifacts[name] = factory(self)
+        return self._artifacts[name]
+
+    def release_artifacts(self) -> None:
+        """Release the memory used by artifacts derived from the content."""
+        self._artifacts.clear()
 
     def write(self, force: bool = False) -> None:
         """Write the value of ``Lintable.content`` to disk.
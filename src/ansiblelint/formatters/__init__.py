@@ -1,9 +1,10 @@
 """Output formatters."""
 import hashlib
+import io
 import json
 import os
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, Generic, List, Tuple, TypeVar, Union
+from typing import IO, TYPE_CHECKING, Any, Dict, Generic, Iterable, List, TypeVar, Union
 
 import rich
 
@@ -113,11 +114,11 @@ class AnnotationsFormatter(BaseFormatter):  # type: ignore
 
     def format(self, match: "MatchError") -> str:
         """Prepare a match instance for reporting as a GitHub Actions annotation."""
-        level = self._severity_to_level(match.rule.severity)
+        level = self._severity_to_level(match.severity)
         file_path = self._format_path(match.filename or "")
         line_num = match.linenumber
         rule_id = match.rule.id
-        severity = match.rule.severity
+        severity = match.severity
         violation_details = self.escape(match.message)
         if match.column:
             col = f",col={match.column}"
@@ -142,6 +143,7 @@ class CodeclimateJSONFormatter(BaseFormatter[Any]):
     """Formatter for emitting violations in Codeclimate JSON report format.
 
     The formatter expects a list of MatchError objects and returns a JSON formatted string.
+    ``write_result`` writes the same report to a stream, issue by issue.
     The spec for the codeclimate report can be found here:
     https://github.com/codeclimate/platform/blob/master/spec/analyzers/SPEC.md#user-content-data-types
     """
@@ -152,34 +154,40 @@ class CodeclimateJSONFormatter(BaseFormatter[Any]):
             raise RuntimeError(
                 f"The {self.__class__} was expecting a list of MatchError."
             )
-
-        result = []
+        output = io.StringIO()
+        self.write_result(matches, output)
+        return output.getvalue()
+
+    def write_result(self, matches: Iterable["MatchError"], stream: IO[str]) -> None:
+        """Write match errors to a stream as a JSON list, as they are iterated."""
+        stream.write("[")
+        separator = ""
         for match in matches:
-            issue: Dict[str, Any] = {}
-            issue["type"] = "issue"
-            issue["check_name"] = match.tag or match.rule.id  # rule-id[subrule-id]
-            issue["categories"] = match.rule.tags
-            issue["severity"] = self._severity_to_level(match.rule.severity)
-            issue["description"] = self.escape(str(match.message))
-            issue["fingerprint"] = hashlib.sha256(
-                repr(match).encode("utf-8")
-            ).hexdigest()
-            issue["location"] = {}
-            issue["location"]["path"] = self._format_path(match.filename or "")
-            issue["location"]["lines"] = {}
-            if match.column:
-                issue["location"]["lines"]["begin"] = {}
-                issue["location"]["lines"]["begin"]["line"] = match.linenumber
-                issue["location"]["lines"]["begin"]["column"] = match.column
-            else:
-                issue["location"]["lines"]["begin"] = match.linenumber
-            if match.details:
-                issue["content"] = {}
-                issue["content"]["body"] = match.details
-            # Append issue to result list
-            result.append(issue)
-
-        return json.dumps(result)
+            stream.write(separator + json.dumps(self._to_issue(match)))
+            separator = ", "
+        stream.write("]")
+
+    def _to_issue(self, match: "MatchError") -> Dict[str, Any]:
+        issue: Dict[str, Any] = {}
+        issue["type"] = "issue"
+        issue["check_name"] = match.tag or match.rule.id  # rule-id[subrule-id]
+        issue["categories"] = match.rule.tags
+        issue["severity"] = self._severity_to_level(match.severity)
+        issue["description"] = self.escape(str(match.message))
+        issue["fingerprint"] = hashlib.sha256(repr(match).encode("utf-8")).hexdigest()
+        issue["location"] = {}
+        issue["location"]["path"] = self._format_path(match.filename or "")
+        issue["location"]["lines"] = {}
+        if match.column:
+            issue["location"]["lines"]["begin"] = {}
+            issue["location"]["lines"]["begin"]["line"] = match.linenumber
+            issue["location"]["lines"]["begin"]["column"] = match.column
+        else:
+            issue["location"]["lines"]["begin"] = match.linenumber
+        if match.details:
+            issue["content"] = {}
+            issue["content"]["body"] = match.details
+        return issue
 
     @staticmethod
     def _severity_to_level(severity: str) -> str:
@@ -217,51 +225,47 @@ class SarifFormatter(BaseFormatter[Any]):
             raise RuntimeError(
                 f"The {self.__class__} was expecting a list of MatchError."
             )
+        output = io.StringIO()
+        self.write_result(matches, output)
+        return output.getvalue()
+
+    def write_result(self, matches: Iterable["MatchError"], stream: IO[str]) -> None:
+        """Write match errors to a stream as a SARIF report, as they are iterated.
 
+        Results are written before the tool, whose rules are only known once
+        all matches were seen.
+        """
         root_path = Path(str(self._base_dir)).as_uri()
         root_path = root_path + "/" if not root_path.endswith("/") else root_path
-        rules, results = self._extract_results(matches)
 
+        stream.write("{\n")
+        stream.write(f'  "$schema": {_dumps(self.SARIF_SCHEMA)},\n')
+        stream.write(f'  "version": {_dumps(self.SARIF_SCHEMA_VERSION)},\n')
+        stream.write('  "runs": [\n    {\n')
+        stream.write('      "columnKind": "utf16CodeUnits",\n')
+        base_ids = {self.BASE_URI_ID: {"uri": root_path}}
+        stream.write(f'      "originalUriBaseIds": {_dumps(base_ids, 3)},\n')
+        stream.write('      "results": [')
+        rules: Dict[str, Dict[str, Any]] = {}
+        separator = "\n"
+        for match in matches:
+            if match.rule.id not in rules:
+                rules[match.rule.id] = self._to_sarif_rule(match)
+            stream.write(
+                separator + "        " + _dumps(self._to_sarif_result(match), 4)
+            )
+            separator = ",\n"
+        stream.write("\n      ],\n" if rules else "],\n")
         tool = {
             "driver": {
                 "name": self.TOOL_NAME,
                 "version": __version__,
                 "informationUri": self.TOOL_URL,
-                "rules": rules,
-            }
-        }
-
-        runs = [
-            {
-                "tool": tool,
-                "columnKind": "utf16CodeUnits",
-                "results": results,
-                "originalUriBaseIds": {
-                    self.BASE_URI_ID: {"uri": root_path},
-                },
+                "rules": list(rules.values()),
             }
-        ]
-
-        report = {
-            "$schema": self.SARIF_SCHEMA,
-            "version": self.SARIF_SCHEMA_VERSION,
-            "runs": runs,
         }
-
-        return json.dumps(
-            report, default=lambda o: o.__dict__, sort_keys=False, indent=2
-        )
-
-    def _extract_results(
-        self, matches: List["MatchError"]
-    ) -> Tuple[List[Any], List[Any]]:
-        rules = {}
-        results = []
-        for match in matches:
-            if match.rule.id not in rules:
-                rules[match.rule.id] = self._to_sarif_rule(match)
-            results.append(self._to_sarif_result(match))
-        return list(rules.values()), results
+        stream.write(f'      "tool": {_dumps(tool, 3)}\n')
+        stream.write("    }\n  ]\n}")
 
     def _to_sarif_rule(self, match: "MatchError") -> Dict[str, Any]:
         rule: Dict[str, Any] = {
@@ -271,7 +275,7 @@ class SarifFormatter(BaseFormatter[Any]):
                 "text": self.escape(str(match.message)),
             },
             "defaultConfiguration": {
-                "level": self._to_sarif_level(match.rule.severity),
+                "level": self._to_sarif_level(match.severity),
             },
             "help": {
                 "text": str(match.rule.description),
@@ -317,3 +321,10 @@ class SarifFormatter(BaseFormatter[Any]):
             return "warning"
         # VERY_LOW, INFO or anything else
         return "note"
+
+
+def _dumps(value: Any, level: int = 0) -> str:
+    """Return value as JSON indented by 2 spaces, nested at the given level."""
+    text = json.dumps(value, default=lambda o: o.__dict__, indent=2)
+    # JSON strings cannot contain line breaks, only the indentation does
+    return text.replace("\n", "\n" + "  " * level)
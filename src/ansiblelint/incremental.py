@@ -0,0 +1,145 @@
+"""Helpers finding what changed between git revisions and what it affects."""
+import logging
+import os
+import subprocess
+import sys
+from typing import Dict, List, Set, Tuple
+
+import ansiblelint.utils
+from ansiblelint.constants import INVALID_CONFIG_RC
+from ansiblelint.file_utils import Lintable
+
+_logger = logging.getLogger(__name__)
+
+
+def _path_key(lintable: Lintable) -> str:
+    return os.path.abspath(str(lintable.path))
+
+
+def changed_paths(revision: str) -> Set[str]:
+    """Return the absolute paths of files changed since a git revision.
+
+    Files not tracked by git, but not ignored either, are considered changed.
+    """
+    commands = [
+        ["git", "diff", "--name-only", "--relative", "-z", revision, "--"],
+        ["git", "ls-files", "--others", "--exclude-standard", "-z"],
+    ]
+    paths: Set[str] = set()
+    for command in commands:
+        try:
+            out = subprocess.check_output(
+                command, stderr=subprocess.STDOUT, universal_newlines=True
+            )
+        except (subprocess.CalledProcessError, FileNotFoundError) as exc:
+            _logger.error(
+                "Failed to find files changed since %s: %s",
+                revision,
+                getattr(exc, "output", None) or exc,
+            )
+            sys.exit(INVALID_CONFIG_RC)
+        paths.update(os.path.abspath(name) for name in out.split("\x00") if name)
+    return paths
+
+
+def git_objects(revision: str) -> Dict[str, str]:
+    """Return the git object ids of the files and directories of a revision.
+
+    Paths are relative to the current directory, like the ones of matches.
+    """
+    try:
+        out = subprocess.check_output(
+            ["git", "ls-tree", "-r", "-t", "-z", revision],
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError) as exc:
+        _logger.error(
+            "Failed to list files of revision %s: %s",
+            revision,
+            getattr(exc, "output", None) or exc,
+        )
+        sys.exit(INVALID_CONFIG_RC)
+    objects: Dict[str, str] = {}
+    for entry in out.split("\x00"):
+        if entry:
+            info, path = entry.split("\t", 1)
+            objects[path] = info.split()[2]
+    return objects
+
+
+def worktree_objects(paths: List[str]) -> Dict[str, str]:
+    """Return the git object ids that files of the working tree would have."""
+    files = [path for path in paths if os.path.isfile(path)]
+    if not files:
+        return {}
+    out = subprocess.check_output(
+        ["git", "hash-object", "--stdin-paths"],
+        input="\n".join(files),
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+    )
+    return dict(zip(files, out.split()))
+
+
+def dependency_graph(
+    lintables: List[Lintable],
+) -> Tuple[Dict[str, Lintable], Dict[str, Set[str]]]:
+    """Return every file reachable from lintables and the files including each.
+
+    Both mappings are keyed by absolute paths. Files that cannot be loaded are
+    kept as nodes but their children are unknown.
+    """
+    nodes: Dict[str, Lintable] = {}
+    parents: Dict[str, Set[str]] = {}
+    queue = list(lintables)
+    while queue:
+        lintable = queue.pop()
+        key = _path_key(lintable)
+        if key in nodes:
+            continue
+        nodes[key] = lintable
+        try:
+            children = ansiblelint.utils.find_children(lintable)
+        except (Exception, SystemExit) as exc:  # pylint: disable=broad-except
+            _logger.debug("Unable to find children of %s: %s", lintable, exc)
+            continue
+        finally:
+            lintable.release_artifacts()
+        for child in children:
+            parents.setdefault(_path_key(child), set()).add(key)
+            queue.append(child)
+    return nodes, parents
+
+
+def get_changed_lintables(lintables: List[Lintable], revision: str) -> List[Lintable]:
+    """Return lintables changed since a revision and the files including them.
+
+    Dependents are found by walking the files imported or included by the
+    lintables, as reported by ``find_children``, in reverse. Directories, like
+    roles, are traversed but not returned, so that only their changed files
+    and the playbooks using them are linted.
+    """
+    changed = changed_paths(revision)
+    nodes, parents = dependency_graph(lintables)
+
+    selected: Dict[str, Lintable] = {}
+    visited: Set[str] = set()
+    queue = list(changed)
+    while queue:
+        key = queue.pop()
+        if key in visited:
+            continue
+        visited.add(key)
+        lintable = nodes.get(key)
+        if lintable is not None and not lintable.path.is_dir():
+            selected[key] = lintable
+        queue.extend(parents.get(key, ()))
+
+    _logger.info(
+        "Linting %s file(s) changed since %s or depending on them, out of %s",
+        len(selected),
+        revision,
+        len(nodes),
+    )
+    return [selected[key] for key in sorted(selected)]
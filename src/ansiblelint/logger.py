@@ -16,3 +16,27 @@ def timed_info(msg: Any, *args: Any) -> Iterator[None]:
     finally:
         elapsed = time.time() - start
         _logger.info(msg + " (%.2fs)", *(*args, elapsed))
+
+
+def configure_logging(level: int = 0) -> int:
+    """Set up the root logger for a verbosity number, returning the level used."""
+    # We are about to act on the root logger, which defaults to logging.WARNING.
+    # That is where our 0 (default) value comes from.
+    verbosity_map = {
+        -2: logging.CRITICAL,
+        -1: logging.ERROR,
+        0: logging.WARNING,
+        1: logging.INFO,
+        2: logging.DEBUG,
+    }
+
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter("%(levelname)-8s %(message)s")
+    handler.setFormatter(formatter)
+    logger = logging.getLogger()
+    logger.addHandler(handler)
+    # Unknown logging level is treated as DEBUG
+    logging_level = verbosity_map.get(level, logging.DEBUG)
+    logger.setLevel(logging_level)
+    logging.captureWarnings(True)  # pass all warnings.warn() messages through logging
+    return logging_level
@@ -0,0 +1,330 @@
+"""Language server publishing violations of the documents opened in editors.
+
+The server is started with ``ansible-lint --lsp`` and speaks the language
+server protocol over stdin and stdout. Opened and saved documents are fully
+linted, including the syntax check. Unsaved changes are linted from memory by
+the rules alone, once the user stopped typing for ``DEBOUNCE_DELAY`` seconds,
+and results of outdated contents are never published.
+"""
+import hashlib
+import json
+import logging
+import queue
+import sys
+import threading
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from ansiblelint.file_utils import Lintable, clear_path_caches, normpath
+from ansiblelint.version import __version__
+
+if TYPE_CHECKING:
+    from argparse import Namespace
+
+    from ansiblelint.errors import MatchError
+    from ansiblelint.rules import RulesCollection
+
+_logger = logging.getLogger(__name__)
+
+# Seconds without changes to wait before linting a modified document.
+DEBOUNCE_DELAY = 0.3
+
+# https://microsoft.github.io/language-server-protocol/specifications/specification-current/
+METHOD_NOT_FOUND = -32601
+SEVERITY_ERROR = 1
+SEVERITY_WARNING = 2
+TEXT_DOCUMENT_SYNC_FULL = 1
+
+
+@dataclass
+class _Document:
+    """Text of an opened document, as last received from the client."""
+
+    path: str
+    version: int
+    text: str
+
+
+def read_message(stream: IO[bytes]) -> Optional[Dict[str, Any]]:
+    """Read a message from a stream, None once it is closed."""
+    length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode("ascii").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    if length is None:
+        return None
+    return json.loads(stream.read(length))  # type: ignore[no-any-return]
+
+
+def write_message(stream: IO[bytes], message: Dict[str, Any]) -> None:
+    """Write a message to a stream."""
+    body = json.dumps(message).encode("utf-8")
+    stream.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    stream.flush()
+
+
+def _uri_to_path(uri: str) -> Optional[str]:
+    parsed = urlparse(uri)
+    if parsed.scheme != "file":
+        return None
+    return unquote(parsed.path)
+
+
+class LanguageServer:  # pylint: disable=too-many-instance-attributes
+    """Handle language server messages, linting documents in the background.
+
+    Documents are linted by a single worker thread, as linting relies on
+    global state. Messages are sent with ``send``, which must be thread safe.
+    """
+
+    def __init__(
+        self,
+        rules: "RulesCollection",
+        options: "Namespace",
+        send: Callable[[Dict[str, Any]], None],
+        debounce: float = DEBOUNCE_DELAY,
+    ) -> None:
+        """Create a server for already loaded rules and options."""
+        self.rules = rules
+        self.options = options
+        self.send = send
+        self.debounce = debounce
+        self.shutdown_requested = False
+        self.runs = 0
+        self._documents: Dict[str, _Document] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+        # last linted content of documents, as hash, and its diagnostics
+        self._results: Dict[Tuple[str, bool], Tuple[str, List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Tuple[str, int, bool]]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._work, daemon=True)
+        self._worker.start()
+
+    def handle(self, message: Dict[str, Any]) -> bool:
+        """Process a message, returning False once the server must exit."""
+        method = message.get("method", "")
+        params = message.get("params") or {}
+        if method == "exit":
+            self.stop()
+            return False
+        if "id" in message:
+            self._handle_request(message["id"], method)
+        elif method.startswith("textDocument/"):
+            self._handle_document(method, params)
+        return True
+
+    def _handle_request(self, request_id: Any, method: str) -> None:
+        result: Any = None
+        if method == "initialize":
+            result = {
+                "capabilities": {
+                    "textDocumentSync": {
+                        "openClose": True,
+                        "change": TEXT_DOCUMENT_SYNC_FULL,
+                        "save": {"includeText": False},
+                    }
+                },
+                "serverInfo": {"name": "ansible-lint", "version": __version__},
+            }
+        elif method == "shutdown":
+            self.shutdown_requested = True
+        else:
+            self.send(
+                {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "error": {
+                        "code": METHOD_NOT_FOUND,
+                        "message": f"Unsupported method: {method}",
+                    },
+                }
+            )
+            return
+        self.send({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+    def _handle_document(self, method: str, params: Dict[str, Any]) -> None:
+        text_document = params["textDocument"]
+        uri = text_document["uri"]
+        with self._lock:
+            document = self._documents.get(uri)
+            if method == "textDocument/didOpen":
+                path = _uri_to_path(uri)
+                if path is None:
+                    return
+                document = _Document(
+                    path, text_document.get("version", 0), text_document["text"]
+                )
+                self._documents[uri] = document
+                self._schedule(uri, document, full=True)
+            elif method == "textDocument/didChange" and document:
+                # with full synchronization the last change holds the whole text
+                document.text = params["contentChanges"][-1]["text"]
+                document.version = text_document.get("version", document.version + 1)
+                self._schedule(uri, document, full=False)
+            elif method == "textDocument/didSave" and document:
+                self._schedule(uri, document, full=True)
+            elif method == "textDocument/didClose" and document:
+                del self._documents[uri]
+                self._cancel(uri)
+                self._results.pop((uri, True), None)
+                self._results.pop((uri, False), None)
+                self._publish(uri, None, [])
+
+    def _schedule(self, uri: str, document: _Document, full: bool) -> None:
+        """Lint a document later, replacing any pending run."""
+        self._cancel(uri)
+        job = (uri, document.version, full)
+        if full:
+            self._queue.put(job)
+            return
+        timer = threading.Timer(self.debounce, self._queue.put, (job,))
+        timer.daemon = True
+        self._timers[uri] = timer
+        timer.start()
+
+    def _cancel(self, uri: str) -> None:
+        timer = self._timers.pop(uri, None)
+        if timer:
+            timer.cancel()
+
+    def _current(self, uri: str, version: int) -> Optional[_Document]:
+        """Return the document unless it changed since the given version."""
+        with self._lock:
+            document = self._documents.get(uri)
+            if document is None or document.version != version:
+                return None
+            return _Document(document.path, document.version, document.text)
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            uri, version, full = job
+            document = self._current(uri, version)
+            if document is None:
+                # a newer version is already scheduled
+                continue
+            try:
+                diagnostics = self._diagnostics(uri, document, full)
+            except (Exception, SystemExit):  # pylint: disable=broad-except
+                _logger.exception("Failed to lint %s", document.path)
+                continue
+            # results are only published for the content they were made for
+            if self._current(uri, version) is not None:
+                self._publish(uri, version, diagnostics)
+
+    def _diagnostics(
+        self, uri: str, document: _Document, full: bool
+    ) -> List[Dict[str, Any]]:
+        digest = hashlib.sha256(document.text.encode("utf-8")).hexdigest()
+        cached = self._results.get((uri, full))
+        if cached and cached[0] == digest:
+            return cached[1]
+        self.runs += 1
+        diagnostics = [
+            self._to_diagnostic(match, document.text)
+            for match in self._lint(document, full)
+            if normpath(match.filename) == normpath(document.path)
+        ]
+        self._results[(uri, full)] = (digest, diagnostics)
+        return diagnostics
+
+    def _lint(self, document: _Document, full: bool) -> List["MatchError"]:
+        """Lint a document, from disk when full and unchanged, else from memory."""
+        # pylint: disable=import-outside-toplevel
+        from ansiblelint.parse_cache import parse_cache_scope
+        from ansiblelint.runner import _get_matches
+
+        clear_path_caches()
+        name = normpath(document.path)
+        with self.options.cache_dir_lock:
+            lintable = Lintable(name)
+            if full and lintable.content == document.text:
+                return _get_matches(
+                    self.rules, self.options, lintables=[lintable]
+                ).matches
+            lintable = Lintable(name, content=document.text)
+            with parse_cache_scope(self.options.parse_cache_size):
+                return self.rules.run(
+                    lintable,
+                    tags=set(self.options.tags),
+                    skip_list=self.options.skip_list,
+                )
+
+    def _to_diagnostic(self, match: "MatchError", text: str) -> Dict[str, Any]:
+        lines = text.splitlines()
+        line = max(match.linenumber - 1, 0)
+        start = max(match.column - 1, 0) if match.column else 0
+        end = len(lines[line]) if line < len(lines) else start
+        warning = not {match.tag, match.rule.id, *match.rule.tags}.isdisjoint(
+            self.options.warn_list
+        )
+        diagnostic = {
+            "range": {
+                "start": {"line": line, "character": start},
+                "end": {"line": line, "character": max(end, start)},
+            },
+            "severity": SEVERITY_WARNING if warning else SEVERITY_ERROR,
+            "code": match.tag or match.rule.id,
+            "source": "ansible-lint",
+            "message": match.message + (f"\n{match.details}" if match.details else ""),
+        }
+        if match.rule.link:
+            diagnostic["codeDescription"] = {"href": match.rule.link}
+        return diagnostic
+
+    def _publish(
+        self, uri: str, version: Optional[int], diagnostics: List[Dict[str, Any]]
+    ) -> None:
+        params: Dict[str, Any] = {"uri": uri, "diagnostics": diagnostics}
+        if version is not None:
+            params["version"] = version
+        self.send(
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/publishDiagnostics",
+                "params": params,
+            }
+        )
+
+    def stop(self) -> None:
+        """Cancel pending runs and wait for the current one to finish."""
+        with self._lock:
+            for uri in list(self._timers):
+                self._cancel(uri)
+            self._documents.clear()
+        self._queue.put(None)
+        self._worker.join()
+
+
+def serve(rules: "RulesCollection", options: "Namespace") -> int:
+    """Run the language server on stdin and stdout until the client exits."""
+    output = sys.stdout.buffer
+    # anything printed by linting code must not corrupt the protocol stream
+    sys.stdout = sys.stderr
+    lock = threading.Lock()
+
+    def send(message: Dict[str, Any]) -> None:
+        with lock:
+            write_message(output, message)
+
+    # other linter instances should only wait for the cache while linting
+    options.cache_dir_lock.release()
+    server = LanguageServer(rules, options, send)
+    while True:
+        message = read_message(sys.stdin.buffer)
+        if message is None:
+            server.stop()
+            break
+        if not server.handle(message):
+            break
+    return 0 if server.shutdown_requested else 1
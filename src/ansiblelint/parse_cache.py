@@ -0,0 +1,108 @@
+"""Size-aware cache of parsed file contents used during a linting run."""
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Set, Tuple
+
+from ansiblelint.config import DEFAULT_PARSE_CACHE_SIZE
+from ansiblelint.file_utils import Lintable
+from ansiblelint.profiling import PARSE, get_profiler
+
+_Key = Tuple[str, str, str]
+
+
+class ParseCache:
+    """Least recently used cache of parse results, bounded by a byte budget.
+
+    Entries are keyed by the parser name, the path and the content of the
+    lintable, so a changed content is never served from the cache. The size
+    of an entry is the size of the text that was parsed. A cache without a
+    byte budget keeps nothing.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_PARSE_CACHE_SIZE) -> None:
+        """Create an empty cache."""
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[_Key, Tuple[Any, int]]" = OrderedDict()
+        self._keys_by_path: Dict[str, Set[_Key]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def get(
+        self, parser: str, lintable: Lintable, factory: Callable[[Lintable], Any]
+    ) -> Any:
+        """Return the result of ``factory(lintable)``, parsing only on a miss."""
+        content = lintable.content
+        key = (parser, str(lintable.path), content)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        profiler = get_profiler()
+        if profiler is None:
+            value = factory(lintable)
+        else:
+            with profiler.measure(PARSE, parser):
+                value = factory(lintable)
+        size = len(content)
+        if self.max_bytes and size <= self.max_bytes:
+            self._entries[key] = (value, size)
+            self._keys_by_path.setdefault(key[1], set()).add(key)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def release(self, lintable: Lintable) -> None:
+        """Drop all entries of a lintable, once the linter is done with it."""
+        for key in list(self._keys_by_path.get(str(lintable.path), ())):
+            self._discard(key)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._keys_by_path.clear()
+        self.size = 0
+
+    def _discard(self, key: _Key) -> None:
+        _, size = self._entries.pop(key)
+        self.size -= size
+        keys = self._keys_by_path[key[1]]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_path[key[1]]
+
+
+# Outside of a linting run nothing is cached, so parsed content does not stay
+# in memory for the lifetime of the process.
+_parse_cache = ParseCache(max_bytes=0)
+
+
+def get_parse_cache() -> ParseCache:
+    """Return the parse cache currently in use.
+
+    Outside of ``parse_cache_scope``, this is a cache that keeps nothing.
+    """
+    return _parse_cache
+
+
+@contextmanager
+def parse_cache_scope(max_bytes: int) -> Iterator[ParseCache]:
+    """Use a new parse cache until the context exits, releasing its entries."""
+    global _parse_cache  # pylint: disable=global-statement,invalid-name
+    previous = _parse_cache
+    _parse_cache = ParseCache(max_bytes)
+    try:
+        yield _parse_cache
+    finally:
+        _parse_cache.clear()
+        _parse_cache = previous
@@ -0,0 +1,145 @@
+"""Collection of the time spent by rules and by the phases of linting."""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from rich.table import Table
+
+# Names used for the phases of linting, which are reported along rules.
+PARSE = "(parse)"
+NORMALIZE = "(normalize)"
+SYNTAX_CHECK = "(syntax-check)"
+PHASES = (PARSE, NORMALIZE, SYNTAX_CHECK)
+
+
+@dataclass
+class Timing:
+    """Wall time, number of calls and matches of a rule method or phase."""
+
+    seconds: float = 0.0
+    calls: int = 0
+    matches: int = 0
+
+
+class Profiler:
+    """Accumulates timings keyed by rule id, or phase, and method name.
+
+    Phases are often triggered lazily by the first rule needing their result,
+    like the parsing of a file, so their time is deducted from the timings of
+    the rule methods being measured around them.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty profiler."""
+        self.timings: Dict[Tuple[str, str], Timing] = {}
+        # syntax checks are timed from multiple threads
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def add(self, name: str, method: str, sample: Timing) -> None:
+        """Add a sample to the timing of a method."""
+        with self._lock:
+            timing = self.timings.setdefault((name, method), Timing())
+            timing.seconds += sample.seconds
+            timing.calls += sample.calls
+            timing.matches += sample.matches
+
+    @contextmanager
+    def measure(self, name: str, method: str) -> Iterator[Timing]:
+        """Time a block of code, whose matches can be set on the sample.
+
+        Time spent by phases measured inside the block is not counted for it.
+        """
+        sample = Timing(calls=1)
+        # seconds spent by the phases measured inside each enclosing block
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        stack: List[List[float]] = self._local.stack
+        nested = [0.0]
+        stack.append(nested)
+        start = time.perf_counter()
+        try:
+            yield sample
+        finally:
+            stack.pop()
+            sample.seconds = time.perf_counter() - start - nested[0]
+            if name in PHASES:
+                for outer in stack:
+                    outer[0] += sample.seconds
+            self.add(name, method, sample)
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        """Return timings as dictionaries, the slowest first."""
+        return [
+            {
+                "name": name,
+                "method": method,
+                "seconds": timing.seconds,
+                "calls": timing.calls,
+                "matches": timing.matches,
+            }
+            for (name, method), timing in sorted(
+                self.timings.items(), key=lambda item: -item[1].seconds
+            )
+        ]
+
+    def to_json(self) -> str:
+        """Return timings as a JSON document."""
+        return json.dumps(self.as_list(), indent=2)
+
+    def to_table(self) -> Table:
+        """Return timings as a table, the slowest first.
+
+        Methods without matches that took less than a millisecond in total,
+        like the ones not implemented by a rule, are left out.
+        """
+        entries = [
+            entry
+            for entry in self.as_list()
+            if entry["matches"] or entry["seconds"] >= 0.001
+        ]
+        omitted = len(self.timings) - len(entries)
+        table = Table(
+            title="Rules profile",
+            caption=f"{omitted} negligible entries omitted" if omitted else None,
+        )
+        table.add_column("Rule or phase", overflow="fold")
+        table.add_column("Method", overflow="fold")
+        table.add_column("Calls", justify="right")
+        table.add_column("Matches", justify="right")
+        table.add_column("Total (s)", justify="right")
+        table.add_column("Average (ms)", justify="right")
+        for entry in entries:
+            table.add_row(
+                entry["name"],
+                entry["method"],
+                str(entry["calls"]),
+                str(entry["matches"]),
+                f"{entry['seconds']:.3f}",
+                f"{entry['seconds'] * 1000 / max(entry['calls'], 1):.3f}",
+            )
+        return table
+
+
+_profiler: Optional[Profiler] = None
+
+
+def get_profiler() -> Optional[Profiler]:
+    """Return the active profiler, None when profiling is disabled."""
+    return _profiler
+
+
+def enable_profiler() -> Profiler:
+    """Start collecting timings, returning the profiler used."""
+    global _profiler  # pylint: disable=global-statement,invalid-name
+    _profiler = Profiler()
+    return _profiler
+
+
+def disable_profiler() -> None:
+    """Stop collecting timings."""
+    global _profiler  # pylint: disable=global-statement,invalid-name
+    _profiler = None
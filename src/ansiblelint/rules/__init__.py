@@ -1,8 +1,8 @@
 """All internal ansible-lint rules."""
-import copy
 import glob
 import importlib.util
 import inspect
+import json
 import logging
 import os
 import re
@@ -13,12 +13,14 @@ from importlib.abc import Loader
 from typing import (
     Any,
     Dict,
+    Iterable,
     Iterator,
     List,
     MutableMapping,
     MutableSequence,
     Optional,
     Set,
+    Tuple,
     Union,
     cast,
 )
@@ -38,18 +40,16 @@ from ansiblelint.config import PROFILES, get_rule_config
 from ansiblelint.config import options as default_options
 from ansiblelint.errors import MatchError
 from ansiblelint.file_utils import Lintable, expand_paths_vars
+from ansiblelint.profiling import get_profiler
 
 _logger = logging.getLogger(__name__)
 
-match_types = {
-    "matchlines": "line",
-    "match": "line",  # called by matchlines
-    "matchtasks": "task",
-    "matchtask": "task",  # called by matchtasks
-    "matchyaml": "yaml",
-    "matchplay": "play",  # called by matchyaml
-    "matchdir": "dir",
-}
+
+def _has_tasks(file: Lintable) -> bool:
+    """Return whether tasks can be found inside a lintable."""
+    return file.kind in ["handlers", "tasks", "playbook"] and (
+        str(file.base_kind) == "text/yaml"
+    )
 
 
 class AnsibleLintRule(BaseRule):
@@ -88,59 +88,20 @@ class AnsibleLintRule(BaseRule):
             linenumber=linenumber,
             details=details,
             filename=filename,
-            rule=copy.copy(self),
+            rule=self,
         )
         if tag:
             match.tag = tag
-        # search through callers to find one of the match* methods
-        frame = inspect.currentframe()
-        match_type: Optional[str] = None
-        while not match_type and frame is not None:
-            func_name = frame.f_code.co_name
-            match_type = match_types.get(func_name, None)
-            if match_type:
-                # add the match_type to the match
-                match.match_type = match_type
-                break
-            frame = frame.f_back  # get the parent frame for the next iteration
         return match
 
     def matchlines(self, file: "Lintable") -> List[MatchError]:
-        matches: List[MatchError] = []
-        if not self.match:
-            return matches
-        # arrays are 0-based, line numbers are 1-based
-        # so use prev_line_no as the counter
-        for (prev_line_no, line) in enumerate(file.content.split("\n")):
-            if line.lstrip().startswith("#"):
-                continue
-
-            rule_id_list = ansiblelint.skip_utils.get_rule_skips_from_line(line)
-            if self.id in rule_id_list:
-                continue
-
-            result = self.match(line)
-            if not result:
-                continue
-            message = None
-            if isinstance(result, str):
-                message = result
-            matcherror = self.create_matcherror(
-                message=message,
-                linenumber=prev_line_no + 1,
-                details=line,
-                filename=file,
-            )
-            matches.append(matcherror)
-        return matches
+        if type(self).match is BaseRule.match:
+            return []
+        return _scan_lines(file, [self])[self]
 
     def matchtasks(self, file: Lintable) -> List[MatchError]:
         matches: List[MatchError] = []
-        if (
-            not self.matchtask
-            or file.kind not in ["handlers", "tasks", "playbook"]
-            or str(file.base_kind) != "text/yaml"
-        ):
+        if not self.matchtask or not _has_tasks(file):
             return matches
 
         tasks_iterator = ansiblelint.yaml_utils.iter_tasks_in_file(file)
@@ -149,35 +110,57 @@ class AnsibleLintRule(BaseRule):
                 # normalize_task converts AnsibleParserError to MatchError
                 return [error]
 
-            if self.id in skipped_tags or ("action" not in task):
-                continue
-
-            if self.needs_raw_task:
-                task["__raw_task__"] = raw_task
+            match = self._match_task(file, raw_task, task, skipped_tags)
+            if match:
+                matches.append(match)
+        return matches
 
+    def _match_task(
+        self,
+        file: Lintable,
+        raw_task: Dict[str, Any],
+        task: Dict[str, Any],
+        skipped_tags: List[str],
+    ) -> Optional[MatchError]:
+        """Return the match produced by ``matchtask`` for a normalized task."""
+        if self.id in skipped_tags or ("action" not in task):
+            return None
+
+        if self.needs_raw_task:
+            # normalized tasks are read-only and shared with other rules
+            task = dict(task)
+            task["__raw_task__"] = raw_task
+
+        profiler = get_profiler()
+        if profiler is None:
             result = self.matchtask(task, file=file)
-            if not result:
-                continue
-
-            if isinstance(result, MatchError):
-                if result.tag in skipped_tags:
-                    continue
-                match = result
-            else:
-                message = None
-                if isinstance(result, str):
-                    message = result
-                task_msg = "Task/Handler: " + ansiblelint.utils.task_to_str(task)
-                match = self.create_matcherror(
-                    message=message,
-                    linenumber=task[ansiblelint.utils.LINE_NUMBER_KEY],
-                    details=task_msg,
-                    filename=file,
-                )
-                match.task = task
-
-            matches.append(match)
-        return matches
+        else:
+            with profiler.measure(self.id, "matchtask") as sample:
+                result = self.matchtask(task, file=file)
+                sample.matches = int(bool(result))
+        if not result:
+            return None
+
+        if isinstance(result, MatchError):
+            if result.tag in skipped_tags:
+                return None
+            if result.match_type is None:
+                result.match_type = "task"
+            return result
+
+        message = None
+        if isinstance(result, str):
+            message = result
+        task_msg = "Task/Handler: " + ansiblelint.utils.task_to_str(task)
+        match = self.create_matcherror(
+            message=message,
+            linenumber=task[ansiblelint.utils.LINE_NUMBER_KEY],
+            details=task_msg,
+            filename=file,
+        )
+        match.match_type = "task"
+        match.task = task
+        return match
 
     def matchyaml(self, file: Lintable) -> List[MatchError]:
         matches: List[MatchError] = []
@@ -209,10 +192,24 @@ class AnsibleLintRule(BaseRule):
             if self.id in play.get("skipped_rules", ()):
                 continue
 
-            matches.extend(self.matchplay(file, play))
+            matches.extend(self._match_play(file, play))
 
         return matches
 
+    def _match_play(self, file: Lintable, play: Dict[str, Any]) -> List[MatchError]:
+        """Return the matches of ``matchplay`` for a play, timing it when profiling."""
+        profiler = get_profiler()
+        if profiler is None:
+            matches = self.matchplay(file, play)
+        else:
+            with profiler.measure(self.id, "matchplay") as sample:
+                matches = self.matchplay(file, play)
+                sample.matches = len(matches)
+        for match in matches:
+            if match.match_type is None:
+                match.match_type = "play"
+        return matches
+
 
 class TransformMixin:
     """A mixin for AnsibleLintRule to enable transforming files.
@@ -297,38 +294,220 @@ def is_valid_rule(rule: Any) -> bool:
     return issubclass(rule, AnsibleLintRule) and bool(rule.id) and bool(rule.shortdesc)
 
 
-# pylint: disable=too-many-nested-blocks
-def load_plugins(directory: str) -> Iterator[AnsibleLintRule]:
-    """Yield a rule class."""
-    for pluginfile in glob.glob(os.path.join(directory, "[A-Za-z]*.py")):
+# Name of the file listing the rules of a directory, see ``build_manifest``.
+MANIFEST_FILE = "manifest.json"
+# Bump this when the format of manifests changes.
+MANIFEST_FORMAT = 1
+
+
+def _rule_modules(directory: str) -> List[str]:
+    """Return the files of a directory that can contain rules."""
+    return sorted(glob.glob(os.path.join(directory, "[A-Za-z]*.py")))
+
+
+def load_plugin(pluginfile: str) -> Iterator[AnsibleLintRule]:
+    """Yield the rules defined by a python file."""
+    pluginname = os.path.basename(pluginfile.replace(".py", ""))
+    spec = importlib.util.spec_from_file_location(pluginname, pluginfile)
+
+    # https://github.com/python/typeshed/issues/2793
+    if spec and isinstance(spec.loader, Loader):
+
+        # markdown documentation is only read when needed, like for listing
+        help_path = os.path.splitext(pluginfile)[0] + ".md"
+        if not os.path.exists(help_path):
+            help_path = ""
+
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        try:
+            for _, obj in inspect.getmembers(module):
+                if inspect.isclass(obj) and is_valid_rule(obj):
+                    if help_path:
+                        obj.help_path = help_path
+                    yield obj()
+
+        except (TypeError, ValueError, AttributeError) as exc:
+            _logger.warning("Skipped invalid rule from %s due to %s", pluginname, exc)
+
 
-        pluginname = os.path.basename(pluginfile.replace(".py", ""))
-        spec = importlib.util.spec_from_file_location(pluginname, pluginfile)
+def load_plugins(directory: str) -> Iterator[AnsibleLintRule]:
+    """Yield the rules defined inside a directory."""
+    for pluginfile in _rule_modules(directory):
+        yield from load_plugin(pluginfile)
 
-        # https://github.com/python/typeshed/issues/2793
-        if spec and isinstance(spec.loader, Loader):
 
-            # load rule markdown documentation if found
-            help_md = ""
-            if spec.origin:
-                md_filename = os.path.splitext(spec.origin)[0] + ".md"
-                if os.path.exists(md_filename):
-                    with open(md_filename, encoding="utf-8") as f:
-                        help_md = f.read()
+def build_manifest(directory: str) -> Dict[str, Any]:
+    """Return the manifest of the rules of a directory, importing all of them.
 
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+    Manifests list the rules of each module, with enough details to decide
+    which rules are needed before importing them.
+    """
+    modules = {}
+    for pluginfile in _rule_modules(directory):
+        modules[os.path.basename(pluginfile)] = [
+            _manifest_entry(rule) for rule in load_plugin(pluginfile)
+        ]
+    return {"format": MANIFEST_FORMAT, "modules": modules}
+
+
+def update_manifest(directory: str) -> bool:
+    """Rebuild the manifest of a directory, returning whether it was outdated."""
+    manifest = build_manifest(directory)
+    if load_manifest(directory) == manifest["modules"]:
+        return False
+    with open(os.path.join(directory, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        f.write(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+    return True
+
+
+def _manifest_entry(rule: BaseRule) -> Dict[str, Any]:
+    return {
+        "class": rule.__class__.__name__,
+        "id": rule.id,
+        "tags": list(rule.tags),
+        "shortdesc": rule.shortdesc,
+        "has_dynamic_tags": rule.has_dynamic_tags,
+    }
+
+
+def load_manifest(directory: str) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """Return the rules listed by the manifest of a directory, by module name."""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("format") != MANIFEST_FORMAT:
+        return None
+    return cast(Dict[str, List[Dict[str, Any]]], data["modules"])
+
+
+def _uses_line_visitor(rule: BaseRule) -> bool:
+    """Return whether lines can be matched for a rule by the collection."""
+    return (
+        isinstance(rule, AnsibleLintRule)
+        and type(rule).getmatches is BaseRule.getmatches
+        and type(rule).matchlines is AnsibleLintRule.matchlines
+    )
+
+
+def _noqa_lines(file: Lintable) -> List[Tuple[int, str, List[str]]]:
+    """Return the lines of a file not being comments, with the rules they skip."""
+
+    def load(item: Lintable) -> List[Tuple[int, str, List[str]]]:
+        lines = []
+        for number, line in enumerate(item.content.split("\n"), start=1):
+            if line.lstrip().startswith("#"):
+                continue
+            skipped = []
+            if "# noqa" in line:
+                skipped = ansiblelint.skip_utils.get_rule_skips_from_line(line)
+            lines.append((number, line, skipped))
+        return lines
+
+    return cast(List[Tuple[int, str, List[str]]], file.get_artifact("noqa-lines", load))
+
+
+def _match_line(rule: AnsibleLintRule, line: str) -> Union[bool, str]:
+    """Return the result of ``match`` for a line, timing it when profiling."""
+    profiler = get_profiler()
+    if profiler is None:
+        return rule.match(line)
+    with profiler.measure(rule.id, "match") as sample:
+        result = rule.match(line)
+        sample.matches = int(bool(result))
+    return result
+
+
+def _scan_lines(
+    file: Lintable, rules: List[AnsibleLintRule]
+) -> Dict[BaseRule, List[MatchError]]:
+    """Match each line of a file against the ``match`` method of multiple rules.
+
+    Lines are split, and their noqa comments parsed, once for all rules. When
+    every rule has a ``line_pattern``, lines not containing any are skipped.
+    A rule raising an exception is ignored for the rest of the file.
+    """
+    results: Dict[BaseRule, List[MatchError]] = {rule: [] for rule in rules}
+    patterns = {
+        rule: re.compile(rule.line_pattern) for rule in rules if rule.line_pattern
+    }
+    prefilter = None
+    if rules and len(patterns) == len(rules):
+        prefilter = re.compile("|".join(f"(?:{rule.line_pattern})" for rule in rules))
+    active = list(rules)
+    for number, line, skipped in _noqa_lines(file):
+        if prefilter and not prefilter.search(line):
+            continue
+        for rule in list(active):
+            if _skips_line(rule, line, skipped, patterns.get(rule)):
+                continue
             try:
-                for _, obj in inspect.getmembers(module):
-                    if inspect.isclass(obj) and is_valid_rule(obj):
-                        if help_md:
-                            obj.help = help_md
-                        yield obj()
-
-            except (TypeError, ValueError, AttributeError) as exc:
-                _logger.warning(
-                    "Skipped invalid rule from %s due to %s", pluginname, exc
+                result = _match_line(rule, line)
+            except Exception as exc:  # pylint: disable=broad-except
+                _logger.debug(
+                    "Ignored exception from %s.matchlines: %s",
+                    rule.__class__.__name__,
+                    exc,
                 )
+                active.remove(rule)
+                results[rule] = []
+                continue
+            if result:
+                results[rule].append(_line_match(rule, file, number, line, result))
+    return results
+
+
+def _skips_line(
+    rule: AnsibleLintRule,
+    line: str,
+    skipped: List[str],
+    pattern: Optional["re.Pattern[str]"],
+) -> bool:
+    """Tell if a line is skipped for a rule by a noqa comment or its pattern."""
+    return rule.id in skipped or bool(pattern and not pattern.search(line))
+
+
+def _line_match(
+    rule: AnsibleLintRule,
+    file: Lintable,
+    number: int,
+    line: str,
+    result: Union[bool, str],
+) -> MatchError:
+    """Return the match of a line for the result of ``match``."""
+    matcherror = rule.create_matcherror(
+        message=result if isinstance(result, str) else None,
+        linenumber=number,
+        details=line,
+        filename=file,
+    )
+    matcherror.match_type = "line"
+    return matcherror
+
+
+def _is_selected(
+    entry: Dict[str, Any], tags: Iterable[str], skip_list: Iterable[str]
+) -> bool:
+    """Tell from its manifest entry if a rule is run for tags and a skip list.
+
+    This is the selection made by ``RulesCollection.run``.
+    """
+    names = {entry["id"], *entry["tags"]}
+    if not names.isdisjoint(skip_list):
+        return False
+    tags = set(tags)
+    return bool(not tags or entry["has_dynamic_tags"] or not names.isdisjoint(tags))
+
+
+def _uses_task_visitor(rule: BaseRule) -> bool:
+    """Return whether tasks can be matched for a rule by the collection."""
+    return (
+        isinstance(rule, AnsibleLintRule)
+        and type(rule).getmatches is BaseRule.getmatches
+        and type(rule).matchtasks is AnsibleLintRule.matchtasks
+    )
 
 
 class RulesCollection:
@@ -344,17 +523,145 @@ class RulesCollection:
         if rulesdirs is None:
             rulesdirs = []
         self.rulesdirs = expand_paths_vars(rulesdirs)
-        self.rules: List[BaseRule] = []
         # internal rules included in order to expose them for docs as they are
         # not directly loaded by our rule loader.
-        self.rules.extend(
-            [RuntimeErrorRule(), AnsibleParserErrorRule(), LoadingFailureRule()]
-        )
+        self._rules: List[BaseRule] = [
+            RuntimeErrorRule(),
+            AnsibleParserErrorRule(),
+            LoadingFailureRule(),
+        ]
+        # rules listed by manifests, by id, whose module is imported only when
+        # rules are first needed: (module file, class name)
+        self._pending: Dict[str, Tuple[str, str]] = {}
+        # rules not selected by the tags and skip list of the options, by id,
+        # which are imported only if a run selects them: (module file, entry)
+        self._deferred: Dict[str, Tuple[str, Dict[str, Any]]] = {}
         for rulesdir in self.rulesdirs:
             _logger.debug("Loading rules from %s", rulesdir)
-            for rule in load_plugins(rulesdir):
+            self._load_rulesdir(rulesdir)
+        self._rules.sort()
+
+    def _load_rulesdir(self, rulesdir: str) -> None:
+        """Add the rules of a directory, importing only the modules not listed.
+
+        Directories without a manifest, like the ones of custom rules, get one
+        cached inside the cache directory.
+        """
+        manifest = load_manifest(rulesdir)
+        cache = None
+        if manifest is None and self.options.cache_dir:
+            # pylint: disable=import-outside-toplevel
+            from ansiblelint.cache import RulesManifestCache
+
+            cache = RulesManifestCache(self.options.cache_dir, rulesdir)
+        for pluginfile in _rule_modules(rulesdir):
+            if cache:
+                entries = cache.get(pluginfile)
+            else:
+                entries = (manifest or {}).get(os.path.basename(pluginfile))
+            if entries is None:
+                entries = self._load_unlisted(pluginfile)
+                if cache:
+                    cache.put(pluginfile, entries)
+                continue
+            for entry in entries:
+                if self._is_wanted(entry):
+                    self._pending[entry["id"]] = (pluginfile, entry["class"])
+                elif self._is_available(entry):
+                    self._deferred[entry["id"]] = (pluginfile, entry)
+        if cache:
+            cache.save()
+
+    def _load_unlisted(self, pluginfile: str) -> List[Dict[str, Any]]:
+        """Import the rules of a module not listed, returning their entries."""
+        entries = []
+        for rule in load_plugin(pluginfile):
+            entry = _manifest_entry(rule)
+            if self._is_wanted(entry):
                 self.register(rule)
-        self.rules = sorted(self.rules)
+            elif self._is_available(entry):
+                self._deferred[entry["id"]] = (pluginfile, entry)
+            entries.append(entry)
+        return entries
+
+    @property
+    def rules(self) -> List[BaseRule]:
+        """Return the rules, importing the ones not loaded yet."""
+        if self._pending:
+            self._load_pending()
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules: List[BaseRule]) -> None:
+        self._pending = {}
+        self._deferred = {}
+        self._rules = rules
+
+    def _is_available(self, entry: Dict[str, Any]) -> bool:
+        """Tell from its manifest entry if a rule can be registered."""
+        return bool(
+            self.options.listrules
+            or self.options.listtags
+            or "opt-in" not in entry["tags"]
+            or entry["id"] in self.options.enable_list
+        )
+
+    def _is_wanted(self, entry: Dict[str, Any]) -> bool:
+        """Tell from its manifest entry if a rule can be used with the options."""
+        if self.options.listrules or self.options.listtags:
+            return True
+        tags = self.options.tags
+        if isinstance(tags, str):
+            tags = tags.split(",")
+        return self._is_available(entry) and _is_selected(
+            entry, tags, self.options.skip_list
+        )
+
+    def _load_selected(self, tags: Set[str], skip_list: List[str]) -> None:
+        """Queue for import the rules left out by the options but selected."""
+        for rule_id, (pluginfile, entry) in list(self._deferred.items()):
+            if _is_selected(entry, tags, skip_list):
+                del self._deferred[rule_id]
+                self._pending[rule_id] = (pluginfile, entry["class"])
+
+    def _load_pending(self) -> None:
+        """Import the modules of the rules listed by manifests."""
+        classes: Dict[str, Set[str]] = defaultdict(set)
+        for pluginfile, class_name in self._pending.values():
+            classes[pluginfile].add(class_name)
+        self._pending = {}
+        for pluginfile in sorted(classes):
+            rules = list(load_plugin(pluginfile))
+            names = classes[pluginfile]
+            if not names <= {rule.__class__.__name__ for rule in rules}:
+                # select rules as if there was no manifest
+                _logger.warning("Outdated rules manifest for %s", pluginfile)
+                names = {
+                    rule.__class__.__name__
+                    for rule in rules
+                    if self._is_wanted(_manifest_entry(rule))
+                }
+            for rule in rules:
+                if rule.__class__.__name__ in names:
+                    self.register(rule)
+        self._rules.sort()
+
+    def rule_ids(self) -> List[str]:
+        """Return the ids of the rules, without importing any of them.
+
+        Rules imported only if a run selects them are included.
+        """
+        return (
+            [rule.id for rule in self._rules]
+            + list(self._pending)
+            + list(self._deferred)
+        )
+
+    def unload(self, rule_id: str) -> None:
+        """Remove a rule from the collection, without importing it."""
+        self._pending.pop(rule_id, None)
+        self._deferred.pop(rule_id, None)
+        self._rules = [rule for rule in self._rules if rule.id != rule_id]
 
     def register(self, obj: AnsibleLintRule) -> None:
         """Register a rule."""
@@ -368,7 +675,7 @@ class RulesCollection:
                 self.options.listtags,
             ]
         ):
-            self.rules.append(obj)
+            self._rules.append(obj)
 
     def __iter__(self) -> Iterator[BaseRule]:
         """Return the iterator over the rules in the RulesCollection."""
@@ -413,16 +720,17 @@ class RulesCollection:
                     )
                 ]
 
-        for rule in self.rules:
-            if (
-                not tags
-                or rule.has_dynamic_tags
-                or not set(rule.tags).union([rule.id]).isdisjoint(tags)
-            ):
-                rule_definition = set(rule.tags)
-                rule_definition.add(rule.id)
-                if set(rule_definition).isdisjoint(skip_list):
-                    matches.extend(rule.getmatches(file))
+        rules = self._select(tags, skip_list)
+        task_matches = self._matchtasks(file, rules)
+        line_matches = self._matchlines(file, rules)
+        for rule in rules:
+            matches.extend(
+                rule.getmatches(
+                    file,
+                    task_matches=task_matches.get(rule),
+                    line_matches=line_matches.get(rule),
+                )
+            )
 
         # some rules can produce matches with tags that are inside our
         # skip_list, so we need to cleanse the matches
@@ -430,6 +738,89 @@ class RulesCollection:
 
         return matches
 
+    def _select(self, tags: Set[str], skip_list: List[str]) -> List[BaseRule]:
+        """Return the rules run for tags and a skip list, importing them if needed.
+
+        Rules left out when building the collection, using the tags and skip
+        list of the options, are imported when a run selects them.
+        """
+        if self._deferred:
+            self._load_selected(tags, skip_list)
+        return [
+            rule
+            for rule in self.rules
+            if _is_selected(_manifest_entry(rule), tags, skip_list)
+        ]
+
+    @staticmethod
+    def _matchlines(
+        file: Lintable, rules: List[BaseRule]
+    ) -> Dict[BaseRule, List[MatchError]]:
+        """Match the lines of a file against multiple rules at once.
+
+        Rules using the default ``matchlines`` implementation without
+        overriding ``match`` cannot match any line, so they are not given any.
+        """
+        visitors = [rule for rule in rules if _uses_line_visitor(rule)]
+        results: Dict[BaseRule, List[MatchError]] = {rule: [] for rule in visitors}
+        matchers = [
+            cast(AnsibleLintRule, rule)
+            for rule in visitors
+            if type(rule).match is not BaseRule.match
+        ]
+        if not matchers or file.path.is_dir():
+            return results
+        results.update(_scan_lines(file, matchers))
+        return results
+
+    @staticmethod
+    def _matchtasks(
+        file: Lintable, rules: List[BaseRule]
+    ) -> Dict[BaseRule, List[MatchError]]:
+        """Match the tasks of a file against multiple rules at once.
+
+        Tasks are normalized once and handed to the ``matchtask`` of every rule
+        using the default ``matchtasks`` implementation and overriding
+        ``matchtask``. Other rules using the default ``matchtasks`` only get
+        task loading errors. Normalized tasks are read-only, so a rule cannot
+        alter the task seen by the next one.
+        """
+        visitors = [rule for rule in rules if _uses_task_visitor(rule)]
+        results: Dict[BaseRule, List[MatchError]] = {rule: [] for rule in visitors}
+        if not visitors or file.path.is_dir() or not _has_tasks(file):
+            return results
+
+        active = [
+            rule for rule in visitors if type(rule).matchtask is not BaseRule.matchtask
+        ]
+        try:
+            tasks_iterator = ansiblelint.yaml_utils.iter_tasks_in_file(file)
+            for raw_task, task, skipped_tags, error in tasks_iterator:
+                if error is not None:
+                    # normalize_task converts AnsibleParserError to MatchError
+                    return {rule: [error] for rule in visitors}
+                for rule in list(active):
+                    try:
+                        # pylint: disable=protected-access
+                        match = cast(AnsibleLintRule, rule)._match_task(
+                            file, raw_task, task, skipped_tags
+                        )
+                    except Exception as exc:  # pylint: disable=broad-except
+                        _logger.debug(
+                            "Ignored exception from %s.matchtasks: %s",
+                            rule.__class__.__name__,
+                            exc,
+                        )
+                        active.remove(rule)
+                        results[rule] = []
+                        continue
+                    if match:
+                        results[rule].append(match)
+        except Exception as exc:  # pylint: disable=broad-except
+            _logger.debug("Ignored exception while iterating tasks: %s", exc)
+            return {rule: [] for rule in visitors}
+        return results
+
     def __repr__(self) -> str:
         """Return a RulesCollection instance representation."""
         return "\n".join(
@@ -479,11 +870,11 @@ def filter_rules_with_profile(rule_col: RulesCollection, profile: str) -> None:
         for rule in PROFILES[extends]["rules"]:
             included.add(rule)
         extends = PROFILES[extends].get("extends", None)
-    for rule in list(rule_col.rules):
-        if rule.id not in included:
+    for rule_id in rule_col.rule_ids():
+        if rule_id not in included:
             _logger.debug(
                 "Unloading %s rule due to not being part of %s profile.",
-                rule.id,
+                rule_id,
                 profile,
             )
-            rule_col.rules.remove(rule)
+            rule_col.unload(rule_id)
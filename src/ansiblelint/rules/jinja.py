@@ -11,7 +11,7 @@ from ansible.parsing.yaml.objects import AnsibleUnicode
 from ansiblelint.file_utils import Lintable
 from ansiblelint.rules import AnsibleLintRule
 from ansiblelint.skip_utils import get_rule_skips_from_line
-from ansiblelint.utils import LINE_NUMBER_KEY, parse_yaml_from_file, task_to_str
+from ansiblelint.utils import LINE_NUMBER_KEY, parse_yaml_from_lintable, task_to_str
 from ansiblelint.yaml_utils import nested_items_path
 
 if TYPE_CHECKING:
@@ -63,7 +63,7 @@ class JinjaRule(AnsibleLintRule):
         results: List["MatchError"] = []
 
         if str(file.kind) == "vars":
-            data = parse_yaml_from_file(str(file.path))
+            data = parse_yaml_from_lintable(file)
             for k, v, path in nested_items_path(data):
                 if isinstance(v, AnsibleUnicode):
                     cleaned = self.exclude_json_re.sub("", v)
@@ -83,7 +83,7 @@ class JinjaRule(AnsibleLintRule):
                             )
                         )
             if raw_results:
-                lines = file.content.splitlines()
+                lines = file.lines
                 for match in raw_results:
                     # linenumber starts with 1, not zero
                     skip_list = get_rule_skips_from_line(lines[match.linenumber - 1])
@@ -4,23 +4,24 @@ import logging
 import os
 import sys
 from functools import lru_cache
-from typing import Any, List
+from typing import Any, List, Optional, Sequence, Tuple, Union
 
 import yaml
-from jsonschema import validate
-from jsonschema.exceptions import ValidationError
+from jsonschema.exceptions import ValidationError, best_match
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
 
 from ansiblelint.config import JSON_SCHEMAS
 from ansiblelint.errors import MatchError
 from ansiblelint.file_utils import Lintable
+from ansiblelint.parse_cache import get_parse_cache
 from ansiblelint.rules import AnsibleLintRule
 from ansiblelint.schemas import __file__ as schemas_module
 
 _logger = logging.getLogger(__name__)
 
-DESCRIPTION_MD = """ Returned errors will not include exact line numbers, but they will mention
-the schema name being used as a tag, like ``playbook-schema``,
-``tasks-schema``.
+DESCRIPTION_MD = """ Returned errors mention the schema name being used as a tag,
+like ``playbook-schema``, ``tasks-schema``, and the line of the offending value.
 
 This rule is not skippable and stops further processing of the file.
 
@@ -32,6 +33,77 @@ If incorrect schema was picked, you might want to either:
 * use ``kinds:`` option in linter config to help it pick correct file type.
 """
 
+_SafeLoader: Any = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _json_key(key: Any) -> Any:
+    """Return a mapping key as JSON would convert it."""
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(key)
+    return str(key)
+
+
+class _JsonLoader(_SafeLoader):
+    """Load YAML as JSON compatible data, without a JSON round-trip.
+
+    Keys are converted to strings and timestamps are kept as written.
+    """
+
+    def construct_mapping(self, node: yaml.Node, deep: bool = False) -> Any:
+        mapping = super().construct_mapping(node, deep=deep)
+        if all(isinstance(key, str) for key in mapping):
+            return mapping
+        return {_json_key(key): value for key, value in mapping.items()}
+
+    def construct_yaml_timestamp(self, node: yaml.Node) -> Any:
+        return self.construct_scalar(node)
+
+
+_JsonLoader.add_constructor(
+    "tag:yaml.org,2002:timestamp", _JsonLoader.construct_yaml_timestamp
+)
+
+
+def _load_json_data(file: Lintable) -> Tuple[Any, Optional[yaml.Node]]:
+    """Return the content of a file as JSON compatible data, and its nodes."""
+    loader = _JsonLoader(file.content)
+    try:
+        node = loader.get_single_node()
+        data = loader.construct_document(node) if node is not None else None
+    finally:
+        loader.dispose()
+    return data, node
+
+
+def _node_line(node: Optional[yaml.Node], path: Sequence[Union[int, str]]) -> int:
+    """Return the line of the value found at path, or of its closest parent."""
+    if node is None:
+        return 1
+    line = node.start_mark.line
+    loader = None
+    for part in path:
+        child = None
+        if isinstance(node, yaml.SequenceNode) and isinstance(part, int):
+            if part < len(node.value):
+                child = node.value[part]
+                line = child.start_mark.line
+        elif isinstance(node, yaml.MappingNode):
+            for key_node, value_node in node.value:
+                key = key_node.value
+                if not isinstance(key_node, yaml.ScalarNode) or key != part:
+                    loader = loader or _JsonLoader("")
+                    key = _json_key(loader.construct_object(key_node, deep=True))
+                if key == part:
+                    child = value_node
+                    line = key_node.start_mark.line
+                    break
+        if child is None:
+            break
+        node = child
+    return line + 1
+
 
 class ValidateSchemaRule(AnsibleLintRule):
     """Perform JSON Schema Validation for known lintable kinds."""
@@ -51,6 +123,15 @@ class ValidateSchemaRule(AnsibleLintRule):
         with open(schema_file, encoding="utf-8") as f:
             return json.load(f)
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_validator(kind: str) -> Validator:
+        """Return the validator for the given kind, checking its schema once."""
+        schema = ValidateSchemaRule._get_schema(kind)
+        validator_class = validator_for(schema)
+        validator_class.check_schema(schema)
+        return validator_class(schema)
+
     def matchyaml(self, file: Lintable) -> List[MatchError]:
         """Return JSON validation errors found as a list of MatchError(s)."""
         result = []
@@ -58,28 +139,35 @@ class ValidateSchemaRule(AnsibleLintRule):
             return []
 
         try:
-            # convert yaml to json (keys are converted to strings)
-            yaml_data = yaml.safe_load(file.content)
-            json_data = json.loads(json.dumps(yaml_data))
-            validate(
-                instance=json_data,
-                schema=ValidateSchemaRule._get_schema(file.kind),
+            json_data, root = file.get_artifact(
+                "json",
+                lambda item: get_parse_cache().get("json", item, _load_json_data),
             )
         except yaml.constructor.ConstructorError:
             _logger.debug(
-                "Ignored failure to load %s for schema validation, as !vault may cause it."
+                "Ignored failure to load %s for schema validation, as !vault may cause it.",
+                file,
             )
             return []
-        except ValidationError as exc:
-            result.append(
-                MatchError(
-                    message=exc.message,
-                    filename=file,
-                    rule=ValidateSchemaRule(),
-                    details=ValidateSchemaRule.description,
-                    tag=f"schema[{file.kind}]",
-                )
+        errors: List[Tuple[int, ValidationError]] = [
+            (_node_line(root, list(error.absolute_path)), error)
+            for error in ValidateSchemaRule._get_validator(file.kind).iter_errors(
+                json_data
+            )
+        ]
+        for line, error in sorted(errors, key=lambda item: item[0]):
+            # messages are the same as the ones of jsonschema.validate()
+            best = best_match([error]) or error
+            match = MatchError(
+                message=best.message,
+                linenumber=line,
+                filename=file,
+                rule=ValidateSchemaRule(),
+                details=ValidateSchemaRule.description,
+                tag=f"schema[{file.kind}]",
             )
+            match.yaml_path = list(error.absolute_path)
+            result.append(match)
         return result
 
 
@@ -98,7 +186,7 @@ if "pytest" in sys.modules:
             (
                 "examples/galaxy.yml",
                 "galaxy",
-                ["'GPL' is not one of"],
+                ["'GPL' is not one of", "'Apache' is not one of"],
             ),
             (
                 "examples/roles/invalid_requirements_schema/meta/requirements.yml",
@@ -123,7 +211,11 @@ if "pytest" in sys.modules:
             (
                 "examples/ee_broken/execution-environment.yml",
                 "execution-environment",
-                ["Additional properties are not allowed ('foo' was unexpected)"],
+                [
+                    "'dependencies' is a required property",
+                    "'version' is a required property",
+                    "Additional properties are not allowed ('foo' was unexpected)",
+                ],
             ),
             ("examples/meta/runtime.yml", "meta-runtime", []),
             (
@@ -164,7 +256,10 @@ if "pytest" in sys.modules:
             (
                 "examples/broken/ansible-navigator.yml",
                 "ansible-navigator-config",
-                ["Additional properties are not allowed ('ansible' was unexpected)"],
+                [
+                    "'ansible-navigator' is a required property",
+                    "Additional properties are not allowed ('ansible' was unexpected)",
+                ],
             ),
             (
                 "examples/roles/hello/meta/argument_specs.yml",
@@ -212,3 +307,13 @@ if "pytest" in sys.modules:
             assert result.filename.endswith(file)
             assert expected[idx] in result.message
             assert result.tag == f"schema[{expected_kind}]"
+
+    def test_schema_line_numbers() -> None:
+        """Validate that all errors are reported at the line of their value."""
+        lintable = Lintable("examples/galaxy.yml")
+        results = ValidateSchemaRule().matchyaml(lintable)
+
+        assert [(result.linenumber, result.yaml_path) for result in results] == [
+            (14, ["license", 0]),
+            (15, ["license", 1]),
+        ]
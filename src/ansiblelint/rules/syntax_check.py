@@ -1,11 +1,15 @@
 """Rule definition for ansible syntax check."""
 import json
+import multiprocessing
+import multiprocessing.pool
+import os
 import re
 import subprocess
 import sys
-from typing import Any, List
+from typing import Any, List, Optional, Tuple
 
 from ansiblelint._internal.rules import BaseRule, RuntimeErrorRule
+from ansiblelint._internal.syntax_check import initialize_worker, run_playbook_cli
 from ansiblelint.app import get_app
 from ansiblelint.config import options
 from ansiblelint.errors import MatchError
@@ -48,9 +52,15 @@ class AnsibleSyntaxCheckRule(AnsibleLintRule):
     _order = 0
 
     @staticmethod
-    # pylint: disable=too-many-locals
-    def _get_ansible_syntax_check_matches(lintable: Lintable) -> List[MatchError]:
-        """Run ansible syntax check and return a list of MatchError(s)."""
+    def _get_ansible_syntax_check_matches(
+        lintable: Lintable, pool: Optional[multiprocessing.pool.Pool] = None
+    ) -> List[MatchError]:
+        """Run ansible syntax check and return a list of MatchError(s).
+
+        When a ``pool`` created by ``create_syntax_check_pool`` is given, the
+        syntax check runs inside one of its already initialized workers
+        instead of a new ``ansible-playbook`` process.
+        """
         if lintable.kind != "playbook":
             return []
 
@@ -67,78 +77,114 @@ class AnsibleSyntaxCheckRule(AnsibleLintRule):
                 *args,
                 str(lintable.path),
             ]
+            returncode, stdout, stderr = _run_syntax_check(cmd, pool)
+        if returncode == 0:
+            return []
+        return [_syntax_check_error(lintable, cmd, returncode, stdout, stderr)]
 
-            # To reduce noisy warnings like
-            # CryptographyDeprecationWarning: Blowfish has been deprecated
-            # https://github.com/paramiko/paramiko/issues/2038
-            env = get_app(offline=True).runtime.environ.copy()
-            env["PYTHONWARNINGS"] = "ignore"
-
-            run = subprocess.run(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                shell=False,  # needed when command is a list
-                universal_newlines=True,
-                check=False,
-                env=env,
-            )
-            result = []
-        if run.returncode != 0:
-            message = None
-            filename = str(lintable.path)
-            linenumber = 1
-            column = None
-            tag = None
-
-            stderr = strip_ansi_escape(run.stderr)
-            stdout = strip_ansi_escape(run.stdout)
-            if stderr:
-                details = stderr
-                if stdout:
-                    details += "\n" + stdout
-            else:
-                details = stdout
-
-            match = _ansible_syntax_check_re.search(stderr)
-            if match:
-                message = match.groupdict()["title"]
-                # Ansible returns absolute paths
-                filename = match.groupdict()["filename"]
-                linenumber = int(match.groupdict()["line"])
-                column = int(match.groupdict()["column"])
-            elif _empty_playbook_re.search(stderr):
-                message = "Empty playbook, nothing to do"
-                filename = str(lintable.path)
-                tag = "empty-playbook"
-
-            if run.returncode == 4:
-                rule: BaseRule = AnsibleSyntaxCheckRule()
-            else:
-                rule = RuntimeErrorRule()
-                if not message:
-                    message = (
-                        f"Unexpected error code {run.returncode} from "
-                        f"execution of: {' '.join(cmd)}"
-                    )
-
-            result.append(
-                MatchError(
-                    message=message,
-                    filename=filename,
-                    linenumber=linenumber,
-                    column=column,
-                    rule=rule,
-                    details=details,
-                    tag=tag,
-                )
+
+def _run_syntax_check(
+    cmd: List[str], pool: Optional[multiprocessing.pool.Pool]
+) -> Tuple[int, str, str]:
+    """Execute the syntax check command, returning exit code, stdout and stderr."""
+    if pool is not None:
+        returncode, stdout, stderr = pool.apply(
+            run_playbook_cli, (cmd[1:], os.getcwd())
+        )
+        return returncode, stdout, stderr
+
+    # To reduce noisy warnings like
+    # CryptographyDeprecationWarning: Blowfish has been deprecated
+    # https://github.com/paramiko/paramiko/issues/2038
+    env = get_app(offline=True).runtime.environ.copy()
+    env["PYTHONWARNINGS"] = "ignore"
+
+    run = subprocess.run(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        shell=False,  # needed when command is a list
+        universal_newlines=True,
+        check=False,
+        env=env,
+    )
+    return run.returncode, run.stdout, run.stderr
+
+
+def _syntax_check_error(
+    lintable: Lintable, cmd: List[str], returncode: int, stdout: str, stderr: str
+) -> MatchError:
+    """Return the match reporting a failed syntax check."""
+    message = None
+    filename = str(lintable.path)
+    linenumber = 1
+    column = None
+    tag = None
+
+    stderr = strip_ansi_escape(stderr)
+    stdout = strip_ansi_escape(stdout)
+    if stderr:
+        details = stderr
+        if stdout:
+            details += "\n" + stdout
+    else:
+        details = stdout
+
+    match = _ansible_syntax_check_re.search(stderr)
+    if match:
+        message = match.groupdict()["title"]
+        # Ansible returns absolute paths
+        filename = match.groupdict()["filename"]
+        linenumber = int(match.groupdict()["line"])
+        column = int(match.groupdict()["column"])
+    elif _empty_playbook_re.search(stderr):
+        message = "Empty playbook, nothing to do"
+        filename = str(lintable.path)
+        tag = "empty-playbook"
+
+    if returncode == 4:
+        rule: BaseRule = AnsibleSyntaxCheckRule()
+    else:
+        rule = RuntimeErrorRule()
+        if not message:
+            message = (
+                f"Unexpected error code {returncode} from "
+                f"execution of: {' '.join(cmd)}"
             )
-        return result
+
+    return MatchError(
+        message=message,
+        filename=filename,
+        linenumber=linenumber,
+        column=column,
+        rule=rule,
+        details=details,
+        tag=tag,
+    )
+
+
+def create_syntax_check_pool(processes: int) -> multiprocessing.pool.Pool:
+    """Return a pool of workers able to run syntax checks in-process.
+
+    Workers are spawned, not forked, so they load ansible using the runtime
+    environment prepared by the linter (mocked modules and roles, installed
+    collections) instead of the one of the current process. Workers live for
+    the whole run and reset the state ansible kept about a playbook before
+    checking the next one.
+    """
+    env = get_app(offline=True).runtime.environ.copy()
+    env["ANSIBLE_NOCOLOR"] = "1"
+    return multiprocessing.get_context("spawn").Pool(
+        processes=processes,
+        initializer=initialize_worker,
+        initargs=(env,),
+    )
 
 
 # testing code to be loaded only with pytest or when executed the rule file
 if "pytest" in sys.modules:
+    from pathlib import Path
 
     def test_get_ansible_syntax_check_matches() -> None:
         """Validate parsing of ansible output."""
@@ -183,3 +229,67 @@ if "pytest" in sys.modules:
         result = AnsibleSyntaxCheckRule._get_ansible_syntax_check_matches(lintable)
 
         assert not result
+
+    def test_in_process_syntax_check() -> None:
+        """Validate that in-process syntax check reports the same matches."""
+        playbooks = (
+            "examples/playbooks/conflicting_action.yml",
+            "examples/playbooks/empty_playbook.yml",
+            "examples/playbooks/nomatchestest.yml",
+        )
+        pool = create_syntax_check_pool(processes=1)
+        try:
+            for playbook in playbooks:
+                lintable = Lintable(playbook, kind="playbook")
+                # pylint: disable=protected-access
+                expected = AnsibleSyntaxCheckRule._get_ansible_syntax_check_matches(
+                    lintable
+                )
+                result = AnsibleSyntaxCheckRule._get_ansible_syntax_check_matches(
+                    lintable, pool=pool
+                )
+                assert result == expected
+                assert [m.tag for m in result] == [m.tag for m in expected]
+                assert [m.column for m in result] == [m.column for m in expected]
+        finally:
+            pool.close()
+            pool.join()
+
+    def test_in_process_syntax_check_isolation(tmp_path: Path) -> None:
+        """Validate that content found for a playbook does not leak to the next."""
+        modules = tmp_path / "with/collections/ansible_collections/foo/bar/plugins"
+        (modules / "modules").mkdir(parents=True)
+        (modules / "modules" / "baz.py").write_text(
+            "from ansible.module_utils.basic import AnsibleModule\n",
+            encoding="utf-8",
+        )
+        (tmp_path / "without").mkdir()
+        for root in ("with", "without"):
+            (tmp_path / root / "playbook.yml").write_text(
+                "- hosts: localhost\n  tasks:\n    - foo.bar.baz: {}\n",
+                encoding="utf-8",
+            )
+        playbooks = [
+            Lintable(str(tmp_path / root / "playbook.yml"), kind="playbook")
+            for root in ("with", "without")
+        ]
+
+        # pylint: disable=protected-access
+        expected = [
+            AnsibleSyntaxCheckRule._get_ansible_syntax_check_matches(lintable)
+            for lintable in playbooks
+        ]
+        assert not expected[0]
+        assert len(expected[1]) == 1
+
+        # a single worker process gets to check both playbooks, in both orders
+        pool = create_syntax_check_pool(processes=1)
+        results = [
+            AnsibleSyntaxCheckRule._get_ansible_syntax_check_matches(
+                lintable, pool=pool
+            )
+            for lintable in [*playbooks, *reversed(playbooks)]
+        ]
+        pool.close()
+        pool.join()
+        assert results == [*expected, *reversed(expected)]
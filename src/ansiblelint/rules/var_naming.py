@@ -10,7 +10,7 @@ from ansiblelint.config import options
 from ansiblelint.file_utils import Lintable
 from ansiblelint.rules import AnsibleLintRule
 from ansiblelint.skip_utils import get_rule_skips_from_line
-from ansiblelint.utils import LINE_NUMBER_KEY, parse_yaml_from_file
+from ansiblelint.utils import LINE_NUMBER_KEY, parse_yaml_from_lintable
 
 if TYPE_CHECKING:
     from ansiblelint.constants import odict
@@ -121,7 +121,7 @@ class VariableNamingRule(AnsibleLintRule):
                     )
                 )
         if raw_results:
-            lines = file.content.splitlines()
+            lines = file.lines
             for match in raw_results:
                 # linenumber starts with 1, not zero
                 skip_list = get_rule_skips_from_line(lines[match.linenumber - 1])
@@ -162,7 +162,7 @@ class VariableNamingRule(AnsibleLintRule):
         meta_data: Dict[AnsibleUnicode, Any] = {}
 
         if str(file.kind) == "vars":
-            meta_data = parse_yaml_from_file(str(file.path))
+            meta_data = parse_yaml_from_lintable(file)
             for key in meta_data.keys():
                 if self.is_invalid_variable_name(key):
                     raw_results.append(
@@ -175,7 +175,7 @@ class VariableNamingRule(AnsibleLintRule):
                         )
                     )
             if raw_results:
-                lines = file.content.splitlines()
+                lines = file.lines
                 for match in raw_results:
                     # linenumber starts with 1, not zero
                     skip_list = get_rule_skips_from_line(lines[match.linenumber - 1])
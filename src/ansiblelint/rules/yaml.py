@@ -44,23 +44,21 @@ class YamllintRule(AnsibleLintRule):
         for problem in run_yamllint(
             file.content, YamllintRule.config, filepath=file.path
         ):
-            self.severity = "VERY_LOW"
+            match = self.create_matcherror(
+                message=problem.desc,
+                linenumber=problem.line,
+                details="",
+                filename=str(file.path),
+                tag=f"yaml[{problem.rule}]",
+            )
             if problem.level == "error":
-                self.severity = "MEDIUM"
+                match.severity = "MEDIUM"
             if problem.desc.endswith("(syntax)"):
-                self.severity = "VERY_HIGH"
-            matches.append(
-                self.create_matcherror(
-                    message=problem.desc,
-                    linenumber=problem.line,
-                    details="",
-                    filename=str(file.path),
-                    tag=f"yaml[{problem.rule}]",
-                )
-            )
+                match.severity = "VERY_HIGH"
+            matches.append(match)
 
         if matches:
-            lines = file.content.splitlines()
+            lines = file.lines
             for match in matches:
                 # rule.linenumber starts with 1, not zero
                 skip_list = get_rule_skips_from_line(lines[match.linenumber - 1])
@@ -72,10 +70,14 @@ class YamllintRule(AnsibleLintRule):
 
 # testing code to be loaded only with pytest or when executed the rule file
 if "pytest" in sys.modules:
+    import json
+    from pathlib import Path
+
     import pytest
 
     # pylint: disable=ungrouped-imports
     from ansiblelint.config import options
+    from ansiblelint.formatters import CodeclimateJSONFormatter
     from ansiblelint.rules import RulesCollection
     from ansiblelint.runner import Runner
 
@@ -128,3 +130,20 @@ if "pytest" in sys.modules:
                 break
         else:
             pytest.fail("No yaml collection found")
+
+    def test_yamllint_severities(tmp_path: Path) -> None:
+        """Validate that each match keeps the severity of its problem."""
+        playbook = tmp_path / "playbook.yml"
+        playbook.write_text(
+            "---\n- hosts: all\n  become: yes\n  tasks:\n    - debug:   {msg: x}\n",
+            encoding="utf-8",
+        )
+        rules = RulesCollection(options=options)
+        rules.register(YamllintRule())
+        results = Runner(Lintable(str(playbook)), rules=rules).run()
+
+        severities = {result.tag: result.severity for result in results}
+        assert severities == {"yaml[truthy]": "VERY_LOW", "yaml[colons]": "MEDIUM"}
+        formatter = CodeclimateJSONFormatter(tmp_path, display_relative_path=True)
+        issues = json.loads(formatter.format_result(results))
+        assert [issue["severity"] for issue in issues] == ["info", "major"]
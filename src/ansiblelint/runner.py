@@ -2,18 +2,39 @@
 import logging
 import multiprocessing
 import multiprocessing.pool
-import os
 from dataclasses import dataclass
-from fnmatch import fnmatch
-from pathlib import Path
-from typing import TYPE_CHECKING, Any, FrozenSet, Generator, List, Optional, Set, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    FrozenSet,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Union,
+)
 
 import ansiblelint.skip_utils
 import ansiblelint.utils
+from ansiblelint._internal.parallel import RulesPool
 from ansiblelint._internal.rules import LoadingFailureRule
+from ansiblelint.app import get_app
+from ansiblelint.cache import ResultCache, SyntaxCheckCache
+from ansiblelint.config import DEFAULT_PARSE_CACHE_SIZE
 from ansiblelint.errors import MatchError
-from ansiblelint.file_utils import Lintable, expand_dirs_in_lintables
-from ansiblelint.rules.syntax_check import AnsibleSyntaxCheckRule
+from ansiblelint.file_utils import (
+    Lintable,
+    expand_dirs_in_lintables,
+    get_exclude_matcher,
+)
+from ansiblelint.incremental import get_changed_lintables
+from ansiblelint.parse_cache import ParseCache, get_parse_cache, parse_cache_scope
+from ansiblelint.profiling import SYNTAX_CHECK, get_profiler
+from ansiblelint.rules.syntax_check import (
+    AnsibleSyntaxCheckRule,
+    create_syntax_check_pool,
+)
 
 if TYPE_CHECKING:
     from argparse import Namespace
@@ -29,8 +50,11 @@ class LintResult:
 
     matches: List[MatchError]
     files: Set[Lintable]
+    cache_hits: int = 0
+    cache_misses: int = 0
 
 
+# pylint: disable=too-many-instance-attributes
 class Runner:
     """Runner class performs the linting process."""
 
@@ -43,9 +67,19 @@ class Runner:
         skip_list: Optional[List[str]] = None,
         exclude_paths: Optional[List[str]] = None,
         verbosity: int = 0,
-        checked_files: Optional[Set[Lintable]] = None
+        checked_files: Optional[Set[Lintable]] = None,
+        cache: Optional[ResultCache] = None,
+        syntax_check_cache: Optional[SyntaxCheckCache] = None,
+        syntax_check_engine: str = "subprocess",
+        jobs: int = 1,
+        parse_cache_size: int = DEFAULT_PARSE_CACHE_SIZE,
+        lint_children: bool = True,
     ) -> None:
-        """Initialize a Runner instance."""
+        """Initialize a Runner instance.
+
+        Unless ``lint_children`` is false, files imported or included by the
+        lintables are linted too.
+        """
         self.rules = rules
         self.lintables: Set[Lintable] = set()
 
@@ -70,44 +104,48 @@ class Runner:
         if checked_files is None:
             checked_files = set()
         self.checked_files = checked_files
+        self.cache = cache
+        self.syntax_check_cache = syntax_check_cache
+        self.syntax_check_engine = syntax_check_engine
+        self.jobs = jobs
+        self.parse_cache_size = parse_cache_size
+        # cache used by the last run, set once it started
+        self.parse_cache: Optional[ParseCache] = None
+        self.lint_children = lint_children
 
     def _update_exclude_paths(self, exclude_paths: List[str]) -> None:
-        if exclude_paths:
-            # These will be (potentially) relative paths
-            paths = ansiblelint.file_utils.expand_paths_vars(exclude_paths)
-            # Since ansiblelint.utils.find_children returns absolute paths,
-            # and the list of files we create in `Runner.run` can contain both
-            # relative and absolute paths, we need to cover both bases.
-            self.exclude_paths = paths + [os.path.abspath(p) for p in paths]
-        else:
-            self.exclude_paths = []
+        # The matcher is shared with discovery, which uses the same options.
+        self.exclude_matcher = get_exclude_matcher(exclude_paths)
+        self.exclude_paths = self.exclude_matcher.exclude_paths
 
     def is_excluded(self, file_path: str) -> bool:
         """Verify if a file path should be excluded."""
-        # Any will short-circuit as soon as something returns True, but will
-        # be poor performance for the case where the path under question is
-        # not excluded.
-
-        # Exclusions should be evaluated only using absolute paths in order
-        # to work correctly.
-        if not file_path:
-            return False
-
-        abs_path = os.path.abspath(file_path)
-        _file_path = Path(file_path)
-
-        return any(
-            abs_path.startswith(path)
-            or _file_path.match(path)
-            or fnmatch(str(abs_path), path)
-            or fnmatch(str(_file_path), path)
-            for path in self.exclude_paths
-        )
+        return self.exclude_matcher.is_excluded(file_path)
 
     def run(self) -> List[MatchError]:
         """Execute the linting process."""
+        return sorted({match for matches in self.stream() for match in matches})
+
+    def stream(self) -> Iterator[List[MatchError]]:
+        """Execute the linting process, yielding matches as soon as found.
+
+        Matches are yielded for each file once it was linted, sorted and
+        without duplicates, except for the syntax check failures of playbooks
+        and the failures to load included files.
+        """
+        with parse_cache_scope(self.parse_cache_size) as parse_cache:
+            self.parse_cache = parse_cache
+            for matches in self._run():
+                # remove any matches made inside excluded files
+                matches = [
+                    match for match in matches if not self.is_excluded(match.filename)
+                ]
+                if matches:
+                    yield sorted(set(matches))
+
+    def _run(self) -> Iterator[List[MatchError]]:
         files: List[Lintable] = []
-        matches: List[MatchError] = []
+        failed = False
 
         # remove exclusions
         for lintable in self.lintables.copy():
@@ -115,35 +153,29 @@ class Runner:
                 _logger.debug("Excluded %s", lintable)
                 self.lintables.remove(lintable)
 
-        # -- phase 1 : syntax check in parallel --
-        def worker(lintable: Lintable) -> List[MatchError]:
-            # pylint: disable=protected-access
-            return AnsibleSyntaxCheckRule._get_ansible_syntax_check_matches(lintable)
-
         # playbooks: List[Lintable] = []
         for lintable in self.lintables:
             if lintable.kind != "playbook":
                 continue
             files.append(lintable)
 
-        pool = multiprocessing.pool.ThreadPool(processes=multiprocessing.cpu_count())
-        return_list = pool.map(worker, files, chunksize=1)
-        pool.close()
-        pool.join()
-        for data in return_list:
-            matches.extend(data)
+        # -- phase 1 : syntax check in parallel --
+        for matches in self._syntax_check(files):
+            failed = failed or bool(matches)
+            yield matches
 
         # -- phase 2 ---
-        if not matches:
+        if not failed:
 
             # do our processing only when ansible syntax check passed in order
             # to avoid causing runtime exceptions. Our processing is not as
             # resilient to be able process garbage.
-            matches.extend(self._emit_matches(files))
+            yield list(self._emit_matches(files))
 
             # remove duplicates from files list
             files = [value for n, value in enumerate(files) if value not in files[:n]]
 
+            pending: List[Lintable] = []
             for file in self.lintables:
                 if file in self.checked_files or not file.kind:
                     continue
@@ -152,20 +184,116 @@ class Runner:
                     ansiblelint.file_utils.normpath(file.path),
                     file.kind,
                 )
+                pending.append(file)
 
-                matches.extend(
-                    self.rules.run(file, tags=set(self.tags), skip_list=self.skip_list)
-                )
+            yield from self._run_rules(pending)
 
         # update list of checked files
         self.checked_files.update(self.lintables)
 
-        # remove any matches made inside excluded files
-        matches = list(
-            filter(lambda match: not self.is_excluded(match.filename), matches)
-        )
+    def _syntax_check(self, files: List[Lintable]) -> Iterator[List[MatchError]]:
+        """Yield the syntax check matches of each playbook."""
+        process_pool: Optional[multiprocessing.pool.Pool] = None
+        profiler = get_profiler()
 
-        return sorted(set(matches))
+        def worker(lintable: Lintable) -> List[MatchError]:
+            # pylint: disable=protected-access
+            if profiler is None:
+                return AnsibleSyntaxCheckRule._get_ansible_syntax_check_matches(
+                    lintable, pool=process_pool
+                )
+            with profiler.measure(SYNTAX_CHECK, self.syntax_check_engine) as sample:
+                result = AnsibleSyntaxCheckRule._get_ansible_syntax_check_matches(
+                    lintable, pool=process_pool
+                )
+                sample.matches = len(result)
+            return result
+
+        # playbooks with an unchanged dependency closure reuse previous outcome
+        unchecked: List[Lintable] = []
+        for lintable in files:
+            cached = (
+                self.syntax_check_cache.get(lintable)
+                if self.syntax_check_cache
+                else None
+            )
+            if cached is None:
+                unchecked.append(lintable)
+            else:
+                _logger.debug("Reused cached syntax check results for %s", lintable)
+                yield cached
+
+        if not unchecked:
+            return
+        processes = multiprocessing.cpu_count()
+        if self.syntax_check_engine == "in-process":
+            process_pool = create_syntax_check_pool(
+                processes=min(processes, len(unchecked))
+            )
+        pool = multiprocessing.pool.ThreadPool(processes=processes)
+        try:
+            for lintable, data in zip(
+                unchecked, pool.imap(worker, unchecked, chunksize=1)
+            ):
+                if self.syntax_check_cache:
+                    self.syntax_check_cache.put(lintable, data)
+                yield data
+        finally:
+            pool.close()
+            pool.join()
+            if process_pool:
+                process_pool.close()
+                process_pool.join()
+
+    def _run_rules(self, lintables: List[Lintable]) -> Iterator[List[MatchError]]:
+        """Run the rules on lintables, replaying cached results when possible."""
+        pending: List[Lintable] = []
+        for file in lintables:
+            cached = self.cache.get(file) if self.cache else None
+            if cached is None:
+                pending.append(file)
+            else:
+                _logger.debug("Reused cached results for %s", file)
+                yield cached
+
+        pool = None
+        if self.jobs > 1 and len(pending) > 1:
+            pool = self._rules_pool(len(pending))
+        try:
+            results = pool.imap(pending) if pool else self._run_rules_serially(pending)
+            for file, result in zip(pending, results):
+                if self.cache:
+                    self.cache.put(file, result)
+                yield result
+        finally:
+            if pool:
+                pool.close()
+
+    def _run_rules_serially(
+        self, lintables: List[Lintable]
+    ) -> Iterator[List[MatchError]]:
+        for file in lintables:
+            yield self.rules.run(file, tags=set(self.tags), skip_list=self.skip_list)
+            # parsed content is no longer needed once all rules ran
+            file.release_artifacts()
+            get_parse_cache().release(file)
+
+    def _rules_pool(self, files: int) -> Optional[RulesPool]:
+        """Return worker processes running the rules, None if they cannot be used."""
+        pool = RulesPool(
+            min(self.jobs, files),
+            self.rules,
+            self.rules.options,
+            tags=list(self.tags),
+            skip_list=self.skip_list,
+        )
+        if not pool.is_consistent():
+            _logger.warning(
+                "Rules cannot be loaded by worker processes, running serially."
+            )
+            pool.close()
+            return None
+        return pool
 
     def _emit_matches(self, files: List[Lintable]) -> Generator[MatchError, None, None]:
         visited: Set[Lintable] = set()
@@ -173,7 +301,7 @@ class Runner:
             for lintable in self.lintables - visited:
                 try:
                     for child in ansiblelint.utils.find_children(lintable):
-                        if self.is_excluded(str(child.path)):
+                        if not self.lint_children or self.is_excluded(str(child.path)):
                             continue
                         self.lintables.add(child)
                         files.append(child)
@@ -186,15 +314,67 @@ class Runner:
                     yield MatchError(
                         filename=str(lintable.path), rule=LoadingFailureRule()
                     )
+                # do not keep parsed content of all files until rules run
+                lintable.release_artifacts()
                 visited.add(lintable)
 
 
-def _get_matches(rules: "RulesCollection", options: "Namespace") -> LintResult:
-
-    lintables = ansiblelint.utils.get_lintables(opts=options, args=options.lintables)
-
-    matches = []
-    checked_files: Set[Lintable] = set()
+def _get_matches(
+    rules: "RulesCollection",
+    options: "Namespace",
+    lintables: Optional[List[Lintable]] = None,
+) -> LintResult:
+    """Lint the files selected by options, or only the given lintables."""
+    result = LintResult(matches=[], files=set())
+    matches = [
+        match
+        for file_matches in _stream_matches(rules, options, result, lintables)
+        for match in file_matches
+    ]
+    # Assure we do not print duplicates and the order is consistent
+    result.matches = sorted(set(matches))
+    return result
+
+
+def _stream_matches(
+    rules: "RulesCollection",
+    options: "Namespace",
+    result: LintResult,
+    lintables: Optional[List[Lintable]] = None,
+) -> Iterator[List[MatchError]]:
+    """Lint like ``_get_matches``, yielding matches as soon as found.
+
+    Matches are not added to the result, which only gets the checked files and
+    cache statistics, once all matches were yielded.
+    """
+    # dependents of changed files are linted, not everything they include
+    lint_children = lintables is None and not options.changed_since
+    if lintables is None:
+        lintables = ansiblelint.utils.get_lintables(
+            opts=options, args=options.lintables
+        )
+        if options.changed_since:
+            lintables = get_changed_lintables(lintables, options.changed_since)
+
+    cache = None
+    syntax_check_cache = None
+    if options.use_cache and options.cache_dir:
+        syntax_check_cache = SyntaxCheckCache(
+            options.cache_dir,
+            options,
+            ansible_version=str(get_app(offline=True).runtime.version),
+            rule=AnsibleSyntaxCheckRule(),
+        )
+    # Transforms need the live task objects attached to matches, which are not
+    # preserved by the cache.
+    if options.use_cache and options.cache_dir and not options.write_list:
+        cache = ResultCache(
+            options.cache_dir,
+            rules,
+            options,
+            tags=options.tags,
+            skip_list=options.skip_list,
+        )
     runner = Runner(
         *lintables,
         rules=rules,
@@ -202,19 +382,54 @@ def _get_matches(rules: "RulesCollection", options: "Namespace") -> LintResult:
         skip_list=options.skip_list,
         exclude_paths=options.exclude_paths,
         verbosity=options.verbosity,
-        checked_files=checked_files
+        checked_files=result.files,
+        cache=cache,
+        syntax_check_cache=syntax_check_cache,
+        syntax_check_engine=options.syntax_check_engine,
+        # Transforms need the live task objects attached to matches, which
+        # workers cannot send back, neither can they report their timings.
+        jobs=1 if options.write_list or options.profile_rules else options.jobs,
+        parse_cache_size=options.parse_cache_size,
+        lint_children=lint_children,
     )
-    matches.extend(runner.run())
-
-    # Assure we do not print duplicates and the order is consistent
-    matches = sorted(set(matches))
 
     # Convert reported filenames into human readable ones, so we hide the
     # fact we used temporary files when processing input from stdin.
-    for match in matches:
-        for lintable in lintables:
-            if match.filename == lintable.filename:
-                match.filename = lintable.name
-                break
-
-    return LintResult(matches=matches, files=checked_files)
+    names = {
+        lintable.filename: lintable.name
+        for lintable in reversed(lintables)
+        if lintable.filename != lintable.name
+    }
+    for matches in runner.stream():
+        if names:
+            for match in matches:
+                match.filename = names.get(match.filename, match.filename)
+        yield matches
+
+    _report_cache_statistics(result, runner, cache, syntax_check_cache)
+
+
+def _report_cache_statistics(
+    result: LintResult,
+    runner: Runner,
+    cache: Optional[ResultCache],
+    syntax_check_cache: Optional[SyntaxCheckCache],
+) -> None:
+    """Log the statistics of the caches used by a run, recording result cache ones."""
+    if cache:
+        _logger.info("Result cache: %s hit(s), %s miss(es)", cache.hits, cache.misses)
+        result.cache_hits = cache.hits
+        result.cache_misses = cache.misses
+    if runner.parse_cache:
+        _logger.info(
+            "Parse cache: %s hit(s), %s miss(es), %s eviction(s)",
+            runner.parse_cache.hits,
+            runner.parse_cache.misses,
+            runner.parse_cache.evictions,
+        )
+    if syntax_check_cache:
+        _logger.info(
+            "Syntax check cache: %s hit(s), %s miss(es)",
+            syntax_check_cache.hits,
+            syntax_check_cache.misses,
+        )
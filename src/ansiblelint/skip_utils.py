@@ -20,9 +20,13 @@
 
 """Utils related to inline skipping of rules."""
 import logging
-from functools import lru_cache
+import math
+import re
+from bisect import bisect_left, bisect_right
 from itertools import product
-from typing import TYPE_CHECKING, Any, Dict, Generator, List, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Dict, Generator, List, Optional, Sequence, Tuple
+
+import yaml
 
 # Module 'ruamel.yaml' does not explicitly export attribute 'YAML'; implicit reexport disabled
 from ruamel.yaml import YAML
@@ -30,12 +34,25 @@ from ruamel.yaml import YAML
 from ansiblelint.config import used_old_tags
 from ansiblelint.constants import NESTED_TASK_KEYS, PLAYBOOK_TASK_KEYWORDS, RENAMED_TAGS
 from ansiblelint.file_utils import Lintable
+from ansiblelint.parse_cache import get_parse_cache
 
 if TYPE_CHECKING:
     from ansible.parsing.yaml.objects import AnsibleBaseYAMLObject
 
 _logger = logging.getLogger(__name__)
 
+# ansiblelint.utils.LINE_NUMBER_KEY, not imported as that module imports this one
+_LINE_NUMBER_KEY = "__line__"
+_NOQA = "# noqa"
+_SafeLoader: Any = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_MAPPING_STARTS = (yaml.BlockMappingStartToken, yaml.FlowMappingStartToken)
+_SEQUENCE_STARTS = (yaml.BlockSequenceStartToken, yaml.FlowSequenceStartToken)
+_COLLECTION_ENDS = (
+    yaml.BlockEndToken,
+    yaml.FlowMappingEndToken,
+    yaml.FlowSequenceEndToken,
+)
+
 
 # playbook: Sequence currently expects only instances of one of the two
 # classes below but we should consider avoiding this chimera.
@@ -45,7 +62,7 @@ _logger = logging.getLogger(__name__)
 
 def get_rule_skips_from_line(line: str) -> List[str]:
     """Return list of rule ids skipped via comment on the line of yaml."""
-    _before_noqa, _noqa_marker, noqa_text = line.partition("# noqa")
+    _before_noqa, _noqa_marker, noqa_text = line.partition(_NOQA)
     result = []
     for v in noqa_text.lstrip(" :").split():
         if v in RENAMED_TAGS:
@@ -60,85 +77,204 @@ def get_rule_skips_from_line(line: str) -> List[str]:
     return result
 
 
+class SkipIndex:
+    """Rule ids skipped by the noqa comments of a file, looked up by lines.
+
+    Line numbers start with 1, like the ones of parsed data. ``ends`` maps the
+    first line of each mapping to its last line, trailing comments included.
+    """
+
+    def __init__(
+        self,
+        skips: Optional[Dict[int, List[str]]] = None,
+        ends: Optional[Dict[int, int]] = None,
+    ) -> None:
+        """Create an index from the skipped rule ids of lines."""
+        self.skips = skips or {}
+        self.ends = ends or {}
+        self._lines = sorted(self.skips)
+
+    def __bool__(self) -> bool:
+        """Tell if any rule is skipped."""
+        return bool(self.skips)
+
+    def rules(self, first: int = 1, last: float = math.inf) -> List[str]:
+        """Return rule ids skipped between two lines, both included."""
+        if not self.skips:
+            return []
+        lines = self._lines
+        result = []
+        for line in lines[bisect_left(lines, first) : bisect_right(lines, last)]:
+            result.extend(self.skips[line])
+        return result
+
+    def mapping_rules(self, line: int) -> List[str]:
+        """Return rule ids skipped inside the mapping starting at a line."""
+        return self.rules(line, self.ends.get(line, line))
+
+
+def build_skip_index(text: str) -> SkipIndex:
+    """Return the index of rules skipped by noqa comments, from a single scan.
+
+    Only lines mentioning noqa are looked at, and the file is tokenized only
+    when there are some. A ``#`` starts a comment when it is not part of a
+    token, so markers found inside strings are ignored.
+    """
+    lines = text.splitlines()
+    candidates = [number for number, line in enumerate(lines) if _NOQA in line]
+    if not candidates:
+        return SkipIndex()
+    try:
+        covered, ends = _scan_tokens(text, lines, candidates)
+    except yaml.YAMLError:
+        # unparsable files are reported by other means, any marker is taken
+        covered, ends = {line: [] for line in candidates}, {}
+
+    skips = {}
+    for line in candidates:
+        line_text = lines[line]
+        column = _comment_column(line_text, covered[line])
+        if column is None:
+            continue
+        rule_ids = [
+            normalize_tag(tag) for tag in get_rule_skips_from_line(line_text[column:])
+        ]
+        if rule_ids:
+            skips[line + 1] = rule_ids
+    return SkipIndex(skips, ends)
+
+
+def _scan_tokens(
+    text: str, lines: List[str], candidates: List[int]
+) -> Tuple[Dict[int, List[Tuple[int, float]]], Dict[int, int]]:
+    """Return the columns covered by tokens on candidate lines and mapping ends."""
+    covered: Dict[int, List[Tuple[int, float]]] = {line: [] for line in candidates}
+    ends: Dict[int, int] = {}
+    # first lines of the open collections, 0 for sequences
+    stack: List[int] = []
+    for token in yaml.scan(text, Loader=_SafeLoader):
+        start, end = token.start_mark, token.end_mark
+        if start.line == end.line:
+            if start.line in covered and start.column < end.column:
+                covered[start.line].append((start.column, end.column))
+        else:
+            first = bisect_left(candidates, start.line)
+            for line in candidates[first : bisect_right(candidates, end.line)]:
+                covered[line].append(
+                    (
+                        start.column if line == start.line else 0,
+                        end.column if line == end.line else math.inf,
+                    )
+                )
+        if isinstance(token, _MAPPING_STARTS):
+            stack.append(start.line + 1)
+        elif isinstance(token, _SEQUENCE_STARTS):
+            stack.append(0)
+        elif stack and isinstance(token, _COLLECTION_ENDS):
+            first_line = stack.pop()
+            if first_line:
+                ends[first_line] = max(
+                    ends.get(first_line, first_line), _last_line(token, lines)
+                )
+    return covered, ends
+
+
+def _comment_column(line_text: str, covered: List[Tuple[int, float]]) -> Optional[int]:
+    """Return the column where the comment of a line starts, if any."""
+    for found in re.finditer("#", line_text):
+        column = found.start()
+        if column and line_text[column - 1] not in " \t":
+            continue
+        if not any(begin <= column < end for begin, end in covered):
+            return column
+    return None
+
+
+def _last_line(token: Any, lines: List[str]) -> int:
+    """Return the last line, from 1, of a collection closed by a token."""
+    mark = token.start_mark
+    if isinstance(token, yaml.BlockEndToken):
+        # block ends are placed on the next token, which starts its line
+        if mark.line >= len(lines) or not lines[mark.line][: mark.column].strip():
+            return int(mark.line)
+    return int(mark.line) + 1
+
+
+def get_skip_index(lintable: Lintable) -> SkipIndex:
+    """Return the index of rules skipped by the noqa comments of a lintable."""
+    return lintable.get_artifact(
+        "skip-index",
+        lambda item: get_parse_cache().get(
+            "skip-index", item, lambda item: build_skip_index(item.content)
+        ),
+    )
+
+
 def append_skipped_rules(
     pyyaml_data: "AnsibleBaseYAMLObject", lintable: Lintable
 ) -> "AnsibleBaseYAMLObject":
     """Append 'skipped_rules' to individual tasks or single metadata block.
 
-    For a file, uses 2nd parser (ruamel.yaml) to pull comments out of
-    yaml subsets, check for '# noqa' skipped rules, and append any skips to the
-    original parser (pyyaml) data relied on by remainder of ansible-lint.
+    For a file, uses the index of its '# noqa' comments to find the rules
+    skipped within the lines of each task, and appends them to the parsed
+    data relied on by remainder of ansible-lint.
 
-    :param pyyaml_data: file text parsed via ansible and pyyaml.
-    :param file_text: raw file text.
-    :param file_type: type of file: tasks, handlers or meta.
+    :param pyyaml_data: file text parsed via ansible and pyyaml, with line
+                        numbers.
+    :param lintable: the file parsed.
     :returns: original pyyaml_data altered with a 'skipped_rules' list added \
               to individual tasks, or added to the single metadata block.
     """
-    try:
-        yaml_skip = _append_skipped_rules(pyyaml_data, lintable)
-    except RuntimeError:
-        # Notify user of skip error, do not stop, do not change exit code
-        _logger.error("Error trying to append skipped rules", exc_info=True)
-        return pyyaml_data
-
+    yaml_skip = _append_skipped_rules(pyyaml_data, lintable)
     if not yaml_skip:
         return pyyaml_data
 
     return yaml_skip
 
 
-@lru_cache(maxsize=128)
 def load_data(file_text: str) -> Any:
     """Parse ``file_text`` as yaml and return parsed structure.
 
-    This is the main culprit for slow performance, each rule asks for loading yaml again and again
-    ideally the ``maxsize`` on the decorator above MUST be great or equal total number of rules
+    This is slow, do not use it only for looking at comments.
     :param file_text: raw text to parse
     :return: Parsed yaml
     """
-    yaml = YAML()
-    return yaml.load(file_text)
+    yaml_loader = YAML()
+    return yaml_loader.load(file_text)
 
 
 def _append_skipped_rules(
     pyyaml_data: "AnsibleBaseYAMLObject", lintable: Lintable
 ) -> Optional["AnsibleBaseYAMLObject"]:
-    # parse file text using 2nd parser library
-    ruamel_data = load_data(lintable.content)
+    skip_index = get_skip_index(lintable)
 
     if lintable.kind in ["yaml", "requirements", "vars", "meta", "reno", "test-meta"]:
-        pyyaml_data[0]["skipped_rules"] = _get_rule_skips_from_yaml(ruamel_data)
+        pyyaml_data[0]["skipped_rules"] = skip_index.rules()
         return pyyaml_data
 
     # create list of blocks of tasks or nested tasks
     if lintable.kind in ("tasks", "handlers"):
-        ruamel_task_blocks = ruamel_data
         pyyaml_task_blocks = pyyaml_data
     elif lintable.kind == "playbook":
         try:
             pyyaml_task_blocks = _get_task_blocks_from_playbook(pyyaml_data)
-            ruamel_task_blocks = _get_task_blocks_from_playbook(ruamel_data)
         except (AttributeError, TypeError):
             return pyyaml_data
     else:
         # For unsupported file types, we return empty skip lists
         return None
 
-    # get tasks from blocks of tasks
-    pyyaml_tasks = _get_tasks_from_blocks(pyyaml_task_blocks)
-    ruamel_tasks = _get_tasks_from_blocks(ruamel_task_blocks)
-
-    # append skipped_rules for each task
-    for ruamel_task, pyyaml_task in zip(ruamel_tasks, pyyaml_tasks):
+    # append skipped_rules for each task, from the lines it spans
+    for pyyaml_task in _get_tasks_from_blocks(pyyaml_task_blocks):
 
         # ignore empty tasks
-        if not pyyaml_task and not ruamel_task:
+        if not pyyaml_task or not isinstance(pyyaml_task, dict):
             continue
 
-        if pyyaml_task.get("name") != ruamel_task.get("name"):
-            raise RuntimeError("Error in matching skip comment to a task")
-        pyyaml_task["skipped_rules"] = _get_rule_skips_from_yaml(ruamel_task)
+        line = pyyaml_task.get(_LINE_NUMBER_KEY)
+        pyyaml_task["skipped_rules"] = (
+            skip_index.mapping_rules(line) if line is not None else []
+        )
 
     return pyyaml_data
 
@@ -173,33 +309,6 @@ def _get_tasks_from_blocks(task_blocks: Sequence[Any]) -> Generator[Any, None, N
         yield task
 
 
-def _get_rule_skips_from_yaml(yaml_input: Sequence[Any]) -> Sequence[Any]:
-    """Traverse yaml for comments with rule skips and return list of rules."""
-    yaml_comment_obj_strings = []
-
-    def traverse_yaml(obj: Any) -> None:
-        yaml_comment_obj_strings.append(str(obj.ca.items))
-        if isinstance(obj, dict):
-            for _, val in obj.items():
-                if isinstance(val, (dict, list)):
-                    traverse_yaml(val)
-        elif isinstance(obj, list):
-            for element in obj:
-                if isinstance(element, (dict, list)):
-                    traverse_yaml(element)
-        else:
-            return
-
-    traverse_yaml(yaml_input)
-
-    rule_id_list = []
-    for comment_obj_str in yaml_comment_obj_strings:
-        for line in comment_obj_str.split(r"\n"):
-            rule_id_list.extend(get_rule_skips_from_line(line))
-
-    return [normalize_tag(tag) for tag in rule_id_list]
-
-
 def normalize_tag(tag: str) -> str:
     """Return current name of tag."""
     if tag in RENAMED_TAGS:
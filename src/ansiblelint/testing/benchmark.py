@@ -0,0 +1,319 @@
+"""Offline benchmarks of the linter over synthetic Ansible projects.
+
+Projects are generated with a given number of playbooks, roles and depth of
+include chains, so results are reproducible without network access. Each
+phase of linting is timed separately and results are written as JSON, to be
+compared between versions::
+
+    python -m ansiblelint.testing.benchmark --output benchmark.json
+"""
+import argparse
+import copy
+import json
+import platform
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import ansiblelint.config
+from ansiblelint.constants import DEFAULT_RULESDIR
+from ansiblelint.file_utils import Lintable, cwd
+from ansiblelint.parse_cache import parse_cache_scope
+from ansiblelint.rules import RulesCollection
+from ansiblelint.rules.syntax_check import AnsibleSyntaxCheckRule
+from ansiblelint.runner import LintResult, Runner
+from ansiblelint.transformer import Transformer
+from ansiblelint.utils import get_lintables
+from ansiblelint.version import __version__
+
+PLAYBOOK = """\
+---
+- name: Play {index}
+  hosts: all
+  vars_files:
+    - vars/play_{index}.yml
+  roles:
+    - role_{role}
+  tasks:
+    - name: Include chain {index}
+      ansible.builtin.include_tasks: tasks/chain_{index}_0.yml
+    - name: Run a command
+      command: echo {{{{ greeting_{index} }}}}
+    - shell: cat /etc/hosts | grep localhost
+"""
+
+PLAY_VARS = """\
+---
+greeting_{index}: hello
+values_{index}:
+  - one
+  - two
+  - three
+"""
+
+CHAIN_TASKS = """\
+---
+- name: Step {depth} of chain {index}
+  ansible.builtin.debug:
+    msg: "{{{{ item }}}}"
+  loop: "{{{{ values_{index} }}}}"
+- name: Copy a file
+  ansible.builtin.copy:
+    src: step_{depth}.txt
+    dest: /tmp/step_{depth}.txt
+    mode: 0644
+"""
+
+CHAIN_INCLUDE = """\
+- name: Include next step
+  ansible.builtin.include_tasks: tasks/chain_{index}_{depth}.yml
+"""
+
+ROLE_TASKS = """\
+---
+- name: Install packages of role {role}
+  ansible.builtin.package:
+    name: "{{{{ role_{role}_packages }}}}"
+    state: latest
+- name: Include setup
+  ansible.builtin.include_tasks: setup.yml
+"""
+
+ROLE_SETUP = """\
+---
+- name: Render configuration
+  template:
+    src: config.j2
+    dest: /etc/role_{role}.conf
+  notify: Restart role {role}
+- command: systemctl daemon-reload
+"""
+
+ROLE_HANDLERS = """\
+---
+- name: Restart role {role}
+  ansible.builtin.service:
+    name: role_{role}
+    state: restarted
+"""
+
+ROLE_DEFAULTS = """\
+---
+role_{role}_packages:
+  - curl
+  - git
+"""
+
+ROLE_META = """\
+---
+galaxy_info:
+  author: benchmark
+  description: Synthetic role {role}
+  license: MIT
+  min_ansible_version: "2.12"
+  platforms:
+    - name: Fedora
+      versions:
+        - all
+dependencies: []
+"""
+
+GROUP_VARS = """\
+---
+benchmark: true
+"""
+
+
+def generate_project(
+    path: Path, playbooks: int = 20, roles: int = 10, depth: int = 5
+) -> None:
+    """Write a synthetic project with playbooks, roles and include chains.
+
+    Each playbook uses a role, a vars file and a chain of ``depth`` task files
+    including each other. Some tasks violate rules on purpose.
+    """
+    files: Dict[str, str] = {"group_vars/all.yml": GROUP_VARS}
+    for role in range(roles):
+        prefix = f"roles/role_{role}"
+        files[f"{prefix}/tasks/main.yml"] = ROLE_TASKS.format(role=role)
+        files[f"{prefix}/tasks/setup.yml"] = ROLE_SETUP.format(role=role)
+        files[f"{prefix}/handlers/main.yml"] = ROLE_HANDLERS.format(role=role)
+        files[f"{prefix}/defaults/main.yml"] = ROLE_DEFAULTS.format(role=role)
+        files[f"{prefix}/meta/main.yml"] = ROLE_META.format(role=role)
+        files[f"{prefix}/templates/config.j2"] = "role = {{ role_name }}\n"
+    for index in range(playbooks):
+        files[f"playbook_{index}.yml"] = PLAYBOOK.format(
+            index=index, role=index % max(roles, 1)
+        )
+        files[f"vars/play_{index}.yml"] = PLAY_VARS.format(index=index)
+        for step in range(depth):
+            text = CHAIN_TASKS.format(index=index, depth=step)
+            if step + 1 < depth:
+                text += CHAIN_INCLUDE.format(index=index, depth=step + 1)
+            files[f"tasks/chain_{index}_{step}.yml"] = text
+    for name, text in files.items():
+        file = path / name
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(text, encoding="utf-8")
+
+
+def _max_rss_kb(who: int = resource.RUSAGE_SELF) -> int:
+    """Return the peak resident set size, in KiB."""
+    max_rss = resource.getrusage(who).ru_maxrss
+    # macOS reports bytes, Linux kilobytes
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+
+def _fresh(lintables: List[Lintable]) -> List[Lintable]:
+    """Return copies of lintables not holding any loaded content."""
+    return [Lintable(lintable.name, kind=lintable.kind) for lintable in lintables]
+
+
+def _copy_options(options: argparse.Namespace) -> argparse.Namespace:
+    """Return a deep copy of options, sharing the lock of the cache directory."""
+    return argparse.Namespace(
+        **{
+            key: value if key == "cache_dir_lock" else copy.deepcopy(value)
+            for key, value in vars(options).items()
+        }
+    )
+
+
+class Benchmark:  # pylint: disable=too-few-public-methods
+    """Times the phases of linting a project."""
+
+    def __init__(self, path: Path, options: Optional[argparse.Namespace] = None):
+        """Prepare benchmarking of the project found at path."""
+        self.path = path
+        self.options = _copy_options(options or ansiblelint.config.options)
+        self.options.cwd = str(path)
+        self.options.lintables = []
+        self.rules = RulesCollection([DEFAULT_RULESDIR], options=self.options)
+        self.lintables: List[Lintable] = []
+        self.result: Optional[LintResult] = None
+
+    def _discovery(self) -> Tuple[int, int]:
+        self.lintables = get_lintables(opts=self.options, args=[])
+        return len(self.lintables), 0
+
+    def _syntax_check(self) -> Tuple[int, int]:
+        playbooks = [
+            lintable
+            for lintable in _fresh(self.lintables)
+            if lintable.kind == "playbook"
+        ]
+        matches = 0
+        for lintable in playbooks:
+            # pylint: disable=protected-access
+            matches += len(
+                AnsibleSyntaxCheckRule._get_ansible_syntax_check_matches(lintable)
+            )
+        return len(playbooks), matches
+
+    def _rules(self) -> Tuple[int, int]:
+        files = [
+            lintable
+            for lintable in _fresh(self.lintables)
+            if lintable.kind and not lintable.path.is_dir()
+        ]
+        matches = 0
+        with parse_cache_scope(self.options.parse_cache_size):
+            for lintable in files:
+                matches += len(self.rules.run(lintable))
+                lintable.release_artifacts()
+        return len(files), matches
+
+    def _runner(self) -> Tuple[int, int]:
+        checked_files: Set[Lintable] = set()
+        runner = Runner(
+            *_fresh(self.lintables),
+            rules=self.rules,
+            checked_files=checked_files,
+            parse_cache_size=self.options.parse_cache_size,
+        )
+        matches = runner.run()
+        self.result = LintResult(matches=matches, files=checked_files)
+        return len(checked_files), len(matches)
+
+    def _transformer(self) -> Tuple[int, int]:
+        if self.result is None:
+            self._runner()
+        assert self.result is not None
+        options = _copy_options(self.options)
+        options.write_list = ["all"]
+        Transformer(result=self.result, options=options).run()
+        return len(self.result.files), len(self.result.matches)
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """Run all phases, in order, returning their measurements.
+
+        ``max_rss_kb`` is the peak memory used by the process since it
+        started, it includes the children processes for the syntax check.
+        The transformer rewrites the files of the project.
+        """
+        phases: Sequence[Tuple[str, Callable[[], Tuple[int, int]]]] = (
+            ("discovery", self._discovery),
+            ("syntax_check", self._syntax_check),
+            ("rules_collection", self._rules),
+            ("runner", self._runner),
+            ("transformer", self._transformer),
+        )
+        results: Dict[str, Dict[str, Any]] = {}
+        with cwd(str(self.path)):
+            for name, phase in phases:
+                start = time.perf_counter()
+                files, matches = phase()
+                seconds = time.perf_counter() - start
+                max_rss = _max_rss_kb()
+                if name == "syntax_check":
+                    max_rss = max(max_rss, _max_rss_kb(resource.RUSAGE_CHILDREN))
+                results[name] = {
+                    "seconds": seconds,
+                    "files": files,
+                    "files_per_second": files / seconds if seconds else 0.0,
+                    "matches": matches,
+                    "max_rss_kb": max_rss,
+                }
+        return results
+
+
+def run_benchmark(
+    path: Path, playbooks: int = 20, roles: int = 10, depth: int = 5
+) -> Dict[str, Any]:
+    """Generate a project inside path, which must be empty, and benchmark it."""
+    generate_project(path, playbooks=playbooks, roles=roles, depth=depth)
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "project": {"playbooks": playbooks, "roles": roles, "depth": depth},
+        "phases": Benchmark(path).run(),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--playbooks", type=int, default=20)
+    parser.add_argument("--roles", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=5, help="include chain depth")
+    parser.add_argument(
+        "-o", "--output", help="file receiving JSON results, stdout by default"
+    )
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="ansible-lint-benchmark-") as tmp:
+        results = run_benchmark(
+            Path(tmp), playbooks=args.playbooks, roles=args.roles, depth=args.depth
+        )
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
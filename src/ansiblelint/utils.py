@@ -19,8 +19,9 @@
 # THE SOFTWARE.
 # spell-checker:ignore dwim
 """Generic utility helpers."""
-
+# pylint: disable=too-many-lines
 import contextlib
+import copy
 import inspect
 import logging
 import os
@@ -28,7 +29,6 @@ import re
 import warnings
 from argparse import Namespace
 from collections.abc import ItemsView, Mapping
-from functools import lru_cache
 from pathlib import Path
 from typing import (
     Any,
@@ -66,7 +66,13 @@ from ansiblelint.app import get_app
 from ansiblelint.config import options
 from ansiblelint.constants import NESTED_TASK_KEYS, PLAYBOOK_TASK_KEYWORDS, FileType
 from ansiblelint.errors import MatchError
-from ansiblelint.file_utils import Lintable, discover_lintables
+from ansiblelint.file_utils import (
+    Lintable,
+    discover_lintables,
+    get_exclude_matcher,
+    resolve_path,
+)
+from ansiblelint.parse_cache import get_parse_cache
 from ansiblelint.skip_utils import is_nested_task
 from ansiblelint.text import removeprefix
 
@@ -90,6 +96,13 @@ def parse_yaml_from_file(filepath: str) -> AnsibleBaseYAMLObject:
     return dataloader.load_from_file(filepath)
 
 
+def parse_yaml_from_lintable(lintable: Lintable) -> AnsibleBaseYAMLObject:
+    """Extract a decrypted YAML object from a lintable, loading it only once."""
+    return lintable.get_artifact(
+        "ansible", lambda item: parse_yaml_from_file(str(item.path))
+    )
+
+
 def path_dwim(basedir: str, given: str) -> str:
     """Convert a given path do-what-I-mean style."""
     dataloader = DataLoader()
@@ -618,6 +631,84 @@ def normalize_task(task: Dict[str, Any], filename: str) -> Dict[str, Any]:
     return task
 
 
+class ReadOnlyTask(Dict[str, Any]):
+    """Normalized task that cannot be modified.
+
+    Normalized tasks are shared by all rules, so changing one would affect
+    rules running later. Nested mappings and lists are read-only too. Copies,
+    made with ``dict(task)`` or ``copy``, are regular mutable dictionaries,
+    only ``deepcopy`` makes nested values mutable as well.
+    """
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError(f"{self.__class__.__name__} does not support assignment")
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only  # type: ignore
+    __ior__ = _read_only  # type: ignore
+
+    def copy(self) -> Dict[str, Any]:
+        """Return a mutable shallow copy."""
+        return dict(self)
+
+    def __copy__(self) -> Dict[str, Any]:
+        """Return a mutable shallow copy."""
+        return dict(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        """Return a mutable deep copy."""
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle as a regular dictionary."""
+        return (dict, (dict(self),))
+
+
+class ReadOnlyList(List[Any]):
+    """List found inside a normalized task, that cannot be modified.
+
+    It stays a list, so rules checking for lists keep working.
+    """
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError(f"{self.__class__.__name__} does not support assignment")
+
+    __setitem__ = __delitem__ = _read_only  # type: ignore
+    __iadd__ = __imul__ = _read_only  # type: ignore
+    append = clear = extend = insert = pop = remove = _read_only  # type: ignore
+    reverse = sort = _read_only  # type: ignore
+
+    def copy(self) -> List[Any]:
+        """Return a mutable shallow copy."""
+        return list(self)
+
+    def __copy__(self) -> List[Any]:
+        """Return a mutable shallow copy."""
+        return list(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> List[Any]:
+        """Return a mutable deep copy."""
+        return copy.deepcopy(list(self), memo)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle as a regular list."""
+        return (list, (list(self),))
+
+
+def _freeze(value: Any) -> Any:
+    """Return a read-only version of a value found inside a task."""
+    if isinstance(value, Mapping):
+        return freeze_task(value)
+    if isinstance(value, list):
+        return ReadOnlyList(_freeze(item) for item in value)
+    return value
+
+
+def freeze_task(task: Mapping[str, Any]) -> ReadOnlyTask:
+    """Return a read-only copy of a normalized task, including nested values."""
+    return ReadOnlyTask((key, _freeze(value)) for key, value in task.items())
+
+
 def task_to_str(task: Dict[str, Any]) -> str:
     """Make a string identifier for the given task."""
     name = task.get("name")
@@ -709,13 +800,21 @@ def get_action_tasks(data: AnsibleBaseYAMLObject, file: Lintable) -> List[Any]:
     ]
 
 
-@lru_cache(maxsize=128)
 def parse_yaml_linenumbers(lintable: Lintable) -> AnsibleBaseYAMLObject:
     """Parse yaml as ansible.utils.parse_yaml but with linenumbers.
 
-    The line numbers are stored in each node's LINE_NUMBER_KEY key.
+    The line numbers are stored in each node's LINE_NUMBER_KEY key. The result
+    is kept by the lintable, so the file is parsed only once for all rules.
     """
+    return lintable.get_artifact(
+        "ansible-linenumbers",
+        lambda item: get_parse_cache().get(
+            "ansible-linenumbers", item, _parse_yaml_linenumbers
+        ),
+    )
 
+
+def _parse_yaml_linenumbers(lintable: Lintable) -> AnsibleBaseYAMLObject:
     def compose_node(parent: yaml.nodes.Node, index: int) -> yaml.nodes.Node:
         # the line number where the previous token has ended (plus empty lines)
         line = loader.line
@@ -838,18 +937,15 @@ def get_lintables(
             lintables.append(lintable)
     else:
 
+        exclude_matcher = get_exclude_matcher(opts.exclude_paths)
         for filename in discover_lintables(opts):
 
             path = Path(filename)
-            # skip exclusions
-            try:
-                for file_path in opts.exclude_paths:
-                    if str(path.resolve()).startswith(str(file_path)):
-                        raise FileNotFoundError(
-                            f"File {file_path} matched exclusion entry: {path}"
-                        )
-            except FileNotFoundError as exc:
-                _logger.debug("Ignored %s due to: %s", path, exc)
+            # skip exclusions, the same way the runner does
+            if exclude_matcher and exclude_matcher.is_excluded(
+                resolve_path(os.path.join(os.getcwd(), filename))
+            ):
+                _logger.debug("Ignored %s matching an exclusion entry", path)
                 continue
 
             lintables.append(Lintable(path))
@@ -861,19 +957,32 @@ def get_lintables(
     return lintables
 
 
+def _role_path(path: Path) -> Optional[Path]:
+    """Return the role a path is part of, the child of its innermost roles parent."""
+    parts = path.parts
+    for index in range(len(parts) - 2, -1, -1):
+        if parts[index] == "roles":
+            return Path(*parts[: index + 2])
+    return None
+
+
 def _extend_with_roles(lintables: List[Lintable]) -> None:
     """Detect roles among lintables and adds them to the list."""
+    known = {(lintable.name, lintable.kind) for lintable in lintables}
+    # each role is checked once, in the order files were found
+    roles: Dict[str, Path] = {}
     for lintable in lintables:
-        parts = lintable.path.parent.parts
-        if "roles" in parts:
-            role = lintable.path
-            while role.parent.name != "roles" and role.name:
-                role = role.parent
-            if role.exists and not role.is_file():
-                lintable = Lintable(role, kind="role")
-                if lintable not in lintables:
-                    _logger.debug("Added role: %s", lintable)
-                    lintables.append(lintable)
+        role = _role_path(lintable.path)
+        if role is not None:
+            roles.setdefault(str(role), role)
+    for role in roles.values():
+        if role.is_file():
+            continue
+        lintable = Lintable(role, kind="role")
+        if (lintable.name, lintable.kind) not in known:
+            _logger.debug("Added role: %s", lintable)
+            known.add((lintable.name, lintable.kind))
+            lintables.append(lintable)
 
 
 def convert_to_boolean(value: Any) -> bool:
@@ -38,7 +38,15 @@ import ansiblelint.skip_utils
 from ansiblelint.constants import NESTED_TASK_KEYS, PLAYBOOK_TASK_KEYWORDS
 from ansiblelint.errors import MatchError
 from ansiblelint.file_utils import Lintable
-from ansiblelint.utils import get_action_tasks, normalize_task, parse_yaml_linenumbers
+from ansiblelint.profiling import NORMALIZE, get_profiler
+from ansiblelint.utils import (
+    LINE_NUMBER_KEY,
+    ReadOnlyTask,
+    freeze_task,
+    get_action_tasks,
+    normalize_task,
+    parse_yaml_linenumbers,
+)
 
 if TYPE_CHECKING:
     # noinspection PyProtectedMember
@@ -107,9 +115,10 @@ def iter_tasks_in_file(
         processed to include these special keys: __line__, __file__, skipped_rules.
     normalized_task:
         When each raw_task is "normalized", action shorthand (strings) get parsed
-        by ansible into python objects and the action key gets normalized. If the task
-        should be skipped (skipped is True) or normalizing it fails (error is not None)
-        then this is just the raw_task instead of a normalized copy.
+        by ansible into python objects and the action key gets normalized. If
+        normalizing it fails (error is not None) then this is just the raw_task
+        instead of a normalized copy. Normalized tasks are read-only, as they
+        are computed once per file and task line and shared by all rules.
     skip_tags:
         List of tags found to be skipped, from tags block or noqa comments
     error:
@@ -127,17 +136,36 @@ def iter_tasks_in_file(
     data = ansiblelint.skip_utils.append_skipped_rules(data, lintable)
 
     raw_tasks = get_action_tasks(data, lintable)
-
-    for raw_task in raw_tasks:
+    # Normalizing is expensive, so it is done once per task line of a file.
+    # The index disambiguates tasks sharing a line, like in flow sequences.
+    normalized_tasks: Dict[
+        Tuple[int, int], Union[ReadOnlyTask, MatchError]
+    ] = lintable.get_artifact("normalized-tasks", lambda _: {})
+    profiler = get_profiler()
+
+    for index, raw_task in enumerate(raw_tasks):
         err: Optional[MatchError] = None
 
         skip_tags: List[str] = raw_task.get("skipped_rules", [])
 
-        try:
-            normalized_task = normalize_task(raw_task, str(lintable.path))
-        except MatchError as err:
-            # normalize_task converts AnsibleParserError to MatchError
-            yield raw_task, raw_task, skip_tags, err
+        key = (raw_task[LINE_NUMBER_KEY], index)
+        if key in normalized_tasks:
+            # normalize_task removes it from the raw task
+            raw_task.pop("__ansible_action_type__", None)
+        else:
+            try:
+                if profiler is None:
+                    normalized = normalize_task(raw_task, str(lintable.path))
+                else:
+                    with profiler.measure(NORMALIZE, "normalize_task"):
+                        normalized = normalize_task(raw_task, str(lintable.path))
+                normalized_tasks[key] = freeze_task(normalized)
+            except MatchError as exc:
+                # normalize_task converts AnsibleParserError to MatchError
+                normalized_tasks[key] = exc
+        normalized_task = normalized_tasks[key]
+        if isinstance(normalized_task, MatchError):
+            yield raw_task, raw_task, skip_tags, normalized_task
             return
 
         if "skip_ansible_lint" in (raw_task.get("tags") or []):
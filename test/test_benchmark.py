@@ -0,0 +1,42 @@
+"""Tests for the offline benchmarks."""
+import json
+from argparse import Namespace
+from pathlib import Path
+
+from filelock import FileLock
+
+import ansiblelint.config
+from ansiblelint.testing.benchmark import Benchmark, main
+
+
+def test_benchmark(tmp_path: Path) -> None:
+    """Check that all phases are measured on a small synthetic project."""
+    output = tmp_path / "benchmark.json"
+    assert (
+        main(["--playbooks", "2", "--roles", "1", "--depth", "2", "-o", str(output)])
+        == 0
+    )
+    results = json.loads(output.read_text(encoding="utf-8"))
+    assert results["project"] == {"playbooks": 2, "roles": 1, "depth": 2}
+    phases = results["phases"]
+    assert list(phases) == [
+        "discovery",
+        "syntax_check",
+        "rules_collection",
+        "runner",
+        "transformer",
+    ]
+    assert phases["syntax_check"]["files"] == 2
+    assert phases["runner"]["matches"] == phases["rules_collection"]["matches"] > 0
+    assert all(phase["max_rss_kb"] > 0 for phase in phases.values())
+
+
+def test_benchmark_locked_options(tmp_path: Path) -> None:
+    """Check that options holding the lock of the cache directory are copied."""
+    options = Namespace(**vars(ansiblelint.config.options))
+    options.cache_dir_lock = FileLock(str(tmp_path / ".lock"))
+    with options.cache_dir_lock:
+        benchmark = Benchmark(tmp_path, options)
+    assert benchmark.options.cache_dir_lock is options.cache_dir_lock
+    assert benchmark.options.cwd == str(tmp_path)
+    assert benchmark.options.exclude_paths is not options.exclude_paths
@@ -0,0 +1,215 @@
+"""Tests for the on-disk caches."""
+import copy
+import os
+import shutil
+from argparse import Namespace
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from yamllint.config import YamlLintConfig
+
+import ansiblelint.cache
+import ansiblelint.rules
+from ansiblelint.cache import (
+    BaselineCache,
+    ResultCache,
+    RulesManifestCache,
+    SyntaxCheckCache,
+    dependency_closure,
+    match_fingerprint,
+)
+from ansiblelint.config import ansible_collections_path
+from ansiblelint.file_utils import Lintable
+from ansiblelint.rules import RulesCollection
+from ansiblelint.rules.syntax_check import AnsibleSyntaxCheckRule
+from ansiblelint.runner import Runner
+
+PLAYBOOK = "examples/playbooks/lots_of_warnings.yml"
+
+
+def test_result_cache_replay(
+    default_rules_collection: RulesCollection,
+    config_options: Namespace,
+    tmp_path: Path,
+) -> None:
+    """Check that cached results are replayed for unchanged files."""
+    cache = ResultCache(str(tmp_path), default_rules_collection, config_options)
+    first = Runner(PLAYBOOK, rules=default_rules_collection, cache=cache).run()
+    assert cache.hits == 0
+    assert cache.misses > 0
+
+    cache = ResultCache(str(tmp_path), default_rules_collection, config_options)
+    second = Runner(PLAYBOOK, rules=default_rules_collection, cache=cache).run()
+    assert cache.misses == 0
+    assert cache.hits > 0
+
+    assert first == second
+    assert [m.rule.id for m in first] == [m.rule.id for m in second]
+    assert [m.tag for m in first] == [m.tag for m in second]
+
+
+def test_result_cache_key(
+    default_rules_collection: RulesCollection,
+    config_options: Namespace,
+    tmp_path: Path,
+) -> None:
+    """Check that changes of content or configuration invalidate the cache."""
+    lintable = Lintable("playbook.yml", content="- hosts: all\n", kind="playbook")
+    cache = ResultCache(str(tmp_path), default_rules_collection, config_options)
+    cache.put(lintable, [])
+    assert cache.get(lintable) == []
+
+    changed = Lintable("playbook.yml", content="- hosts: local\n", kind="playbook")
+    assert cache.get(changed) is None
+
+    cache = ResultCache(
+        str(tmp_path), default_rules_collection, config_options, skip_list=["name"]
+    )
+    assert cache.get(lintable) is None
+    assert cache.hits == 0
+    assert cache.misses == 1
+
+
+def test_result_cache_environment(
+    default_rules_collection: RulesCollection,
+    config_options: Namespace,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Check that collections and yamllint config changes invalidate the cache."""
+    collections = tmp_path / "collections"
+    monkeypatch.setenv(ansible_collections_path(), str(collections))
+    lintable = Lintable("playbook.yml", content="- hosts: all\n", kind="playbook")
+    cache_dir = str(tmp_path / "cache")
+    cache = ResultCache(cache_dir, default_rules_collection, config_options)
+    cache.put(lintable, [])
+    cache = ResultCache(cache_dir, default_rules_collection, config_options)
+    assert cache.get(lintable) == []
+
+    manifest = collections / "ansible_collections" / "foo" / "bar" / "MANIFEST.json"
+    manifest.parent.mkdir(parents=True)
+    manifest.write_text('{"collection_info": {"version": "1.0.0"}}', encoding="utf-8")
+    cache = ResultCache(cache_dir, default_rules_collection, config_options)
+    assert cache.get(lintable) is None
+    cache.put(lintable, [])
+
+    monkeypatch.setattr(
+        ansiblelint.cache,
+        "load_yamllint_config",
+        lambda: YamlLintConfig(content="extends: relaxed"),
+    )
+    cache = ResultCache(cache_dir, default_rules_collection, config_options)
+    assert cache.get(lintable) is None
+
+
+def test_dependency_closure() -> None:
+    """Check that included files are part of the dependency closure."""
+    lintable = Lintable("examples/playbooks/include.yml")
+    files = dependency_closure(lintable)
+    assert files is not None
+    names = [file.path.name for file in files]
+    assert "include.yml" in names
+    assert len(names) > 1
+
+
+def test_syntax_check_cache(config_options: Namespace, tmp_path: Path) -> None:
+    """Check that syntax check outcomes are replayed for unchanged playbooks."""
+    lintable = Lintable("examples/playbooks/conflicting_action.yml", kind="playbook")
+    rule = AnsibleSyntaxCheckRule()
+    cache = SyntaxCheckCache(
+        str(tmp_path), config_options, ansible_version="2.13", rule=rule
+    )
+    assert cache.get(lintable) is None
+    # pylint: disable=protected-access
+    matches = AnsibleSyntaxCheckRule._get_ansible_syntax_check_matches(lintable)
+    cache.put(lintable, matches)
+
+    cache = SyntaxCheckCache(
+        str(tmp_path), config_options, ansible_version="2.13", rule=rule
+    )
+    assert cache.get(lintable) == matches
+    assert cache.hits == 1
+
+    cache = SyntaxCheckCache(
+        str(tmp_path), config_options, ansible_version="2.14", rule=rule
+    )
+    assert cache.get(lintable) is None
+
+
+def test_baseline_cache(
+    default_rules_collection: RulesCollection,
+    config_options: Namespace,
+    tmp_path: Path,
+) -> None:
+    """Check that baselines of commits are merged and kept per configuration."""
+    matches = Runner(PLAYBOOK, rules=default_rules_collection).run()
+    fingerprints = [match_fingerprint(match) for match in matches]
+    assert len(set(fingerprints)) == len(set(matches))
+    assert match_fingerprint(matches[0]) == match_fingerprint(
+        Runner(PLAYBOOK, rules=default_rules_collection).run()[0]
+    )
+
+    cache = BaselineCache(str(tmp_path), default_rules_collection, config_options)
+    assert cache.get("abc") == {}
+    cache.put("abc", {PLAYBOOK: {"blob": "1", "matches": fingerprints}})
+    cache.put("abc", {"other.yml": {"blob": "2", "matches": []}})
+    assert cache.get("abc") == {
+        PLAYBOOK: {"blob": "1", "matches": fingerprints},
+        "other.yml": {"blob": "2", "matches": []},
+    }
+    assert cache.get("def") == {}
+
+    cache = BaselineCache(
+        str(tmp_path), default_rules_collection, config_options, skip_list=["name"]
+    )
+    assert cache.get("abc") == {}
+
+
+def test_rules_manifest_cache(
+    config_options: Namespace, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Check that custom rules are only imported when they changed or run."""
+    rulesdir = tmp_path / "rules"
+    shutil.copytree("test/rules/fixtures", rulesdir)
+    options = copy.deepcopy(config_options)
+    options.cache_dir = str(tmp_path / "cache")
+    options.tags = ["test1"]
+    loaded: List[str] = []
+    load_plugin = ansiblelint.rules.load_plugin
+
+    def spy(pluginfile: str) -> Any:
+        loaded.append(os.path.basename(pluginfile))
+        return load_plugin(pluginfile)
+
+    monkeypatch.setattr(ansiblelint.rules, "load_plugin", spy)
+    first = [rule.id for rule in RulesCollection([str(rulesdir)], options=options)]
+    assert sorted(loaded) == [
+        "ematcher.py",
+        "raw_task.py",
+        "unset_variable_matcher.py",
+    ]
+
+    loaded.clear()
+    rules = RulesCollection([str(rulesdir)], options=options)
+    assert not loaded
+    assert [rule.id for rule in rules] == first
+    assert loaded == ["ematcher.py"]
+
+    # a new modification time alone does not require importing the module
+    loaded.clear()
+    ematcher = rulesdir / "ematcher.py"
+    os.utime(ematcher, ns=(0, 0))
+    RulesCollection([str(rulesdir)], options=options)
+    assert not loaded
+
+    ematcher.write_text(
+        ematcher.read_text(encoding="utf-8").replace("test1", "test2"),
+        encoding="utf-8",
+    )
+    assert (
+        RulesManifestCache(options.cache_dir, str(rulesdir)).get(str(ematcher)) is None
+    )
+    rules = RulesCollection([str(rulesdir)], options=options)
+    assert loaded == ["ematcher.py"]
+    assert "TEST0001" not in [rule.id for rule in rules]
@@ -0,0 +1,73 @@
+"""Tests for the lint daemon."""
+import threading
+import time
+from argparse import Namespace
+from pathlib import Path
+
+from filelock import FileLock
+
+from ansiblelint.daemon import LintDaemon, _Entry, _file_states, request
+from ansiblelint.file_utils import cwd
+from ansiblelint.rules import RulesCollection
+
+TASKS = """\
+---
+- name: Run a command
+  ansible.builtin.command: echo hello
+"""
+
+
+def test_daemon(
+    tmp_path: Path,
+    config_options: Namespace,
+    default_rules_collection: RulesCollection,
+) -> None:
+    """Check that results are reused until the linted file changes."""
+    tasks = tmp_path / "tasks" / "main.yml"
+    tasks.parent.mkdir()
+    tasks.write_text(TASKS)
+    config_options.cache_dir_lock = FileLock(str(tmp_path / ".lock"))
+    socket_path = str(tmp_path / "daemon.sock")
+    daemon = LintDaemon(default_rules_collection, config_options, socket_path)
+
+    with cwd(tmp_path):
+        thread = threading.Thread(target=daemon.serve)
+        thread.start()
+        try:
+            while not Path(socket_path).exists():
+                time.sleep(0.1)
+            lint = {"command": "lint", "files": [str(tasks)]}
+            response = request(socket_path, lint)
+            assert response["rc"] == 2
+            assert [match["rule"] for match in response["matches"]] == [
+                "no-changed-when"
+            ]
+            assert request(socket_path, lint) == response
+
+            # a new modification time alone does not invalidate results
+            tasks.write_text(TASKS)
+            request(socket_path, lint)
+            assert (daemon.hits, daemon.misses) == (2, 1)
+
+            tasks.write_text(TASKS + "  changed_when: false\n")
+            assert request(socket_path, lint) == {"matches": [], "rc": 0}
+            assert daemon.misses == 2
+        finally:
+            request(socket_path, {"command": "stop"})
+            thread.join()
+    assert not Path(socket_path).exists()
+
+
+def test_missing_file_appearing(tmp_path: Path) -> None:
+    """Check that results depending on a missing file expire once it exists."""
+    tasks = tmp_path / "tasks.yml"
+    tasks.write_text(TASKS)
+    included = tmp_path / "included.yml"
+    entry = _Entry(
+        matches=[], return_code=0, files=_file_states([str(tasks), str(included)])
+    )
+    assert entry.files[str(included)] is None
+    assert entry.is_valid()
+
+    included.write_text(TASKS)
+    assert not entry.is_valid()
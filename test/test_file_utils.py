@@ -3,7 +3,7 @@ import os
 import time
 from argparse import Namespace
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import Any, Dict, List, Union
 
 import pytest
 from _pytest.capture import CaptureFixture
@@ -14,11 +14,15 @@ from ansiblelint import cli, file_utils
 from ansiblelint.__main__ import initialize_logger
 from ansiblelint.constants import FileType
 from ansiblelint.file_utils import (
+    ExcludeMatcher,
     Lintable,
+    clear_path_caches,
     expand_path_vars,
     expand_paths_vars,
+    get_kind_matcher,
     guess_project_dir,
     normpath,
+    resolve_path,
 )
 
 from .conftest import cwd
@@ -136,6 +140,33 @@ def test_discover_lintables_umlaut(monkeypatch: MonkeyPatch) -> None:
     assert "with-umlaut-ä.yml" in files
 
 
+@pytest.mark.parametrize(
+    ("exclude_path", "path", "excluded"),
+    (
+        pytest.param("roles/foo", "roles/foo/tasks/main.yml", True, id="prefix"),
+        pytest.param("roles/foo", "roles/foobar/main.yml", True, id="str-prefix"),
+        pytest.param("roles/foo", "other/main.yml", False, id="no-prefix"),
+        pytest.param("tasks/*.yml", "x/tasks/main.yml", True, id="path-match"),
+        pytest.param("tasks/*.yml", "/abs/tasks/main.yml", True, id="path-abs"),
+        pytest.param("tasks/*.yml", "xtasks/main.yml", False, id="path-part"),
+        pytest.param("/etc/*.yml", "/etc/a.yml", True, id="absolute"),
+        pytest.param("/etc/*.yml", "/etc/x/a.yml", True, id="fnmatch-slash"),
+        pytest.param("[!a]b.yml", "x/cb.yml", True, id="negated-class"),
+        pytest.param("[!a]b.yml", "x/ab.yml", False, id="negated-class-miss"),
+        pytest.param("a[b", "a[b", True, id="unclosed-class"),
+        pytest.param("**/playbooks/*.yml", "examples/playbooks/a.yml", True),
+        pytest.param("*.yaml", "a.yml", False, id="suffix"),
+    ),
+)
+def test_exclude_matcher(exclude_path: str, path: str, excluded: bool) -> None:
+    """Check that exclude paths match like prefixes, Path.match and fnmatch."""
+    matcher = ExcludeMatcher([exclude_path])
+    assert matcher.is_excluded(path) is excluded
+    # answers are remembered
+    assert matcher.is_excluded(path) is excluded
+    assert not ExcludeMatcher([]).is_excluded(path)
+
+
 @pytest.mark.parametrize(
     ("path", "kind"),
     (
@@ -213,6 +244,22 @@ def test_default_kinds(monkeypatch: MonkeyPatch, path: str, kind: FileType) -> N
     assert lintable_detected.kind == result[lintable_expected.name]
 
 
+def test_kind_matcher_order() -> None:
+    """Check that the first kind whose pattern matches wins."""
+    matcher = get_kind_matcher(
+        [{"tasks": "**/tasks/*.yml"}, {"playbook": "**/*.{yml,yaml}"}]
+    )
+    assert matcher.kind(Path("roles/foo/tasks/main.yml")) == "tasks"
+    assert matcher.kind(Path("roles/foo/main.yaml")) == "playbook"
+    assert matcher.kind(Path("roles/foo/main.txt")) == ""
+    assert (
+        get_kind_matcher(
+            [{"playbook": "**/*.{yml,yaml}"}, {"tasks": "**/tasks/*.yml"}]
+        ).kind(Path("roles/foo/tasks/main.yml"))
+        == "playbook"
+    )
+
+
 def test_guess_project_dir(tmp_path: Path) -> None:
     """Verify guess_project_dir()."""
     with cwd(str(tmp_path)):
@@ -409,3 +456,41 @@ def test_lintable_content_deleter(
     assert tmp_updated_lintable.content == updated_content
     del tmp_updated_lintable.content
     assert tmp_updated_lintable.content == content
+
+
+def test_lintable_artifacts() -> None:
+    """Ensure that artifacts are computed once and reset with the content."""
+    calls: List[str] = []
+
+    def factory(lintable: Lintable) -> List[str]:
+        calls.append(lintable.content)
+        return lintable.content.split()
+
+    lintable = Lintable("foo.yml", content="a b")
+    assert lintable.get_artifact("words", factory) == ["a", "b"]
+    assert lintable.get_artifact("words", factory) == ["a", "b"]
+    assert lintable.lines == ["a b"]
+    assert calls == ["a b"]
+
+    lintable.content = "c"
+    assert lintable.get_artifact("words", factory) == ["c"]
+    assert lintable.lines == ["c"]
+    assert calls == ["a b", "c"]
+
+    lintable.release_artifacts()
+    assert lintable.get_artifact("words", factory) == ["c"]
+    assert len(calls) == 3
+
+
+def test_clear_path_caches(tmp_path: Path) -> None:
+    """Ensure that symlinks changed after being resolved are resolved again."""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    link = tmp_path / "link"
+    link.symlink_to(tmp_path / "a")
+    assert resolve_path(str(link)) == str((tmp_path / "a").resolve())
+
+    link.unlink()
+    link.symlink_to(tmp_path / "b")
+    clear_path_caches()
+    assert resolve_path(str(link)) == str((tmp_path / "b").resolve())
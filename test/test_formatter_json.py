@@ -1,4 +1,5 @@
 """Test the codeclimate JSON formatter."""
+import io
 import json
 import pathlib
 import subprocess
@@ -63,6 +64,13 @@ class TestCodeclimateJSONFormatter:
         with pytest.raises(RuntimeError):
             self.formatter.format_result(self.matches[0])  # type: ignore
 
+    def test_write_result(self) -> None:
+        """Test if matches given by an iterator are written to a stream."""
+        assert isinstance(self.formatter, CodeclimateJSONFormatter)
+        output = io.StringIO()
+        self.formatter.write_result(iter(self.matches), output)
+        assert len(json.loads(output.getvalue())) == 2
+
     def test_result_is_list(self) -> None:
         """Test if the return JSON contains a list with a length of 2."""
         assert isinstance(self.formatter, CodeclimateJSONFormatter)
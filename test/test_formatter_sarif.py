@@ -1,4 +1,5 @@
 """Test the codeclimate JSON formatter."""
+import io
 import json
 import pathlib
 import subprocess
@@ -65,6 +66,15 @@ class TestSarifFormatter:
         with pytest.raises(RuntimeError):
             self.formatter.format_result(self.matches[0])  # type: ignore
 
+    def test_write_result(self) -> None:
+        """Test if matches given by an iterator are written to a stream."""
+        assert isinstance(self.formatter, SarifFormatter)
+        output = io.StringIO()
+        self.formatter.write_result(iter(self.matches), output)
+        sarif = json.loads(output.getvalue())
+        assert len(sarif["runs"][0]["results"]) == 2
+        assert len(sarif["runs"][0]["tool"]["driver"]["rules"]) == 1
+
     def test_result_is_list(self) -> None:
         """Test if the return SARIF object contains the results with length of 2."""
         assert isinstance(self.formatter, SarifFormatter)
@@ -0,0 +1,75 @@
+"""Tests for linting of files changed since a git revision."""
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from ansiblelint.constants import INVALID_CONFIG_RC
+from ansiblelint.file_utils import Lintable, cwd
+from ansiblelint.incremental import get_changed_lintables, git_objects
+
+PLAYBOOK = """\
+---
+- name: {name}
+  hosts: localhost
+  tasks:
+    - name: Include
+      ansible.builtin.include_tasks: {tasks}
+"""
+
+TASKS = """\
+---
+- name: Debug
+  ansible.builtin.debug:
+    msg: hi
+"""
+
+
+def _git(*args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def test_get_changed_lintables(tmp_path: Path) -> None:
+    """Check that changed files and the playbooks including them are selected."""
+    (tmp_path / "tasks").mkdir()
+    (tmp_path / "tasks" / "a.yml").write_text(TASKS)
+    (tmp_path / "tasks" / "b.yml").write_text(TASKS)
+    (tmp_path / "a_playbook.yml").write_text(
+        PLAYBOOK.format(name="A", tasks="tasks/a.yml")
+    )
+    (tmp_path / "b_playbook.yml").write_text(
+        PLAYBOOK.format(name="B", tasks="tasks/b.yml")
+    )
+    with cwd(tmp_path):
+        _git("init", "-q")
+        _git("add", ".")
+        _git("commit", "-q", "-m", "initial")
+        lintables = [
+            Lintable(name)
+            for name in ("a_playbook.yml", "b_playbook.yml", "tasks/a.yml")
+        ]
+        assert not get_changed_lintables(lintables, "HEAD")
+
+        (tmp_path / "tasks" / "a.yml").write_text(TASKS + "\n")
+        (tmp_path / "c.yml").write_text(TASKS)
+        lintables.append(Lintable("c.yml", kind="tasks"))
+        selected = get_changed_lintables(lintables, "HEAD")
+
+    assert [lintable.name for lintable in selected] == [
+        "a_playbook.yml",
+        "c.yml",
+        "tasks/a.yml",
+    ]
+
+
+def test_git_objects_invalid_revision(tmp_path: Path) -> None:
+    """Check that an unknown revision exits with an error instead of a traceback."""
+    with cwd(tmp_path):
+        _git("init", "-q")
+        with pytest.raises(SystemExit) as exc:
+            git_objects("no-such-revision")
+    assert exc.value.code == INVALID_CONFIG_RC
@@ -0,0 +1,93 @@
+"""Tests for the language server."""
+import io
+import queue
+from argparse import Namespace
+from pathlib import Path
+from typing import Any, Dict
+
+from filelock import FileLock
+
+from ansiblelint.file_utils import cwd
+from ansiblelint.lsp import LanguageServer, read_message, write_message
+from ansiblelint.rules import RulesCollection
+
+TASKS = """\
+---
+- name: Run a command
+  ansible.builtin.command: echo hello
+"""
+
+
+def test_messages() -> None:
+    """Check that messages survive their framing."""
+    stream = io.BytesIO()
+    message = {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}}
+    write_message(stream, message)
+    stream.seek(0)
+    assert read_message(stream) == message
+    assert read_message(stream) is None
+
+
+def test_language_server(
+    tmp_path: Path,
+    config_options: Namespace,
+    default_rules_collection: RulesCollection,
+) -> None:
+    """Check that diagnostics are published only for the last changes."""
+    tasks = tmp_path / "tasks" / "main.yml"
+    tasks.parent.mkdir()
+    tasks.write_text(TASKS)
+    uri = tasks.as_uri()
+    config_options.cache_dir_lock = FileLock(str(tmp_path / ".lock"))
+    sent: queue.Queue[Dict[str, Any]] = queue.Queue()
+
+    with cwd(tmp_path):
+        server = LanguageServer(
+            default_rules_collection, config_options, sent.put, debounce=0.2
+        )
+        try:
+            server.handle({"id": 1, "method": "initialize", "params": {}})
+            assert sent.get(timeout=10)["result"]["capabilities"]
+
+            document = {"uri": uri, "version": 1, "text": TASKS}
+            server.handle(
+                {"method": "textDocument/didOpen", "params": {"textDocument": document}}
+            )
+            params = sent.get(timeout=30)["params"]
+            assert params["version"] == 1
+            assert [diagnostic["code"] for diagnostic in params["diagnostics"]] == [
+                "no-changed-when"
+            ]
+            assert params["diagnostics"][0]["range"]["start"] == {
+                "line": 1,
+                "character": 0,
+            }
+
+            # unsaved changes are linted once the user stopped typing
+            for version, text in enumerate(
+                (TASKS + "  changed_when: true\n", TASKS + "  changed_when: false\n"),
+                start=2,
+            ):
+                server.handle(
+                    {
+                        "method": "textDocument/didChange",
+                        "params": {
+                            "textDocument": {"uri": uri, "version": version},
+                            "contentChanges": [{"text": text}],
+                        },
+                    }
+                )
+            params = sent.get(timeout=30)["params"]
+            assert params == {"uri": uri, "version": 3, "diagnostics": []}
+            assert server.runs == 2
+
+            server.handle(
+                {
+                    "method": "textDocument/didClose",
+                    "params": {"textDocument": document},
+                }
+            )
+            assert sent.get(timeout=10)["params"] == {"uri": uri, "diagnostics": []}
+        finally:
+            server.handle({"method": "exit"})
+    assert sent.empty()
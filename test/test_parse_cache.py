@@ -0,0 +1,69 @@
+"""Tests for the cache of parsed files."""
+from typing import List
+
+from ansiblelint.file_utils import Lintable
+from ansiblelint.parse_cache import ParseCache, get_parse_cache, parse_cache_scope
+
+
+def test_parse_cache_hits_and_misses() -> None:
+    """Check that content is parsed again only when it changes."""
+    calls: List[str] = []
+
+    def parse(lintable: Lintable) -> List[str]:
+        calls.append(lintable.content)
+        return lintable.content.split()
+
+    cache = ParseCache()
+    assert cache.get("words", Lintable("a.yml", content="a b"), parse) == ["a", "b"]
+    assert cache.get("words", Lintable("a.yml", content="a b"), parse) == ["a", "b"]
+    assert cache.get("words", Lintable("a.yml", content="c"), parse) == ["c"]
+    assert calls == ["a b", "c"]
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+    cache.release(Lintable("a.yml"))
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_parse_cache_budget() -> None:
+    """Check that least recently used entries are evicted over budget."""
+    cache = ParseCache(max_bytes=10)
+    first = Lintable("first.yml", content="x" * 4)
+    second = Lintable("second.yml", content="y" * 4)
+    third = Lintable("third.yml", content="z" * 4)
+    for lintable in (first, second, first, third):
+        cache.get("text", lintable, lambda item: item.content)
+    assert cache.evictions == 1
+    assert cache.size == 8
+    cache.get("text", first, lambda item: item.content)
+    assert cache.hits == 2
+
+    cache.get("text", Lintable("big.yml", content="b" * 11), lambda item: 1)
+    assert cache.size == 8
+
+
+def test_parse_cache_scope() -> None:
+    """Check that a scope installs a new cache and releases it at exit."""
+    default = get_parse_cache()
+    with parse_cache_scope(1024) as cache:
+        assert get_parse_cache() is cache
+        cache.get("text", Lintable("a.yml", content="a"), lambda item: 1)
+        assert len(cache) == 1
+    assert len(cache) == 0
+    assert get_parse_cache() is default
+
+
+def test_parse_cache_outside_scope() -> None:
+    """Check that nothing is kept in memory outside of a linting run."""
+    calls: List[str] = []
+
+    def parse(lintable: Lintable) -> int:
+        calls.append(lintable.content)
+        return 1
+
+    lintable = Lintable("a.yml", content="a")
+    get_parse_cache().get("text", lintable, parse)
+    get_parse_cache().get("text", lintable, parse)
+    assert len(get_parse_cache()) == 0
+    assert calls == ["a", "a"]
@@ -0,0 +1,54 @@
+"""Tests for the profiling of rules."""
+import json
+import time
+
+from ansiblelint.file_utils import Lintable
+from ansiblelint.profiling import (
+    NORMALIZE,
+    PARSE,
+    Profiler,
+    disable_profiler,
+    enable_profiler,
+    get_profiler,
+)
+from ansiblelint.rules import RulesCollection
+from ansiblelint.runner import Runner
+
+
+def test_profile_rules(default_rules_collection: RulesCollection) -> None:
+    """Check that rule methods and linting phases are timed."""
+    profiler = enable_profiler()
+    try:
+        lintable = Lintable("examples/playbooks/lots_of_warnings.yml")
+        result = Runner(lintable, rules=default_rules_collection).run()
+    finally:
+        disable_profiler()
+    assert get_profiler() is None
+
+    entries = json.loads(profiler.to_json())
+    methods = {(entry["name"], entry["method"]): entry for entry in entries}
+    assert methods[("no-changed-when", "matchtask")]["matches"] == len(
+        [match for match in result if match.rule.id == "no-changed-when"]
+    )
+    assert methods[("no-changed-when", "matchtask")]["calls"] > 1
+    assert any(name == PARSE for name, _ in methods)
+    assert any(name == NORMALIZE for name, _ in methods)
+    seconds = [entry["seconds"] for entry in entries]
+    assert seconds == sorted(seconds, reverse=True)
+
+
+def test_profile_phases_excluded() -> None:
+    """Check that phases are not counted for the rule method triggering them."""
+    profiler = Profiler()
+    with profiler.measure("rule", "matchyaml"):
+        with profiler.measure("rule", "matchplay"):
+            with profiler.measure(NORMALIZE, "normalize_task"):
+                with profiler.measure(PARSE, "yaml"):
+                    time.sleep(0.05)
+                time.sleep(0.05)
+
+    timings = profiler.timings
+    assert timings[(PARSE, "yaml")].seconds >= 0.05
+    assert 0.05 <= timings[(NORMALIZE, "normalize_task")].seconds < 0.1
+    assert timings[("rule", "matchplay")].seconds < 0.05
+    assert timings[("rule", "matchyaml")].seconds < 0.05
@@ -22,14 +22,27 @@
 import collections
 import os
 import re
+from argparse import Namespace
+from typing import Any, List
 
 import pytest
 
+import ansiblelint.rules
+import ansiblelint.yaml_utils
+from ansiblelint._internal.rules import BaseRule
 from ansiblelint.config import options
+from ansiblelint.constants import DEFAULT_RULESDIR
 from ansiblelint.file_utils import Lintable
-from ansiblelint.rules import RulesCollection
+from ansiblelint.rules import (
+    MANIFEST_FILE,
+    RulesCollection,
+    build_manifest,
+    load_manifest,
+)
 from ansiblelint.testing import run_ansible_lint
 
+from .rules.fixtures import ematcher
+
 
 @pytest.fixture(name="test_rules_collection")
 def fixture_test_rules_collection() -> RulesCollection:
@@ -64,6 +77,19 @@ def test_run_collection(
     assert matches[0].linenumber == 3
 
 
+def test_match_types(
+    test_rules_collection: RulesCollection, ematchtestfile: Lintable
+) -> None:
+    """Test that matches record the method that produced them."""
+    matches = test_rules_collection.run(ematchtestfile)
+    match_types = {match.rule.id: match.match_type for match in matches}
+    assert match_types == {"TEST0001": "line", "TEST0003": "task"}
+    # matches share the rule instance instead of holding a copy of it
+    assert {id(match.rule) for match in matches if match.rule.id == "TEST0001"} == {
+        id(rule) for rule in test_rules_collection.rules if rule.id == "TEST0001"
+    }
+
+
 def test_tags(
     test_rules_collection: RulesCollection,
     ematchtestfile: Lintable,
@@ -124,6 +150,69 @@ def test_skip_non_existent_id(
     assert len(matches) == 4
 
 
+def test_tasks_iterated_once(
+    default_rules_collection: RulesCollection, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that all task rules share a single iteration over the tasks."""
+    calls = []
+    iter_tasks_in_file = ansiblelint.yaml_utils.iter_tasks_in_file
+
+    def counting_iter_tasks_in_file(lintable: Lintable) -> Any:
+        calls.append(lintable)
+        return iter_tasks_in_file(lintable)
+
+    monkeypatch.setattr(
+        ansiblelint.yaml_utils, "iter_tasks_in_file", counting_iter_tasks_in_file
+    )
+    lintable = Lintable("examples/playbooks/lots_of_warnings.yml", kind="playbook")
+    matches = default_rules_collection.run(lintable)
+    assert len(calls) == 1
+    assert "no-changed-when" in {match.rule.id for match in matches}
+    assert {match.match_type for match in matches if match.task} == {"task"}
+
+
+def test_lines_prefiltered(ematchtestfile: Lintable) -> None:
+    """Test that lines not containing the pattern of a rule are not matched."""
+    calls = []
+
+    # pylint: disable=too-few-public-methods
+    class PrefilteredRule(ematcher.EMatcherRule):
+        """BANNED string found, only looking at lines containing it."""
+
+        id = "TEST0004"
+        line_pattern = "BANNED"
+
+        def match(self, line: str) -> bool:
+            calls.append(line)
+            return super().match(line)
+
+    rules = RulesCollection()
+    rules.register(ematcher.EMatcherRule())
+    rules.register(PrefilteredRule())
+    matches = rules.run(ematchtestfile)
+    rule_ids = [match.rule.id for match in matches]
+    assert rule_ids.count("TEST0001") == rule_ids.count("TEST0004") == 3
+    assert len(calls) == 3
+
+
+def test_default_matchtask_not_dispatched(
+    default_rules_collection: RulesCollection, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that rules not overriding matchtask are not given tasks."""
+    calls = []
+
+    # pylint: disable=unused-argument
+    def counting_matchtask(rule: BaseRule, task: Any, file: Any = None) -> bool:
+        calls.append(rule.id)
+        return False
+
+    monkeypatch.setattr(BaseRule, "matchtask", counting_matchtask)
+    lintable = Lintable("examples/playbooks/lots_of_warnings.yml", kind="playbook")
+    matches = default_rules_collection.run(lintable)
+    assert not calls
+    assert "no-changed-when" in {match.rule.id for match in matches}
+
+
 def test_no_duplicate_rule_ids() -> None:
     """Check that rules of the collection don't have duplicate IDs."""
     real_rules = RulesCollection([os.path.abspath("./src/ansiblelint/rules")])
@@ -160,3 +249,70 @@ def test_rules_id_format() -> None:
             rule.id
         ), f"Rule id {rule.id} did not match our required format."
     assert len(rules) == 42
+
+
+def test_builtin_rules_manifest() -> None:
+    """Check that the manifest of our rules is up to date."""
+    assert (
+        load_manifest(DEFAULT_RULESDIR) == build_manifest(DEFAULT_RULESDIR)["modules"]
+    ), f"{MANIFEST_FILE} is outdated, update it with: pytest --update-manifest"
+
+
+def test_lazy_rules_loading(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that only modules of rules selected by tags get imported."""
+    loaded: List[str] = []
+    load_plugin = ansiblelint.rules.load_plugin
+
+    def spy(pluginfile: str) -> Any:
+        loaded.append(os.path.basename(pluginfile))
+        return load_plugin(pluginfile)
+
+    monkeypatch.setattr(ansiblelint.rules, "load_plugin", spy)
+    lazy_options = Namespace(**vars(options))
+    lazy_options.tags = ["deprecated-bare-vars", "command-shell"]
+    rules = RulesCollection([DEFAULT_RULESDIR], options=lazy_options)
+    assert not loaded
+    assert "deprecated-bare-vars" in rules.rule_ids()
+
+    rules.unload("command-instead-of-shell")
+    for rule in rules:
+        assert (
+            rule.has_dynamic_tags
+            or rule.id in lazy_options.tags
+            or not {"command-shell", "core"}.isdisjoint(rule.tags)
+        )
+        assert rule.id != "command-instead-of-shell"
+    assert "command_instead_of_shell.py" not in loaded
+    assert len(loaded) == len(set(loaded)) < 10
+
+    bare_vars = next(rule for rule in rules if rule.id == "deprecated-bare-vars")
+    assert bare_vars.help.startswith("## deprecated-bare-vars")
+
+
+def test_run_loads_rules_left_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that a run can select rules left out by the tags of the options."""
+    loaded: List[str] = []
+    load_plugin = ansiblelint.rules.load_plugin
+
+    def spy(pluginfile: str) -> Any:
+        loaded.append(os.path.basename(pluginfile))
+        return load_plugin(pluginfile)
+
+    monkeypatch.setattr(ansiblelint.rules, "load_plugin", spy)
+    lazy_options = Namespace(**vars(options))
+    lazy_options.tags = ["deprecated-bare-vars"]
+    lazy_options.skip_list = ["no-changed-when"]
+    rules = RulesCollection([DEFAULT_RULESDIR], options=lazy_options)
+    assert all(rule.id != "no-changed-when" for rule in rules)
+    assert "no_changed_when.py" not in loaded
+
+    lintable = Lintable("examples/playbooks/command-check-failure.yml")
+    matches = rules.run(lintable, tags={"no-changed-when"})
+    assert matches
+    assert {match.rule.id for match in matches} == {"no-changed-when"}
+    assert "no_changed_when.py" in loaded
+
+    # rules unloaded, like by profiles, are never loaded again
+    rules.unload("command-instead-of-shell")
+    matches = rules.run(lintable, tags={"command-shell"})
+    assert {match.rule.id for match in matches} == {"no-changed-when"}
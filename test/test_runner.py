@@ -155,3 +155,31 @@ def test_files_not_scanned_twice(default_rules_collection: RulesCollection) -> N
     # this second run should return 0 because the included filed was already
     # processed and added to checked_files, which acts like a bypass list.
     assert len(run2) == 0
+
+
+def test_runner_jobs(default_rules_collection: RulesCollection) -> None:
+    """Check that running rules in worker processes gives the same results."""
+    filename = "examples/playbooks/include.yml"
+    serial = Runner(filename, rules=default_rules_collection).run()
+    parallel = Runner(filename, rules=default_rules_collection, jobs=2).run()
+
+    assert len(serial) > 0
+    assert parallel == serial
+    assert [m.rule.id for m in parallel] == [m.rule.id for m in serial]
+    assert [m.tag for m in parallel] == [m.tag for m in serial]
+
+
+def test_runner_stream(default_rules_collection: RulesCollection) -> None:
+    """Check that streamed matches are grouped by file and equal run() ones."""
+    filenames = [
+        "examples/playbooks/common-include-1.yml",
+        "examples/playbooks/command-check-failure.yml",
+    ]
+    streamed = list(Runner(*filenames, rules=default_rules_collection).stream())
+    matches = Runner(*filenames, rules=default_rules_collection).run()
+
+    assert len(streamed) > 1
+    for file_matches in streamed:
+        assert file_matches == sorted(set(file_matches))
+        assert len({match.filename for match in file_matches}) == 1
+    assert sorted(match for batch in streamed for match in batch) == matches
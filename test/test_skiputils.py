@@ -7,6 +7,7 @@ import pytest
 from ansiblelint.file_utils import Lintable
 from ansiblelint.skip_utils import (
     append_skipped_rules,
+    build_skip_index,
     get_rule_skips_from_line,
     is_nested_task,
 )
@@ -28,6 +29,22 @@ PLAYBOOK_WITH_NOQA = """\
         SOME_OTHER_VAR: "Bat"
 """
 
+TASKS_WITH_NOQA = """\
+---
+- name: One
+  ansible.builtin.command: echo "# noqa fake"  # noqa no-changed-when
+  args:
+    chdir: /tmp
+- name: Two
+  ansible.builtin.shell: |
+    echo hi # noqa not-a-comment
+- name: Block
+  block:
+    - name: Inner
+      ansible.builtin.debug: msg=x  # noqa inner
+  when: true  # noqa after-block
+"""
+
 
 @pytest.mark.parametrize(
     ("line", "expected"),
@@ -42,6 +59,18 @@ def test_get_rule_skips_from_line(line: str, expected: str) -> None:
     assert v == [expected]
 
 
+def test_build_skip_index() -> None:
+    """Check that noqa comments are indexed with the lines of mappings."""
+    index = build_skip_index(TASKS_WITH_NOQA)
+
+    assert index.skips == {3: ["no-changed-when"], 12: ["inner"], 13: ["after-block"]}
+    assert index.mapping_rules(2) == ["no-changed-when"]
+    assert not index.mapping_rules(6)
+    assert index.mapping_rules(9) == ["inner", "after-block"]
+    assert index.mapping_rules(11) == ["inner"]
+    assert not build_skip_index("- name: No comment\n")
+
+
 def test_playbook_noqa(default_text_runner: RunFromText) -> None:
     """Check that noqa is properly taken into account on vars and tasks."""
     results = default_text_runner.run_playbook(PLAYBOOK_WITH_NOQA)
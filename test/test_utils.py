@@ -21,6 +21,7 @@
 # THE SOFTWARE.
 """Tests for generic utility functions."""
 
+import copy
 import logging
 import os
 import os.path
@@ -34,6 +35,7 @@ import pytest
 from _pytest.capture import CaptureFixture
 from _pytest.logging import LogCaptureFixture
 from _pytest.monkeypatch import MonkeyPatch
+from ansible.parsing.yaml.objects import AnsibleMapping
 from ansible.utils.sentinel import Sentinel
 
 from ansiblelint import cli, constants, utils
@@ -345,6 +347,29 @@ def test_auto_detect_exclude(monkeypatch: MonkeyPatch) -> None:
     assert result == [Lintable("bar/playbook.yml", kind="playbook")]
 
 
+def test_auto_detect_roles(monkeypatch: MonkeyPatch) -> None:
+    """Verify that roles of discovered files are added once, after files."""
+    options = cli.get_config([])
+    files = [
+        "examples/roles/hello/meta/main.yml",
+        "examples/roles/bobbins/tasks/main.yml",
+        "examples/roles/hello/tasks/main.yml",
+    ]
+
+    # pylint: disable=unused-argument
+    def mockreturn(options: Namespace) -> List[str]:
+        return files
+
+    monkeypatch.setattr(utils, "discover_lintables", mockreturn)
+    result = utils.get_lintables(options)
+    assert [lintable.name for lintable in result] == [
+        *files,
+        "examples/roles/hello",
+        "examples/roles/bobbins",
+    ]
+    assert [lintable.kind for lintable in result[3:]] == ["role", "role"]
+
+
 _DEFAULT_RULEDIRS = [constants.DEFAULT_RULESDIR]
 _CUSTOM_RULESDIR = Path(__file__).parent / "custom_rules"
 _CUSTOM_RULEDIRS = [
@@ -409,3 +434,25 @@ def test_nested_items() -> None:
         match=r"Call to deprecated function ansiblelint\.utils\.nested_items.*"
     ):
         assert list(utils.nested_items(data)) == items
+
+
+def test_freeze_task() -> None:
+    """Check that nested values of a frozen task cannot be altered."""
+    task = utils.freeze_task(
+        AnsibleMapping(
+            name="foo",
+            loop=[{"a": [1, 2]}],
+            vars=AnsibleMapping(b={"c": "d"}),
+        )
+    )
+    assert task["loop"] == [{"a": [1, 2]}]
+    assert isinstance(task["loop"], list)
+    with pytest.raises(TypeError):
+        task["loop"].append({})
+    with pytest.raises(TypeError):
+        task["loop"][0]["a"][0] = 3
+    with pytest.raises(TypeError):
+        task["vars"]["b"]["c"] = "e"
+    copied = copy.deepcopy(task)
+    copied["vars"]["b"]["c"] = "e"
+    assert task["vars"]["b"]["c"] == "d"
@@ -32,6 +32,37 @@ def test_iter_tasks_in_file_with_empty_file(empty_lintable: Lintable) -> None:
     assert not res
 
 
+def test_iter_tasks_in_file_normalizes_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that tasks are normalized once per file and cannot be altered."""
+    calls: List[int] = []
+    normalize_task = ansiblelint.yaml_utils.normalize_task
+
+    def counting_normalize_task(task: Any, filename: str) -> Any:
+        calls.append(task["__line__"])
+        return normalize_task(task, filename)
+
+    monkeypatch.setattr(
+        ansiblelint.yaml_utils, "normalize_task", counting_normalize_task
+    )
+    lintable = Lintable("examples/playbooks/become.yml")
+    first = [
+        task for _, task, _, _ in ansiblelint.yaml_utils.iter_tasks_in_file(lintable)
+    ]
+    second = [
+        task for _, task, _, _ in ansiblelint.yaml_utils.iter_tasks_in_file(lintable)
+    ]
+    assert first
+    assert len(calls) == len(first)
+    assert all(a is b for a, b in zip(first, second))
+    with pytest.raises(TypeError):
+        first[0]["__raw_task__"] = {}
+    with pytest.raises(TypeError):
+        first[0]["action"]["foo"] = "bar"
+    copied = dict(first[0])
+    copied["__raw_task__"] = {}
+    assert "__raw_task__" not in first[0]
+
+
 def test_nested_items_path() -> None:
     """Verify correct function of nested_items_path()."""
     data = {